@@ -1,13 +1,40 @@
 import streamlit as st
-from config import APP_TITLE
+from config import APP_TITLE, WARMUP_HEAVY_IMPORTS
+from utils.lazy_imports import import_timings, start_warm_up
+from utils.memory import MB, get_memory_manager, memory_sidebar, process_rss_bytes
 
 st.set_page_config(
     page_title=APP_TITLE,
     layout="wide"
 )
 
+# Preload sklearn / Prophet in the background while the user uploads data
+if WARMUP_HEAVY_IMPORTS:
+    start_warm_up()
+
 st.title(APP_TITLE)
 st.markdown(" **Production-Grade FMCG Business Intelligence System**")
 
+memory_sidebar()
+
 if "df" not in st.session_state:
     st.warning("Please upload a dataset from the Upload page")
+
+with st.expander("Startup diagnostics"):
+    timings = import_timings()
+    if timings:
+        st.dataframe(
+            [{"Module": name, "Import Seconds": seconds} for name, seconds in timings.items()],
+            use_container_width=True
+        )
+    else:
+        st.caption("No heavy libraries loaded yet")
+
+with st.expander("Memory usage"):
+    memory = get_memory_manager()
+    rss = process_rss_bytes()
+    st.caption(
+        f"Budget: {memory.budget_bytes / MB:,.0f} MB tracked"
+        + (f" · Process RSS: {rss / MB:,.0f} MB" if rss is not None else "")
+    )
+    st.dataframe(memory.usage().round(1), use_container_width=True, hide_index=True)
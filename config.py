@@ -1 +1,61 @@
 APP_TITLE = "FMCG Executive Intelligence Dashboard"
+
+# Calendar
+FISCAL_YEAR_START_MONTH = 4
+
+# Concurrency
+SECTION_WORKERS = 4
+
+# Exports
+EXPORT_CHUNK_ROWS = 100_000
+EXPORT_TTL_SECONDS = 3600  # prepared downloads under static/exports are pruned after this
+
+# Approximate mode
+APPROX_MIN_ROWS = 1_000_000
+APPROX_SAMPLE_FRACTION = 0.02
+APPROX_MIN_PER_STRATUM = 30
+APPROX_DEBOUNCE_SECONDS = 1.5  # filters must sit idle this long before the exact pass runs
+
+# Startup
+WARMUP_HEAVY_IMPORTS = True
+
+# Basket analysis
+BASKET_MIN_SUPPORT = 0.001
+BASKET_MIN_LIFT = 1.0
+
+# Artifact store
+ARTIFACT_DIR = ".artifacts"
+ARTIFACT_FINGERPRINT_MEMO = 256  # column fingerprints kept in memory
+ARTIFACT_MAX_MB = 1024  # least recently used artifacts are deleted beyond this
+
+# Prediction intervals
+INTERVAL_LEVEL = 0.95
+INTERVAL_BOOTSTRAP_SAMPLES = 2000
+
+# Memory
+MEMORY_BUDGET_MB = 4096
+MEMORY_RESULT_FLOOR = 0.25  # share of the budget cached results keep even when datasets fill it
+
+# Query API
+QUERY_API_PORT = 8765
+QUERY_CACHE_ENTRIES = 1024
+
+# ABC / Pareto
+ABC_CLASS_A_SHARE = 0.80
+ABC_CLASS_B_SHARE = 0.95
+
+# Parallel aggregation (None = one worker per CPU core)
+PARALLEL_AGG_WORKERS = None
+PARALLEL_AGG_MIN_ROWS = 2_000_000
+
+# Tables (rows per page choices; the second is the default)
+TABLE_PAGE_SIZES = [25, 50, 100, 500]
+
+# Pricing scenarios
+ELASTICITY_RANGE = (-4.0, 0.0)   # clip estimates to plausible own-price elasticities
+ELASTICITY_PRIOR_PERIODS = 6     # months of evidence before a SKU's own estimate dominates
+SCENARIO_SWEEP_STEPS = 50
+
+# Report packs (None = one worker per CPU core)
+REPORT_DIR = "reports"
+REPORT_WORKERS = None
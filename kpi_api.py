@@ -0,0 +1,127 @@
+# kpi_api.py
+"""
+Headless KPI query API over the dashboard's metric functions.
+
+    python kpi_api.py data.csv --query '{"metrics": ["total_sales", "aov"]}'
+    python kpi_api.py data.csv --query @queries.json --format arrow --output out.arrows
+    python kpi_api.py data.csv --serve --port 8765
+
+HTTP endpoints (local only by default):
+    GET  /health           dataset and cache stats
+    POST /query            one query object, a list, or {"queries": [...]}
+                           ?format=arrow (or Accept: application/vnd.apache.arrow.stream)
+                           returns an Arrow IPC stream instead of JSON
+"""
+
+import argparse
+import json
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from config import QUERY_API_PORT
+from utils.query_api import KPIQueryEngine, to_arrow, to_json
+
+ARROW_MIME = "application/vnd.apache.arrow.stream"
+
+
+def run_request(engine, payload):
+    """
+    Dispatch a parsed request body to query() or batch().
+    """
+    if isinstance(payload, dict) and "queries" in payload:
+        payload = payload["queries"]
+    if isinstance(payload, list):
+        return engine.batch(payload)
+    return engine.query(payload)
+
+
+def make_handler(engine):
+    class QueryHandler(BaseHTTPRequestHandler):
+        def _send(self, status, body, content_type="application/json"):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _error(self, status, message):
+            self._send(status, json.dumps({"error": message}).encode("utf-8"))
+
+        def do_GET(self):
+            if urlparse(self.path).path == "/health":
+                self._send(200, json.dumps(engine.stats()).encode("utf-8"))
+            else:
+                self._error(404, "Not found")
+
+        def do_POST(self):
+            url = urlparse(self.path)
+            if url.path != "/query":
+                self._error(404, "Not found")
+                return
+
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                result = run_request(engine, payload)
+            except (ValueError, KeyError, TypeError) as e:
+                self._error(400, str(e))
+                return
+
+            fmt = parse_qs(url.query).get("format", [None])[0]
+            if fmt == "arrow" or (fmt is None and ARROW_MIME in self.headers.get("Accept", "")):
+                self._send(200, to_arrow(result), ARROW_MIME)
+            else:
+                self._send(200, to_json(result).encode("utf-8"))
+
+        def log_message(self, format, *args):
+            sys.stderr.write(f"kpi_api: {format % args}\n")
+
+    return QueryHandler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Query dashboard KPIs without the UI")
+    parser.add_argument("dataset", help="CSV, Excel or Parquet file")
+    parser.add_argument("--query", help="JSON query, or @file containing one")
+    parser.add_argument("--format", choices=["json", "arrow"], default="json")
+    parser.add_argument("--output", help="Write the response here instead of stdout")
+    parser.add_argument("--serve", action="store_true", help="Run the HTTP API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=QUERY_API_PORT)
+    args = parser.parse_args(argv)
+
+    engine = KPIQueryEngine.from_file(args.dataset)
+
+    if args.serve:
+        server = ThreadingHTTPServer((args.host, args.port), make_handler(engine))
+        print(f"Serving KPIs for {args.dataset} on http://{args.host}:{args.port}", file=sys.stderr)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+        return 0
+
+    if not args.query:
+        parser.error("--query or --serve is required")
+
+    text = args.query
+    if text.startswith("@"):
+        with open(text[1:]) as f:
+            text = f.read()
+
+    result = run_request(engine, json.loads(text))
+    body = to_arrow(result) if args.format == "arrow" else to_json(result).encode("utf-8")
+
+    if args.output:
+        with open(args.output, "wb") as f:
+            f.write(body)
+    else:
+        sys.stdout.buffer.write(body + (b"\n" if args.format == "json" else b""))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,16 @@
 import streamlit as st
+from config import WARMUP_HEAVY_IMPORTS
 from utils.data_loader import load_dataset
+from utils.data_quality import quality_issues, user_columns
+from utils.lazy_imports import start_warm_up
+from utils.memory import memory_sidebar
 
 st.set_page_config(page_title="Upload Dataset", layout="wide")
+
+if WARMUP_HEAVY_IMPORTS:
+    start_warm_up()
 st.header(" Upload FMCG Dataset")
+memory_sidebar()
 
 uploaded_file = st.file_uploader(
     "Upload CSV or Excel",
@@ -17,7 +25,19 @@ if uploaded_file is not None:
         st.session_state["data"] = df
 
         st.success(" Dataset loaded successfully")
-        st.info(f"Rows: {df.shape[0]} | Columns: {df.shape[1]}")
-        st.dataframe(df.head(), use_container_width=True)
+        preview = user_columns(df)
+        st.info(f"Rows: {preview.shape[0]} | Columns: {preview.shape[1]}")
+        st.dataframe(preview.head(), use_container_width=True)
+
+        report = st.session_state.get("data_quality")
+        if report is not None:
+            st.subheader("Data Quality Report")
+            q1, q2, q3 = st.columns(3)
+            q1.metric("Date Column", report["date_column"] or "Not detected")
+            q2.metric("Unusable Dates", f"{report['missing_dates'] + report['date_parse_failures']:,}")
+            q3.metric("Negative Sales Rows", f"{report['negative_sales']:,}")
+
+            st.dataframe(quality_issues(report), use_container_width=True, hide_index=True)
+            st.dataframe(report["columns"], use_container_width=True, hide_index=True)
     else:
         st.error(" Dataset is empty or invalid")
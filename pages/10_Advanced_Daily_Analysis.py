@@ -2,7 +2,21 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.express as px
-from prophet import Prophet
+
+from utils.artifact_store import get_store
+from utils.data_quality import valid_date_rows
+from utils.date_dimension import (
+    DATE_KEY_COL,
+    build_calendar,
+    calendar_lookup,
+    to_date_key,
+)
+from utils.export import export_widget
+from utils.forecasting import fit_prophet
+from utils.intervals import prediction_intervals, residuals
+from utils.memory import track_derived
+from utils.sections import SectionExecutor
+from utils.visualizations import add_interval_band
 
 st.set_page_config(page_title="Advanced Daily Sales Analysis", layout="wide")
 st.title("Advanced Daily Sales Analysis")
@@ -14,7 +28,7 @@ if "data" not in st.session_state or st.session_state["data"] is None:
     st.warning(" Please upload data from the Upload Dataset page")
     st.stop()
 
-df = st.session_state["data"].copy()
+df = source_df = st.session_state["data"]
 
 # ---------------------------
 # Required columns check
@@ -32,8 +46,10 @@ if missing_cols:
 # ---------------------------
 # Data preprocessing
 # ---------------------------
-df["ORDER_DATE"] = pd.to_datetime(df["ORDER_DATE"], errors="coerce")
-df = df.dropna(subset=["ORDER_DATE"])
+# Bad dates were flagged once at ingest (see Upload page report)
+df = track_derived("advanced_valid_dates", valid_date_rows(df, "ORDER_DATE"), source=df)
+dataset_version = st.session_state.get("dataset_version")
+calendar = build_calendar(df[DATE_KEY_COL])
 
 # ---------------------------
 # Sidebar filters
@@ -47,101 +63,164 @@ city_filter = st.sidebar.multiselect("Select City", sorted(df["CITY"].dropna().u
 warehouse_filter = st.sidebar.multiselect("Select Warehouse", sorted(df["WAREHOUSE"].dropna().unique()))
 brand_filter = st.sidebar.multiselect("Select Brand", sorted(df["BRAND"].dropna().unique()))
 
-filtered_df = df[
-    (df["ORDER_DATE"].dt.date >= date_range[0]) &
-    (df["ORDER_DATE"].dt.date <= date_range[1])
-]
+start_key, end_key = to_date_key(pd.Series(date_range))
+filter_mask = (df[DATE_KEY_COL] >= start_key) & (df[DATE_KEY_COL] <= end_key)
 
 if city_filter:
-    filtered_df = filtered_df[filtered_df["CITY"].isin(city_filter)]
+    filter_mask &= df["CITY"].isin(city_filter)
 if warehouse_filter:
-    filtered_df = filtered_df[filtered_df["WAREHOUSE"].isin(warehouse_filter)]
+    filter_mask &= df["WAREHOUSE"].isin(warehouse_filter)
 if brand_filter:
-    filtered_df = filtered_df[filtered_df["BRAND"].isin(brand_filter)]
+    filter_mask &= df["BRAND"].isin(brand_filter)
+
+filtered_df = track_derived("advanced_filtered", df[filter_mask])
 
 # ---------------------------
 # Daily aggregation
 # ---------------------------
-daily_sales = filtered_df.groupby(filtered_df["ORDER_DATE"].dt.date).agg(
+daily_sales = filtered_df.groupby(DATE_KEY_COL).agg(
     Total_Sales_Amount=("AMOUNT", "sum"),
     Total_Quantity=("TOTAL_QUANTITY", "sum"),
     Total_Orders=("ORDER_ID", "nunique")
 ).reset_index()
 
-daily_sales.rename(columns={"ORDER_DATE": "Date"}, inplace=True)
+daily_keys = daily_sales[DATE_KEY_COL].to_numpy()
+daily_sales.insert(0, "Date", calendar_lookup(daily_keys, calendar, "DATE"))
 
 # ---------------------------
-# Step 1: Week-on-Week & Month-on-Month Growth
+# Independent sections (computed concurrently, rendered as they finish)
 # ---------------------------
-st.subheader("1 Week-on-Week & Month-on-Month Growth")
+def growth_section():
+    # Week key carries the ISO year, so week 1 of different years never merge
+    weeks = calendar_lookup(daily_keys, calendar, "WEEK_KEY")
+    months = calendar_lookup(daily_keys, calendar, "MONTH_KEY")
+    sales = daily_sales["Total_Sales_Amount"]
 
-daily_sales["Week"] = pd.to_datetime(daily_sales["Date"]).dt.isocalendar().week
-daily_sales["Month"] = pd.to_datetime(daily_sales["Date"]).dt.to_period("M")
+    weekly_sales = sales.groupby(weeks).sum().pct_change().fillna(0) * 100
+    monthly_sales = sales.groupby(months).sum().pct_change().fillna(0) * 100
+    return weekly_sales.iloc[-1], monthly_sales.iloc[-1]
 
-weekly_sales = daily_sales.groupby("Week")["Total_Sales_Amount"].sum().pct_change().fillna(0) * 100
-monthly_sales = daily_sales.groupby("Month")["Total_Sales_Amount"].sum().pct_change().fillna(0) * 100
 
-k1, k2 = st.columns(2)
-k1.metric("Week-on-Week Growth %", f"{weekly_sales.iloc[-1]:.2f}%")
-k2.metric("Month-on-Month Growth %", f"{monthly_sales.iloc[-1]:.2f}%")
+def top5_section(group_col):
+    return filtered_df.groupby(group_col)["AMOUNT"].sum().nlargest(5).reset_index()
 
-# ---------------------------
-# Step 2: Top 5 Cities / Warehouses / Brands
-# ---------------------------
-st.subheader(" 2 Top 5 Cities, Warehouses & Brands")
 
-top_cities = filtered_df.groupby("CITY")["AMOUNT"].sum().nlargest(5).reset_index()
-top_warehouses = filtered_df.groupby("WAREHOUSE")["AMOUNT"].sum().nlargest(5).reset_index()
-top_brands = filtered_df.groupby("BRAND")["AMOUNT"].sum().nlargest(5).reset_index()
+def heatmap_section():
+    # Aggregate per day first, then bucket the (few) daily rows via the calendar
+    heatmap_data = daily_sales[["Total_Sales_Amount"]].copy()
+    heatmap_data["Day"] = calendar_lookup(daily_keys, calendar, "DAY")
+    heatmap_data["Month"] = calendar_lookup(daily_keys, calendar, "MONTH")
 
-col1, col2, col3 = st.columns(3)
-col1.bar_chart(top_cities.set_index("CITY"))
-col2.bar_chart(top_warehouses.set_index("WAREHOUSE"))
-col3.bar_chart(top_brands.set_index("BRAND"))
+    heatmap_pivot = heatmap_data.pivot_table(
+        index="Day", columns="Month", values="Total_Sales_Amount", aggfunc="sum", fill_value=0
+    )
 
-# ---------------------------
-# Step 3: Sales Heatmap (Day vs Month)
-# ---------------------------
-st.subheader("3️ Sales Heatmap (Day vs Month)")
-
-heatmap_data = filtered_df.copy()
-heatmap_data["Day"] = heatmap_data["ORDER_DATE"].dt.day
-heatmap_data["Month"] = heatmap_data["ORDER_DATE"].dt.month
+    return px.imshow(
+        heatmap_pivot,
+        labels=dict(x="Month", y="Day", color="Sales Amount"),
+        x=[str(m) for m in heatmap_pivot.columns],
+        y=[str(d) for d in heatmap_pivot.index],
+        color_continuous_scale="Viridis"
+    )
 
-heatmap_pivot = heatmap_data.pivot_table(
-    index="Day", columns="Month", values="AMOUNT", aggfunc="sum", fill_value=0
-)
 
-fig_heatmap = px.imshow(
-    heatmap_pivot,
-    labels=dict(x="Month", y="Day", color="Sales Amount"),
-    x=[str(m) for m in heatmap_pivot.columns],
-    y=[str(d) for d in heatmap_pivot.index],
-    color_continuous_scale="Viridis"
-)
-st.plotly_chart(fig_heatmap, use_container_width=True)
+def prophet_forecast(model, periods):
+    # Prophet runs without uncertainty sampling; intervals come from its residuals
+    model, freq = model
+    forecast = model.predict(model.make_future_dataframe(periods=periods, freq=freq))
+    history = model.history["y"].to_numpy()
+    errors = residuals(history, forecast["yhat"].to_numpy()[:len(history)])
+    # History rows are one step from their own data; future rows h steps ahead
+    horizon = np.maximum(np.arange(len(forecast)) - len(history) + 1, 1)
+    forecast["yhat_lower"], forecast["yhat_upper"] = prediction_intervals(forecast["yhat"], errors, horizon=horizon)
+    return forecast
 
-# ---------------------------
-# Step 4: Forecast Overlay (Prophet)
-# ---------------------------
-st.subheader("4️ Sales Forecast Overlay")
 
-forecast_days = st.slider("Select Forecast Days", min_value=7, max_value=90, value=30, step=1)
+def forecast_section(forecast_days):
+    prophet_df = daily_sales[["Date", "Total_Sales_Amount"]].rename(columns={"Date": "ds", "Total_Sales_Amount": "y"})
 
-prophet_df = daily_sales[["Date", "Total_Sales_Amount"]].rename(columns={"Date": "ds", "Total_Sales_Amount": "y"})
-model = Prophet(daily_seasonality=True, yearly_seasonality=True, weekly_seasonality=True)
-model.fit(prophet_df)
+    # Fitted model and forecast persist across restarts, keyed by the
+    # columns and filters they were built from
+    store = get_store()
+    scope = {
+        "date_range": date_range,
+        "CITY": city_filter, "WAREHOUSE": warehouse_filter, "BRAND": brand_filter,
+    }
+    model, model_key = store.get_or_compute(
+        fit_prophet, source_df,
+        columns=[DATE_KEY_COL, "AMOUNT", "CITY", "WAREHOUSE", "BRAND"],
+        args=(prophet_df["ds"], prophet_df["y"], "D"),
+        scope=scope,
+        dataset_version=dataset_version,
+    )
+    forecast, _ = store.get_or_compute(
+        prophet_forecast, source_df, columns=[],
+        args=(model,), params={"periods": forecast_days},
+        depends_on=[model_key],
+        dataset_version=dataset_version,
+    )
 
-future = model.make_future_dataframe(periods=forecast_days)
-forecast = model.predict(future)
+    fig_forecast = px.line()
+    fig_forecast.add_scatter(x=prophet_df["ds"], y=prophet_df["y"], mode="lines", name="Actual")
+    fig_forecast.add_scatter(x=forecast["ds"], y=forecast["yhat"], mode="lines", name="Forecast")
+    add_interval_band(fig_forecast, forecast["ds"], forecast["yhat_lower"], forecast["yhat_upper"])
+    return fig_forecast, forecast
 
-fig_forecast = px.line()
-fig_forecast.add_scatter(x=prophet_df["ds"], y=prophet_df["y"], mode="lines", name="Actual")
-fig_forecast.add_scatter(x=forecast["ds"], y=forecast["yhat"], mode="lines", name="Forecast")
-st.plotly_chart(fig_forecast, use_container_width=True)
 
 # ---------------------------
-# Download forecast
+# Page layout
 # ---------------------------
-forecast_csv = forecast[["ds", "yhat", "yhat_lower", "yhat_upper"]].to_csv(index=False).encode("utf-8")
-st.download_button("⬇ Download Forecast CSV", data=forecast_csv, file_name="sales_forecast.csv", mime="text/csv")
+st.subheader("1 Week-on-Week & Month-on-Month Growth")
+k1, k2 = st.columns(2)
+growth_slot = (k1.empty(), k2.empty())
+
+st.subheader(" 2 Top 5 Cities, Warehouses & Brands")
+col1, col2, col3 = st.columns(3)
+top5_slots = {"CITY": col1.empty(), "WAREHOUSE": col2.empty(), "BRAND": col3.empty()}
+
+st.subheader("3️ Sales Heatmap (Day vs Month)")
+heatmap_slot = st.empty()
+
+st.subheader("4️ Sales Forecast Overlay")
+forecast_days = st.slider("Select Forecast Days", min_value=7, max_value=90, value=30, step=1)
+forecast_slot = st.container()
+forecast_status = forecast_slot.empty()
+forecast_status.info("Fitting forecast model…")
+
+with SectionExecutor() as sections:
+    # Slowest section first so it runs while the others render
+    sections.submit("forecast", forecast_section, forecast_days)
+    sections.submit("growth", growth_section)
+    for group_col in top5_slots:
+        sections.submit(group_col, top5_section, group_col)
+    sections.submit("heatmap", heatmap_section)
+
+    for name, result in sections.as_completed():
+        if name == "growth":
+            growth_slot[0].metric("Week-on-Week Growth %", f"{result[0]:.2f}%")
+            growth_slot[1].metric("Month-on-Month Growth %", f"{result[1]:.2f}%")
+        elif name in top5_slots:
+            top5_slots[name].bar_chart(result.set_index(name))
+        elif name == "heatmap":
+            heatmap_slot.plotly_chart(result, use_container_width=True)
+        elif name == "forecast":
+            fig_forecast, forecast = result
+            forecast_status.plotly_chart(fig_forecast, use_container_width=True)
+
+            # ---------------------------
+            # Download forecast
+            # ---------------------------
+            with forecast_slot:
+                export_widget(
+                    forecast[["ds", "yhat", "yhat_lower", "yhat_upper"]],
+                    "sales_forecast",
+                    key="forecast_export",
+                    label="⬇ Download Forecast"
+                )
+
+# ---------------------------
+# Export filtered orders
+# ---------------------------
+st.subheader("5️ Export Filtered Orders")
+st.caption(f"{int(filter_mask.sum()):,} rows match the current filters")
+export_widget(df, "filtered_orders", key="orders_export", mask=filter_mask, label="⬇ Download Orders")
@@ -1,7 +1,18 @@
 import streamlit as st
-import pandas as pd
 import plotly.express as px
 
+from utils.anomaly import AnomalyDetector
+from utils.data_quality import valid_date_rows
+from utils.date_dimension import (
+    DATE_KEY_COL,
+    build_calendar,
+    calendar_lookup,
+)
+from utils.memory import track_derived
+from utils.metrics import top_n
+from utils.parallel_agg import grouped_aggregate
+from utils.sections import SectionExecutor
+
 st.set_page_config(page_title="Actionable Insights", layout="wide")
 
 st.title(" Actionable Insights Dashboard")
@@ -13,7 +24,7 @@ if "df" not in st.session_state:
     st.warning(" Please upload a dataset from the Upload Dataset page.")
     st.stop()
 
-df = st.session_state["df"].copy()
+df = st.session_state["df"]
 
 # -------------------------------------------------
 # Column validation
@@ -28,13 +39,19 @@ if missing:
 # -------------------------------------------------
 # Data preparation
 # -------------------------------------------------
-df["ORDER_DATE"] = pd.to_datetime(df["ORDER_DATE"], errors="coerce")
-df = df.dropna(subset=["ORDER_DATE"])
+# Bad dates were flagged once at ingest (see Upload page report)
+df = track_derived("insights_valid_dates", valid_date_rows(df, "ORDER_DATE"), source=df)
+
+calendar = build_calendar(df[DATE_KEY_COL])
 
-df["order_day"] = df["ORDER_DATE"].dt.day
-df["order_month"] = df["ORDER_DATE"].dt.month
-df["order_week"] = df["ORDER_DATE"].dt.isocalendar().week
-df["order_year"] = df["ORDER_DATE"].dt.year
+# Daily totals are the base for every time bucket below
+daily_sales = grouped_aggregate(df, DATE_KEY_COL, {"AMOUNT": ("AMOUNT", "sum")}).reset_index()
+daily_keys = daily_sales[DATE_KEY_COL].to_numpy()
+daily_sales["order_day"] = calendar_lookup(daily_keys, calendar, "DAY")
+daily_sales["order_month"] = calendar_lookup(daily_keys, calendar, "MONTH")
+daily_sales["order_week"] = calendar_lookup(daily_keys, calendar, "ISO_WEEK")
+daily_sales["order_iso_year"] = calendar_lookup(daily_keys, calendar, "ISO_YEAR")
+daily_sales["order_year"] = calendar_lookup(daily_keys, calendar, "YEAR")
 
 # -------------------------------------------------
 # KPI SECTION
@@ -42,8 +59,8 @@ df["order_year"] = df["ORDER_DATE"].dt.year
 st.subheader("🚦 Business KPIs")
 
 total_sales = df["AMOUNT"].sum()
-avg_daily_sales = df.groupby("ORDER_DATE")["AMOUNT"].sum().mean()
-max_day_sales = df.groupby("ORDER_DATE")["AMOUNT"].sum().max()
+avg_daily_sales = daily_sales["AMOUNT"].mean()
+max_day_sales = daily_sales["AMOUNT"].max()
 
 col1, col2, col3 = st.columns(3)
 
@@ -66,108 +83,149 @@ col3.metric(
 st.divider()
 
 # -------------------------------------------------
-# TOP CONTRIBUTORS
+# SECTION BUILDERS (run concurrently, rendered in place)
 # -------------------------------------------------
-st.subheader(" Top Business Drivers")
+def top_contributors(group_col, title):
+    top = top_n(df, group_col, "AMOUNT", 5)
+    return px.bar(top, x=group_col, y="AMOUNT", title=title)
 
-c1, c2, c3 = st.columns(3)
 
-with c1:
-    top_city = (
-        df.groupby("CITY", as_index=False)["AMOUNT"]
-        .sum()
-        .sort_values("AMOUNT", ascending=False)
-        .head(5)
+def sales_heatmap():
+    heatmap_df = (
+        daily_sales.groupby(["order_day", "order_month"], as_index=False)
+        .agg({"AMOUNT": "sum"})
     )
-    fig = px.bar(top_city, x="CITY", y="AMOUNT", title="Top 5 Cities")
-    st.plotly_chart(fig, use_container_width=True)
 
-with c2:
-    top_wh = (
-        df.groupby("WAREHOUSE", as_index=False)["AMOUNT"]
-        .sum()
-        .sort_values("AMOUNT", ascending=False)
-        .head(5)
+    pivot_heatmap = heatmap_df.pivot(
+        index="order_day",
+        columns="order_month",
+        values="AMOUNT"
     )
-    fig = px.bar(top_wh, x="WAREHOUSE", y="AMOUNT", title="Top 5 Warehouses")
-    st.plotly_chart(fig, use_container_width=True)
 
-with c3:
-    top_brand = (
-        df.groupby("BRAND", as_index=False)["AMOUNT"]
-        .sum()
-        .sort_values("AMOUNT", ascending=False)
-        .head(5)
+    return px.imshow(
+        pivot_heatmap,
+        labels=dict(
+            x="Month",
+            y="Day of Month",
+            color="Sales Amount"
+        ),
+        title="Sales Intensity Heatmap",
+        aspect="auto"
     )
-    fig = px.bar(top_brand, x="BRAND", y="AMOUNT", title="Top 5 Brands")
-    st.plotly_chart(fig, use_container_width=True)
-
-st.divider()
-
-# -------------------------------------------------
-# SALES HEATMAP (FIXED)
-# -------------------------------------------------
-st.subheader(" Sales Heatmap (Day vs Month)")
-
-heatmap_df = (
-    df.groupby(["order_day", "order_month"], as_index=False)
-    .agg({"AMOUNT": "sum"})
-)
-
-pivot_heatmap = heatmap_df.pivot(
-    index="order_day",
-    columns="order_month",
-    values="AMOUNT"
-)
-
-fig_heatmap = px.imshow(
-    pivot_heatmap,
-    labels=dict(
-        x="Month",
-        y="Day of Month",
-        color="Sales Amount"
-    ),
-    title="Sales Intensity Heatmap",
-    aspect="auto"
-)
 
-st.plotly_chart(fig_heatmap, use_container_width=True)
 
-st.divider()
-
-# -------------------------------------------------
-# WEEK-ON-WEEK & MONTH-ON-MONTH GROWTH
-# -------------------------------------------------
-st.subheader(" Growth Trends")
-
-growth_col1, growth_col2 = st.columns(2)
-
-with growth_col1:
+def weekly_trend():
     weekly_sales = (
-        df.groupby(["order_year", "order_week"], as_index=False)["AMOUNT"]
+        daily_sales.groupby(["order_iso_year", "order_week"], as_index=False)["AMOUNT"]
         .sum()
     )
-    fig = px.line(
+    return px.line(
         weekly_sales,
         x="order_week",
         y="AMOUNT",
-        color="order_year",
+        color="order_iso_year",
         title="Week-on-Week Sales Trend"
     )
-    st.plotly_chart(fig, use_container_width=True)
 
-with growth_col2:
+
+def monthly_trend():
     monthly_sales = (
-        df.groupby(["order_year", "order_month"], as_index=False)["AMOUNT"]
+        daily_sales.groupby(["order_year", "order_month"], as_index=False)["AMOUNT"]
         .sum()
     )
-    fig = px.line(
+    return px.line(
         monthly_sales,
         x="order_month",
         y="AMOUNT",
         color="order_year",
         title="Month-on-Month Sales Trend"
     )
-    st.plotly_chart(fig, use_container_width=True)
+
+
+# -------------------------------------------------
+# TOP CONTRIBUTORS
+# -------------------------------------------------
+st.subheader(" Top Business Drivers")
+
+c1, c2, c3 = st.columns(3)
+slots = {"top_city": c1.empty(), "top_wh": c2.empty(), "top_brand": c3.empty()}
+
+st.divider()
+
+# -------------------------------------------------
+# SALES HEATMAP (FIXED)
+# -------------------------------------------------
+st.subheader(" Sales Heatmap (Day vs Month)")
+slots["heatmap"] = st.empty()
+
+st.divider()
+
+# -------------------------------------------------
+# WEEK-ON-WEEK & MONTH-ON-MONTH GROWTH
+# -------------------------------------------------
+st.subheader(" Growth Trends")
+
+growth_col1, growth_col2 = st.columns(2)
+slots["weekly"] = growth_col1.empty()
+slots["monthly"] = growth_col2.empty()
+
+with SectionExecutor() as sections:
+    sections.submit("top_city", top_contributors, "CITY", "Top 5 Cities")
+    sections.submit("top_wh", top_contributors, "WAREHOUSE", "Top 5 Warehouses")
+    sections.submit("top_brand", top_contributors, "BRAND", "Top 5 Brands")
+    sections.submit("heatmap", sales_heatmap)
+    sections.submit("weekly", weekly_trend)
+    sections.submit("monthly", monthly_trend)
+
+    for name, fig in sections.as_completed():
+        slots[name].plotly_chart(fig, use_container_width=True)
+
+st.divider()
+
+# -------------------------------------------------
+# ANOMALY ALERTS
+# -------------------------------------------------
+st.subheader("🚨 Unusual Days")
+
+
+def anomaly_detector(dims, method):
+    # One detector per session; a re-upload that only appends days is
+    # folded in incrementally instead of rebuilding every series
+    version = st.session_state.get("dataset_version")
+    cached = st.session_state.get("anomaly_detector")
+
+    if cached is not None and cached["key"] == (dims, method):
+        detector = cached["detector"]
+        if cached["version"] == version:
+            return detector
+        if detector.is_prefix_of(df):
+            detector.update(df[df[DATE_KEY_COL].to_numpy() > detector.last_key])
+            cached["version"] = version
+            return detector
+
+    detector = AnomalyDetector(list(dims), "AMOUNT", method=method).fit(df)
+    st.session_state["anomaly_detector"] = {
+        "key": (dims, method), "version": version, "detector": detector
+    }
+    return detector
+
+
+a1, a2, a3 = st.columns(3)
+anomaly_dims = a1.multiselect("Series by", ["CITY", "WAREHOUSE", "BRAND"], default=["CITY", "BRAND"])
+method = a2.radio(
+    "Baseline", ["seasonal", "rolling"], horizontal=True,
+    format_func=lambda m: "Same weekday, last 8 weeks" if m == "seasonal" else "Last 28 days"
+)
+threshold = a3.slider("Alert Threshold (robust z)", 2.0, 10.0, 3.5, 0.5)
+
+if anomaly_dims:
+    detector = anomaly_detector(tuple(anomaly_dims), method)
+    anomalies = detector.top_anomalies(threshold)
+
+    st.caption(f"{len(detector.series):,} daily series scored over the last {detector.recent_days} days")
+    if anomalies.empty:
+        st.info("No unusual days at this threshold")
+    else:
+        st.dataframe(anomalies.round(2), use_container_width=True, hide_index=True)
 
 st.success(" Actionable Insights Dashboard loaded successfully")
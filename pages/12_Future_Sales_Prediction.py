@@ -1,8 +1,11 @@
 import streamlit as st
 import pandas as pd
-import numpy as np
 import plotly.express as px
-from sklearn.ensemble import RandomForestRegressor
+
+from utils.data_quality import valid_date_rows
+from utils.forecasting import forecast_with_intervals
+from utils.memory import track_derived
+from utils.visualizations import add_interval_band
 
 st.set_page_config(page_title="Future Sales Prediction", layout="wide")
 st.title(" Future Sales Prediction (Next 12 Months)")
@@ -14,7 +17,7 @@ if "df" not in st.session_state:
     st.warning(" Please upload dataset from Upload Dataset page.")
     st.stop()
 
-df = st.session_state["df"].copy()
+df = st.session_state["df"]
 
 # -------------------------------------------------
 # Required columns check
@@ -28,8 +31,8 @@ if missing:
 # -------------------------------------------------
 # Data preparation
 # -------------------------------------------------
-df["ORDER_DATE"] = pd.to_datetime(df["ORDER_DATE"], errors="coerce")
-df = df.dropna(subset=["ORDER_DATE"])
+# Bad dates were flagged once at ingest (see Upload page report)
+df = track_derived("prediction_valid_dates", valid_date_rows(df, "ORDER_DATE"), source=df)
 
 df["Date"] = df["ORDER_DATE"].dt.to_period("M").dt.to_timestamp()
 
@@ -39,44 +42,19 @@ monthly_sales = (
     .sort_values("Date")
 )
 
-# Create time index
-monthly_sales["time_idx"] = np.arange(len(monthly_sales))
-
-X = monthly_sales[["time_idx"]]
-y = monthly_sales["AMOUNT"]
-
 # -------------------------------------------------
-# Train model
-# -------------------------------------------------
-model = RandomForestRegressor(
-    n_estimators=300,
-    random_state=42
-)
-model.fit(X, y)
-
-# -------------------------------------------------
-# Forecast next 12 months
+# Train model & forecast next 12 months
 # -------------------------------------------------
 future_steps = 12
-last_idx = monthly_sales["time_idx"].max()
-
-future_idx = np.arange(last_idx + 1, last_idx + future_steps + 1)
-future_X = pd.DataFrame({"time_idx": future_idx})
-
-future_preds = model.predict(future_X)
-
-# SAFE future dates generation
-last_date = monthly_sales["Date"].max()
-
-future_dates = pd.date_range(
-    start=last_date + pd.DateOffset(months=1),
-    periods=12,
-    freq="MS"
+forecast = forecast_with_intervals(
+    "Random Forest", monthly_sales["Date"], monthly_sales["AMOUNT"], future_steps, "MS"
 )
 
 forecast_df = pd.DataFrame({
-    "Date": future_dates,
-    "AMOUNT": future_preds,
+    "Date": forecast["ds"],
+    "AMOUNT": forecast["yhat"],
+    "Lower": forecast["yhat_lower"],
+    "Upper": forecast["yhat_upper"],
     "Type": "Forecast"
 })
 
@@ -124,6 +102,7 @@ fig = px.line(
     markers=True,
     title="Sales Forecast – Next 12 Months"
 )
+add_interval_band(fig, forecast_df["Date"], forecast_df["Lower"], forecast_df["Upper"], name="95% Interval")
 st.plotly_chart(fig, use_container_width=True)
 
 # -------------------------------------------------
@@ -134,9 +113,11 @@ st.subheader("Forecast Table")
 table_df = forecast_df.copy()
 table_df["Month"] = table_df["Date"].dt.strftime("%b %Y")
 table_df["Predicted Sales"] = table_df["AMOUNT"].round(0)
+table_df["Lower (95%)"] = table_df["Lower"].round(0)
+table_df["Upper (95%)"] = table_df["Upper"].round(0)
 
 st.dataframe(
-    table_df[["Month", "Predicted Sales"]],
+    table_df[["Month", "Predicted Sales", "Lower (95%)", "Upper (95%)"]],
     use_container_width=True
 )
 
@@ -0,0 +1,92 @@
+# pages/13_Forecast_Backtesting.py
+
+from importlib.util import find_spec
+
+import streamlit as st
+import plotly.express as px
+
+from utils.artifact_store import get_store
+from utils.backtesting import backtest
+from utils.column_detector import auto_detect_columns
+from utils.forecasting import FORECASTERS, prepare_time_series
+from utils.memory import budgeted_cache, memory_sidebar
+
+st.set_page_config(page_title="Forecast Backtesting", layout="wide")
+st.title("Forecast Model Backtesting")
+memory_sidebar()
+
+df = st.session_state.get("df")
+if df is None:
+    st.warning("Please upload dataset first")
+    st.stop()
+
+cols = auto_detect_columns(df)
+
+date_col = cols.get("date")
+sales_col = cols.get("sales")
+
+if not date_col or not sales_col:
+    st.error("Date or Sales column not detected")
+    st.stop()
+
+GRANULARITIES = {"Monthly": ("MS", 3, 6), "Daily": ("D", 14, 60)}
+
+
+@budgeted_cache
+def run_backtest(dataset_version, granularity, horizon, n_folds, models):
+    freq, _, min_train = GRANULARITIES[granularity]
+    store = get_store()
+    ts_df, ts_key = store.get_or_compute(
+        prepare_time_series, df, columns=[date_col, sales_col],
+        args=(df, date_col, sales_col), params={"freq": freq},
+        dataset_version=dataset_version,
+    )
+    result, _ = store.get_or_compute(
+        backtest, df, columns=[],
+        args=(ts_df, date_col, sales_col),
+        params={
+            "freq": freq, "horizon": horizon, "n_folds": n_folds,
+            "min_train": min_train, "models": list(models),
+        },
+        depends_on=[ts_key],
+        dataset_version=dataset_version,
+    )
+    return result
+
+
+c1, c2, c3 = st.columns(3)
+granularity = c1.selectbox("Granularity", list(GRANULARITIES))
+horizon = c2.number_input("Forecast Horizon (periods)", 1, 90, GRANULARITIES[granularity][1])
+n_folds = c3.slider("Rolling Origins (folds)", 2, 12, 5)
+
+installed = [name for name in FORECASTERS if name != "Prophet" or find_spec("prophet")]
+models = st.multiselect("Models", installed, default=installed)
+
+if not models:
+    st.info("Select at least one model")
+    st.stop()
+
+try:
+    with st.spinner("Running rolling-origin backtest…"):
+        folds_df, summary = run_backtest(
+            st.session_state.get("dataset_version"), granularity,
+            int(horizon), n_folds, tuple(models)
+        )
+except ValueError as e:
+    st.error(str(e))
+    st.stop()
+
+best = summary.iloc[0]
+k1, k2, k3 = st.columns(3)
+k1.metric("Most Accurate Model", best["Model"])
+k2.metric("WAPE", f"{best['WAPE_%']:.1f}%")
+k3.metric("Fit Time per Fold", f"{best['Fit_Seconds']:.2f}s")
+
+st.subheader("Accuracy & Cost by Model")
+st.dataframe(summary.round(3), use_container_width=True, hide_index=True)
+
+fig = px.bar(
+    folds_df, x="Train_End", y="Abs_Error", color="Model",
+    barmode="group", title="Absolute Error per Fold"
+)
+st.plotly_chart(fig, use_container_width=True)
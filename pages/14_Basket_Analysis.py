@@ -0,0 +1,65 @@
+# pages/14_Basket_Analysis.py
+
+import streamlit as st
+import plotly.express as px
+
+from config import BASKET_MIN_LIFT, BASKET_MIN_SUPPORT
+from utils.basket import sku_pairs
+from utils.column_detector import auto_detect_columns
+from utils.memory import budgeted_cache, memory_sidebar
+
+st.set_page_config(page_title="Basket Analysis", layout="wide")
+st.title("SKU Basket Analysis")
+memory_sidebar()
+
+df = st.session_state.get("df")
+if df is None:
+    st.warning("Please upload dataset first")
+    st.stop()
+
+cols = auto_detect_columns(df)
+
+order_col = cols.get("order")
+sku_col = cols.get("sku")
+
+if not order_col or not sku_col:
+    st.error("Order ID or SKU column not detected")
+    st.stop()
+
+
+@budgeted_cache
+def basket_pairs(dataset_version, min_support, min_lift, top_n):
+    return sku_pairs(df, order_col, sku_col, min_support, min_lift, top_n)
+
+
+c1, c2, c3 = st.columns(3)
+min_support = c1.number_input(
+    "Min Support %", 0.001, 50.0, BASKET_MIN_SUPPORT * 100, format="%.3f"
+) / 100
+min_lift = c2.number_input("Min Lift", 0.0, 100.0, BASKET_MIN_LIFT, step=0.1)
+top_n = c3.slider("Pairs to Show", 10, 500, 100, step=10)
+
+with st.spinner("Computing SKU co-occurrence…"):
+    pairs = basket_pairs(st.session_state.get("dataset_version"), min_support, min_lift, top_n)
+
+if pairs.empty:
+    st.info("No SKU pairs pass the current thresholds")
+    st.stop()
+
+st.subheader("Top SKU Pairs by Lift")
+st.dataframe(pairs.round(3), use_container_width=True, hide_index=True)
+
+top = pairs.head(20).copy()
+top["Pair"] = top["SKU_A"].astype(str) + " + " + top["SKU_B"].astype(str)
+fig = px.bar(top, x="Pair", y="Lift", color="Support_%", title="Strongest Associations")
+st.plotly_chart(fig, use_container_width=True)
+
+st.subheader("Frequently Bought Together")
+all_skus = sorted(set(pairs["SKU_A"]) | set(pairs["SKU_B"]), key=str)
+sku = st.selectbox("SKU", all_skus)
+partners = pairs[(pairs["SKU_A"] == sku) | (pairs["SKU_B"] == sku)].copy()
+partners["Partner"] = partners["SKU_B"].where(partners["SKU_A"] == sku, partners["SKU_A"])
+st.dataframe(
+    partners[["Partner", "Orders_Together", "Support_%", "Lift"]].round(3),
+    use_container_width=True, hide_index=True
+)
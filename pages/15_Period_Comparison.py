@@ -0,0 +1,102 @@
+# pages/15_Period_Comparison.py
+
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+from utils.column_detector import auto_detect_columns
+from utils.date_dimension import to_date_key
+from utils.memory import budgeted_cache, memory_sidebar
+from utils.period_comparison import (
+    build_prefix_sums,
+    compare_periods,
+    previous_period,
+    shift_years,
+)
+from utils.table import paged_table
+
+st.set_page_config(page_title="Period Comparison", layout="wide")
+st.title("Period Comparison")
+memory_sidebar()
+
+df = st.session_state.get("df")
+if df is None:
+    st.warning("Please upload dataset first")
+    st.stop()
+
+cols = auto_detect_columns(df)
+
+if not cols.get("date") or not cols.get("sales"):
+    st.error("Date or Sales column not detected")
+    st.stop()
+
+dimensions = {
+    label: cols[key]
+    for label, key in [("City", "city"), ("State", "state"), ("Brand", "brand"), ("Warehouse", "warehouse")]
+    if cols.get(key)
+}
+if not dimensions:
+    st.error("No city, state, brand or warehouse column detected")
+    st.stop()
+
+
+@budgeted_cache
+def prefix_sums(dataset_version, dim_col):
+    # Built once per dataset and dimension; every range query reuses it
+    return build_prefix_sums(df, dim_col, cols["sales"], cols["date"])
+
+
+c1, c2, c3 = st.columns(3)
+dimension = c1.selectbox("Compare by", list(dimensions))
+baseline = c3.radio("Compare against", ["Same period last year", "Previous period"])
+
+try:
+    sums = prefix_sums(st.session_state.get("dataset_version"), dimensions[dimension])
+except ValueError as e:
+    st.error(str(e))
+    st.stop()
+
+first_date = pd.Timestamp(sums.first_key, unit="D").date()
+last_date = pd.Timestamp(sums.last_key, unit="D").date()
+date_range = c2.date_input(
+    "Current Period", value=(max(first_date, (pd.Timestamp(last_date) - pd.Timedelta(days=29)).date()), last_date),
+    min_value=first_date, max_value=last_date
+)
+if len(date_range) != 2:
+    st.stop()
+
+current = tuple(int(k) for k in to_date_key(pd.Series(date_range)))
+if baseline == "Same period last year":
+    previous = (shift_years(current[0]), shift_years(current[1]))
+else:
+    previous = previous_period(*current)
+
+comparison = compare_periods(sums, current, previous)
+
+total_current = comparison["Current"].sum()
+total_previous = comparison["Previous"].sum()
+k1, k2, k3 = st.columns(3)
+k1.metric("Current Period Sales", f"₹ {total_current:,.0f}")
+k2.metric("Comparison Period Sales", f"₹ {total_previous:,.0f}")
+k3.metric(
+    "Growth",
+    f"{(total_current / total_previous - 1) * 100:.1f}%" if total_previous else "n/a",
+    delta=f"₹ {total_current - total_previous:,.0f}"
+)
+
+st.caption(
+    f"Comparison period: {pd.Timestamp(previous[0], unit='D'):%d %b %Y} – "
+    f"{pd.Timestamp(previous[1], unit='D'):%d %b %Y}"
+)
+
+fig = px.bar(
+    pd.concat([comparison.head(10), comparison.tail(10)]).drop_duplicates(),
+    x=dimensions[dimension], y="Delta", color="Growth_%",
+    title=f"Biggest Gainers & Decliners by {dimension}"
+)
+st.plotly_chart(fig, use_container_width=True)
+
+paged_table(
+    comparison, "period_comparison",
+    version=(st.session_state.get("dataset_version"), dimension, current, previous), digits=2
+)
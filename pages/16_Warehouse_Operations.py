@@ -0,0 +1,90 @@
+# pages/16_Warehouse_Operations.py
+
+import plotly.express as px
+import streamlit as st
+
+from utils.artifact_store import get_store
+from utils.column_detector import auto_detect_columns
+from utils.memory import budgeted_cache, memory_sidebar
+from utils.table import paged_table
+from utils.warehouse_metrics import warehouse_drilldown, warehouse_rollups
+
+st.set_page_config(page_title="Warehouse Operations", layout="wide")
+st.title("Warehouse Operations Dashboard")
+memory_sidebar()
+
+df = st.session_state.get("df")
+if df is None:
+    st.warning("Please upload dataset first")
+    st.stop()
+
+cols = auto_detect_columns(df)
+
+required = {key: cols.get(key) for key in ["warehouse", "sku", "sales", "quantity"]}
+missing = [key for key, col in required.items() if not col]
+if missing:
+    st.error(f"Columns not detected: {missing}")
+    st.stop()
+
+
+@budgeted_cache
+def rollups(dataset_version):
+    # One grouped pass per dataset version, persisted across restarts;
+    # drill-downs slice the result
+    inputs = [cols["warehouse"], cols["sku"], cols["sales"], cols["quantity"]]
+    levels, _ = get_store().get_or_compute(
+        warehouse_rollups, df,
+        columns=inputs + ([cols["asset"]] if cols.get("asset") else []),
+        args=(df, *inputs),
+        params={"asset_col": cols.get("asset")},
+        dataset_version=dataset_version,
+    )
+    return levels
+
+
+dataset_version = st.session_state.get("dataset_version")
+with st.spinner("Aggregating warehouse data…"):
+    levels = rollups(dataset_version)
+
+warehouses = levels["warehouse"]
+
+k1, k2, k3 = st.columns(3)
+k1.metric("Warehouses", f"{len(warehouses):,}")
+k2.metric("Total Sales", f"₹ {warehouses['Total_Sales'].sum():,.0f}")
+k3.metric("Total Quantity", f"{warehouses['Total_Quantity'].sum():,.0f}")
+
+st.plotly_chart(
+    px.bar(
+        warehouses.head(20).reset_index(), x=cols["warehouse"], y="Total_Sales",
+        text="Total_Sales", title="Sales by Warehouse"
+    ),
+    use_container_width=True
+)
+paged_table(warehouses.reset_index(), "warehouses", version=dataset_version)
+
+# -------------------------------------------------
+# Drill-down
+# -------------------------------------------------
+st.subheader("Warehouse Drill-down")
+warehouse = st.selectbox("Warehouse", warehouses.index.tolist())
+
+if "asset" in levels:
+    asset_col, sku_col = st.columns(2)
+    with asset_col:
+        st.markdown("**By Asset**")
+        st.dataframe(
+            warehouse_drilldown(levels, "asset", warehouse),
+            use_container_width=True, hide_index=True
+        )
+    sku_container = sku_col
+else:
+    sku_container = st.container()
+
+with sku_container:
+    skus = warehouse_drilldown(levels, "sku", warehouse)
+    st.markdown("**By SKU**")
+    st.plotly_chart(
+        px.bar(skus.head(10), x=cols["sku"], y="Total_Sales", title=f"Top SKUs – {warehouse}"),
+        use_container_width=True
+    )
+    paged_table(skus, "warehouse_skus", version=(dataset_version, warehouse))
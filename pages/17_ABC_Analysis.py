@@ -0,0 +1,86 @@
+# pages/17_ABC_Analysis.py
+
+import plotly.graph_objects as go
+import streamlit as st
+
+from utils.column_detector import auto_detect_columns
+from utils.export import export_widget
+from utils.filters import filter_mask, sidebar_filters
+from utils.memory import budgeted_cache, memory_sidebar
+from utils.pareto import abc_summary, items_for_share, pareto_curve, pareto_ranking
+from utils.table import paged_table
+
+st.set_page_config(page_title="ABC Analysis", layout="wide")
+st.title("ABC / Pareto Analysis")
+memory_sidebar()
+
+df = st.session_state.get("df")
+if df is None:
+    st.warning("Please upload dataset first")
+    st.stop()
+
+cols = auto_detect_columns(df)
+
+if not cols.get("sales"):
+    st.error("Sales column not detected")
+    st.stop()
+
+dimensions = {
+    label: cols[key]
+    for label, key in [("SKU", "sku"), ("Brand", "brand"), ("Outlet", "outlet")]
+    if cols.get(key)
+}
+if not dimensions:
+    st.error("No SKU, brand or outlet column detected")
+    st.stop()
+
+selection = sidebar_filters(df, cols)
+
+
+@budgeted_cache
+def ranking_for(dataset_version, dim_col, selection):
+    # One ranking per dataset, dimension and filter selection
+    return pareto_ranking(df, dim_col, cols["sales"], mask=filter_mask(df, cols, selection))
+
+
+label = st.radio("Rank", list(dimensions), horizontal=True)
+dim_col = dimensions[label]
+
+try:
+    with st.spinner(f"Ranking {label.lower()}s…"):
+        ranking = ranking_for(st.session_state.get("dataset_version"), dim_col, selection)
+except ValueError as e:
+    st.error(str(e))
+    st.stop()
+
+items, item_pct = items_for_share(ranking, 80)
+summary = abc_summary(ranking)
+
+k1, k2, k3 = st.columns(3)
+k1.metric(f"{label}s Ranked", f"{len(ranking):,}")
+k2.metric(f"{label}s Making 80% of Sales", f"{items:,}", f"{item_pct:.1f}% of {label.lower()}s", delta_color="off")
+k3.metric("Class A Share of Sales", f"{summary.loc[summary['Class'] == 'A', 'Sales_%'].iloc[0]:.1f}%")
+
+# Pareto chart: top items as bars, cumulative share over all items as a line
+curve = pareto_curve(ranking)
+top = ranking.head(50)
+
+fig = go.Figure()
+fig.add_bar(x=top["Rank"], y=top["Sales"], name="Sales (top 50)", marker_color=top["Class"].map(
+    {"A": "#2ca02c", "B": "#ff7f0e", "C": "#d62728"}
+))
+fig.add_scatter(x=curve["Rank"], y=curve["Cumulative_%"], name="Cumulative %", yaxis="y2", mode="lines")
+fig.update_layout(
+    title=f"Pareto Curve – {label}",
+    xaxis_title="Rank",
+    yaxis_title="Sales",
+    yaxis2=dict(title="Cumulative %", overlaying="y", side="right", range=[0, 105]),
+)
+st.plotly_chart(fig, use_container_width=True)
+
+st.subheader("ABC Classes")
+st.dataframe(summary.round(2), use_container_width=True, hide_index=True)
+
+st.subheader(f"{label} Ranking")
+paged_table(ranking, "abc_ranking", version=(st.session_state.get("dataset_version"), dim_col, selection), digits=2)
+export_widget(ranking, f"abc_{label.lower()}", key="abc_export")
@@ -0,0 +1,79 @@
+# pages/18_Cohort_Retention.py
+
+import plotly.express as px
+import streamlit as st
+
+from utils.cohort import average_retention, cohort_retention
+from utils.column_detector import auto_detect_columns
+from utils.export import export_widget
+from utils.filters import filter_mask, sidebar_filters
+from utils.memory import budgeted_cache, memory_sidebar
+
+st.set_page_config(page_title="Cohort Retention", layout="wide")
+st.title("Outlet Cohort Retention")
+memory_sidebar()
+
+df = st.session_state.get("df")
+if df is None:
+    st.warning("Please upload dataset first")
+    st.stop()
+
+cols = auto_detect_columns(df)
+
+if not cols.get("outlet") or not cols.get("date"):
+    st.error("Outlet or Date column not detected")
+    st.stop()
+
+selection = sidebar_filters(df, cols)
+
+
+@budgeted_cache
+def retention(dataset_version, selection):
+    return cohort_retention(df, cols["outlet"], cols["date"], mask=filter_mask(df, cols, selection))
+
+
+try:
+    with st.spinner("Building cohorts…"):
+        rates, counts, sizes = retention(st.session_state.get("dataset_version"), selection)
+except ValueError as e:
+    st.error(str(e))
+    st.stop()
+
+max_age = st.slider("Months Since First Order", 1, rates.shape[1], min(rates.shape[1], 12))
+rates = rates.iloc[:, :max_age]
+curve = average_retention(counts, sizes).iloc[:max_age]
+
+k1, k2, k3 = st.columns(3)
+k1.metric("Cohorts", f"{len(sizes):,}")
+k2.metric("Outlets", f"{sizes.sum():,}")
+if max_age > 1:
+    k3.metric("Month-1 Retention", f"{curve.iloc[1]:.1f}%")
+
+fig = px.imshow(
+    rates,
+    labels=dict(x="Months Since First Order", y="Cohort (first order month)", color="Active %"),
+    x=[str(age) for age in rates.columns],
+    y=rates.index.tolist(),
+    text_auto=".0f",
+    aspect="auto",
+    color_continuous_scale="Blues",
+    title="Share of Cohort Ordering Each Month"
+)
+st.plotly_chart(fig, use_container_width=True)
+
+c1, c2 = st.columns(2)
+with c1:
+    st.plotly_chart(
+        px.line(curve.reset_index(), x="Months_Since_First_Order", y="Retention_%",
+                markers=True, title="Average Retention (size-weighted)"),
+        use_container_width=True
+    )
+with c2:
+    st.plotly_chart(
+        px.bar(sizes.reset_index(), x="Cohort", y="Outlets", title="New Outlets per Cohort"),
+        use_container_width=True
+    )
+
+table = rates.round(1)
+table.insert(0, "Outlets", sizes)
+export_widget(table.reset_index(), "cohort_retention", key="cohort_export")
@@ -0,0 +1,137 @@
+# pages/19_Pricing_Scenarios.py
+
+import numpy as np
+import plotly.express as px
+import streamlit as st
+
+from config import SCENARIO_SWEEP_STEPS
+from utils.column_detector import auto_detect_columns
+from utils.export import export_widget
+from utils.filters import filter_mask, sidebar_filters
+from utils.memory import budgeted_cache, memory_sidebar
+from utils.scenario import price_baseline, scenario_totals, simulate
+from utils.table import paged_table
+
+st.set_page_config(page_title="Pricing Scenarios", layout="wide")
+st.title("Pricing & Discount Scenarios")
+memory_sidebar()
+
+df = st.session_state.get("df")
+if df is None:
+    st.warning("Please upload dataset first")
+    st.stop()
+
+cols = auto_detect_columns(df)
+
+if not cols.get("sku") or not cols.get("quantity") or not (cols.get("price") or cols.get("sales")):
+    st.error("SKU, quantity and price (or sales) columns are required")
+    st.stop()
+
+selection = sidebar_filters(df, cols)
+dataset_version = st.session_state.get("dataset_version")
+
+
+@budgeted_cache
+def baseline_for(dataset_version, selection):
+    # Elasticities are re-estimated only when the data or filters change
+    return price_baseline(
+        df, cols["sku"], cols["quantity"],
+        sales_col=cols.get("sales"), price_col=cols.get("price"), discount_col=cols.get("discount"),
+        date_col=cols.get("date"), brand_col=cols.get("brand"),
+        mask=filter_mask(df, cols, selection),
+    )
+
+
+try:
+    with st.spinner("Estimating price elasticities…"):
+        baseline = baseline_for(dataset_version, selection)
+except ValueError as e:
+    st.error(str(e))
+    st.stop()
+
+# -------------------------------------------------
+# Scenario inputs
+# -------------------------------------------------
+scopes = ["All SKUs"] + (["Brands"] if cols.get("brand") else []) + ["SKUs"]
+c1, c2 = st.columns([1, 3])
+scope = c1.radio("Apply to", scopes)
+if scope == "Brands":
+    chosen = c2.multiselect("Brands", sorted(baseline[cols["brand"]].dropna().unique()))
+    applies = baseline[cols["brand"]].isin(chosen).to_numpy()
+elif scope == "SKUs":
+    chosen = c2.multiselect("SKUs", baseline[cols["sku"]].tolist())
+    applies = baseline[cols["sku"]].isin(chosen).to_numpy()
+else:
+    chosen = []
+    applies = np.ones(len(baseline), dtype=bool)
+
+s1, s2 = st.columns(2)
+price_pct = s1.slider("List Price Change (%)", -30, 30, 0)
+discount_pts = s2.slider(
+    "Discount Change (points of gross)", -10.0, 10.0, 0.0, step=0.5,
+    disabled=not cols.get("discount"),
+    help=None if cols.get("discount") else "No discount column detected"
+)
+
+scenario = scenario_totals(baseline, price_pct / 100, discount_pts / 100, applies).iloc[0]
+base_net = baseline["Net_Sales"].sum()
+base_qty = baseline["Quantity"].sum()
+
+k1, k2, k3, k4 = st.columns(4)
+k1.metric("Projected Net Sales", f"₹ {scenario['Net_Sales']:,.0f}", f"{scenario['Net_Sales_Change_%']:+.1f}%")
+k2.metric("Projected Quantity", f"{scenario['Quantity']:,.0f}", f"{(scenario['Quantity'] / base_qty - 1) * 100:+.1f}%")
+k3.metric("Discount Spend", f"₹ {scenario['Discount']:,.0f}")
+k4.metric("SKUs Affected", f"{int(applies.sum()):,} of {len(baseline):,}")
+st.caption(
+    f"Median elasticity {baseline['Elasticity'].median():.2f} · "
+    f"baseline net sales ₹ {base_net:,.0f}"
+)
+
+# -------------------------------------------------
+# Sweeps: every scenario in one array evaluation
+# -------------------------------------------------
+discount_levels = np.linspace(-0.10, 0.10, SCENARIO_SWEEP_STEPS)
+price_levels = np.arange(-0.30, 0.301, 0.05)
+
+sweep = scenario_totals(baseline, np.full(len(discount_levels), price_pct / 100), discount_levels, applies)
+grid_price, grid_discount = np.meshgrid(price_levels, discount_levels, indexing="ij")
+grid = scenario_totals(baseline, grid_price.ravel(), grid_discount.ravel(), applies)
+
+g1, g2 = st.columns(2)
+with g1:
+    fig = px.line(
+        sweep, x="Discount_Change_pts", y="Net_Sales",
+        title=f"Net Sales vs Discount Change (price {price_pct:+d}%)"
+    )
+    fig.add_hline(y=base_net, line_dash="dot", annotation_text="Baseline")
+    fig.add_vline(x=discount_pts, line_dash="dash")
+    st.plotly_chart(fig, use_container_width=True)
+with g2:
+    heat = grid.pivot(index="Price_Change_%", columns="Discount_Change_pts", values="Net_Sales_Change_%")
+    st.plotly_chart(
+        px.imshow(
+            heat, aspect="auto", origin="lower", color_continuous_scale="RdYlGn",
+            color_continuous_midpoint=0,
+            labels=dict(x="Discount Change (pts)", y="Price Change (%)", color="Net Sales Δ %"),
+            title="Net Sales Change by Price and Discount"
+        ),
+        use_container_width=True
+    )
+
+# -------------------------------------------------
+# Per-SKU projection for the chosen scenario
+# -------------------------------------------------
+st.subheader("SKU Projections")
+projected = simulate(baseline, price_pct / 100, discount_pts / 100, applies)
+skus = baseline[[c for c in (cols["sku"], cols.get("brand")) if c] + ["Elasticity", "Net_Sales"]].rename(
+    columns={"Net_Sales": "Baseline_Net_Sales"}
+)
+skus["Projected_Net_Sales"] = projected["Net_Sales"][:, 0]
+skus["Projected_Quantity"] = projected["Quantity"][:, 0]
+skus["Change_%"] = (skus["Projected_Net_Sales"] / skus["Baseline_Net_Sales"] - 1) * 100
+
+paged_table(
+    skus, "scenario_skus",
+    version=(dataset_version, selection, scope, tuple(chosen), price_pct, discount_pts), digits=2
+)
+export_widget(skus, "pricing_scenario", key="scenario_export")
@@ -1,7 +1,10 @@
 import streamlit as st
 from utils.column_detector import auto_detect_columns
 from utils.data_processing import preprocess
+from utils.filters import filter_mask, selection_settled, sidebar_filters
+from utils.memory import track_derived
 from utils.metrics import *
+from utils.sections import SectionExecutor
 from utils.visualizations import *
 
 st.header("Executive Overview")
@@ -12,21 +15,68 @@ if df is None:
     st.stop()
 
 cols = auto_detect_columns(df)
+selection = sidebar_filters(df, cols)
 
-df = preprocess(df, cols["date"])
+sample = st.session_state.get("sample")
+approximate = sample is not None and st.sidebar.toggle(
+    "⚡ Approximate mode", value=True,
+    help="Answer from a stratified sample first, then refine to exact results"
+)
 
 col1, col2, col3 = st.columns(3)
-col1.metric("Total Sales", f"{kpi_total_sales(df, cols['sales']):,.0f}")
-col2.metric("Orders", kpi_orders(df))
-col3.metric("Avg Order Value", f"{kpi_aov(df, cols['sales']):,.0f}")
+kpi_slots = (col1.empty(), col2.empty(), col3.empty())
+trend_slot = st.empty()
+brand_slot = st.empty()
+status = st.empty()
 
-st.plotly_chart(
-    line_sales_trend(df, cols["date"], cols["sales"]),
-    use_container_width=True
-)
+# Approximate pass: instant answers with 95% confidence intervals
+if approximate:
+    sample_mask = filter_mask(sample.frame, cols, selection)
+    estimates = (
+        ("Total Sales", kpi_total_sales_approx(sample, cols["sales"], sample_mask)),
+        ("Orders", kpi_orders_approx(sample, sample_mask)),
+        ("Avg Order Value", kpi_aov_approx(sample, cols["sales"], sample_mask)),
+    )
+    for slot, (name, est) in zip(kpi_slots, estimates):
+        slot.metric(f"{name} ≈", f"{est.value:,.0f}", help=f"95% CI {est.lower:,.0f} – {est.upper:,.0f}")
 
-if cols["brand"]:
-    st.plotly_chart(
-        bar_top(df, cols["brand"], cols["sales"], "Top Brands"),
+    trend_slot.plotly_chart(
+        line_sales_trend_approx(sample, cols["sales"], sample_mask),
         use_container_width=True
     )
+    if cols["brand"]:
+        brand_slot.plotly_chart(
+            bar_top_approx(sample, cols["brand"], cols["sales"], "Top Brands", sample_mask),
+            use_container_width=True
+        )
+    status.caption("⚡ Approximate results from a sample, refining to exact…")
+
+# Exact pass: waits until the filters sit idle, then replaces the estimates
+if approximate and not selection_settled("overview", selection):
+    st.stop()
+
+df = track_derived("overview_filtered", preprocess(df[filter_mask(df, cols, selection)], cols["date"]))
+
+
+def exact_kpis():
+    return kpi_total_sales(df, cols["sales"]), kpi_orders(df), kpi_aov(df, cols["sales"])
+
+
+with SectionExecutor() as sections:
+    sections.submit("kpis", exact_kpis)
+    sections.submit("trend", line_sales_trend, df, cols["date"], cols["sales"])
+    if cols["brand"]:
+        sections.submit("brand", bar_top, df, cols["brand"], cols["sales"], "Top Brands")
+
+    for name, result in sections.as_completed():
+        if name == "kpis":
+            total_sales, orders, aov = result
+            kpi_slots[0].metric("Total Sales", f"{total_sales:,.0f}")
+            kpi_slots[1].metric("Orders", orders)
+            kpi_slots[2].metric("Avg Order Value", f"{aov:,.0f}")
+        elif name == "trend":
+            trend_slot.plotly_chart(result, use_container_width=True)
+        elif name == "brand":
+            brand_slot.plotly_chart(result, use_container_width=True)
+
+status.empty()
@@ -1,7 +1,12 @@
+import plotly.express as px
 import streamlit as st
 from utils.column_detector import auto_detect_columns
 from utils.data_processing import preprocess
-from utils.visualizations import line_sales_trend, bar_top
+from utils.filters import filter_mask, selection_settled, sidebar_filters
+from utils.geo_hierarchy import geo_columns, geo_drilldown_widget, geo_rollups, geo_top
+from utils.memory import budgeted_cache, track_derived
+from utils.sections import SectionExecutor
+from utils.visualizations import line_sales_trend, line_sales_trend_approx, bar_top_approx
 
 st.header(" Sales Performance Dashboard")
 
@@ -11,21 +16,68 @@ if df is None:
     st.stop()
 
 cols = auto_detect_columns(df)
-df = preprocess(df, cols["date"])
+selection = sidebar_filters(df, cols)
 
-if cols["state"]:
-    st.plotly_chart(
-        bar_top(df, cols["state"], cols["sales"], "Sales by State"),
-        use_container_width=True
-    )
+sample = st.session_state.get("sample")
+approximate = sample is not None and st.sidebar.toggle(
+    "⚡ Approximate mode", value=True,
+    help="Answer from a stratified sample first, then refine to exact results"
+)
+
+bars = [
+    (cols["state"], "Sales by State"),
+    (cols["city"], "Sales by City"),
+]
+bars = [(group_col, title) for group_col, title in bars if group_col]
 
-if cols["city"]:
-    st.plotly_chart(
-        bar_top(df, cols["city"], cols["sales"], "Sales by City"),
+bar_slots = {group_col: st.empty() for group_col, _ in bars}
+trend_slot = st.empty()
+status = st.empty()
+
+# Approximate pass: instant charts with 95% error bars
+if approximate:
+    sample_mask = filter_mask(sample.frame, cols, selection)
+    for group_col, title in bars:
+        bar_slots[group_col].plotly_chart(
+            bar_top_approx(sample, group_col, cols["sales"], title, sample_mask),
+            use_container_width=True
+        )
+    trend_slot.plotly_chart(
+        line_sales_trend_approx(sample, cols["sales"], sample_mask),
         use_container_width=True
     )
+    status.caption("⚡ Approximate results from a sample, refining to exact…")
 
-st.plotly_chart(
-    line_sales_trend(df, cols["date"], cols["sales"]),
-    use_container_width=True
-)
+
+@budgeted_cache
+def geography(dataset_version, selection):
+    # One hierarchical rollup per dataset + filters; state and city bars
+    # and the drill-down below are all slices of it
+    return geo_rollups(df, geo_columns(cols), cols["sales"], mask=filter_mask(df, cols, selection))
+
+
+# Exact pass: waits until the filters sit idle, then replaces the estimates
+if approximate and not selection_settled("sales", selection):
+    st.stop()
+
+dataset_version = st.session_state.get("dataset_version")
+rollups = geography(dataset_version, selection) if geo_columns(cols) else None
+df = track_derived("sales_filtered", preprocess(df[filter_mask(df, cols, selection)], cols["date"]))
+
+with SectionExecutor() as sections:
+    sections.submit("trend", line_sales_trend, df, cols["date"], cols["sales"])
+
+    for group_col, title in bars:
+        bar_slots[group_col].plotly_chart(
+            px.bar(geo_top(rollups, group_col), x=group_col, y="Sales", text="Sales", title=title),
+            use_container_width=True
+        )
+
+    for name, fig in sections.as_completed():
+        trend_slot.plotly_chart(fig, use_container_width=True)
+
+status.empty()
+
+if rollups is not None:
+    st.subheader("Geographic Drill-down")
+    geo_drilldown_widget(rollups, "sales_geo", version=(dataset_version, selection))
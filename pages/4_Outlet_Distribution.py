@@ -1,6 +1,8 @@
+import plotly.express as px
 import streamlit as st
 from utils.column_detector import auto_detect_columns
-from utils.visualizations import bar_top
+from utils.geo_hierarchy import geo_columns, geo_drilldown_widget, geo_rollups, geo_top
+from utils.memory import budgeted_cache
 
 st.header(" Outlet & Distribution Dashboard")
 
@@ -11,14 +13,34 @@ if df is None:
 
 cols = auto_detect_columns(df)
 
+if not geo_columns(cols):
+    st.error("No state, city or outlet column detected")
+    st.stop()
+
+
+@budgeted_cache
+def geography(dataset_version):
+    # Top outlets, city totals and the drill-down all slice this rollup
+    return geo_rollups(df, geo_columns(cols), cols["sales"], cols.get("quantity"))
+
+
+dataset_version = st.session_state.get("dataset_version")
+rollups = geography(dataset_version)
+
 if cols["outlet"]:
     st.plotly_chart(
-        bar_top(df, cols["outlet"], cols["sales"], "Top Outlets"),
+        px.bar(
+            geo_top(rollups, cols["outlet"]).astype({cols["outlet"]: str}),
+            x=cols["outlet"], y="Sales", text="Sales", title="Top Outlets"
+        ),
         use_container_width=True
     )
 
 if cols["city"]:
     st.plotly_chart(
-        bar_top(df, cols["city"], cols["sales"], "Outlet Sales by City"),
+        px.bar(geo_top(rollups, cols["city"]), x=cols["city"], y="Sales", text="Sales", title="Outlet Sales by City"),
         use_container_width=True
     )
+
+st.subheader("State → City → Outlet Drill-down")
+geo_drilldown_widget(rollups, "outlet_geo", version=dataset_version)
@@ -1,8 +1,14 @@
 import streamlit as st
+import plotly.express as px
 from utils.column_detector import auto_detect_columns
+from utils.field_force import rep_daily_trends, rep_productivity
+from utils.filters import filter_mask, sidebar_filters
+from utils.memory import budgeted_cache, memory_sidebar, track_derived
+from utils.table import paged_table
 from utils.visualizations import bar_top
 
 st.header(" Field Force Productivity Dashboard")
+memory_sidebar()
 
 df = st.session_state.get("df")
 if df is None:
@@ -11,14 +17,62 @@ if df is None:
 
 cols = auto_detect_columns(df)
 
-if cols["rep"]:
+if not cols["rep"]:
+    st.error("Sales rep column not detected")
+    st.stop()
+
+selection = sidebar_filters(df, cols)
+
+
+@budgeted_cache
+def productivity(dataset_version, selection):
+    # df is read from the page; the cache key is dataset version + filters
+    filtered = df[filter_mask(df, cols, selection)]
+    return rep_productivity(
+        filtered, cols["rep"], cols["date"], cols["sales"],
+        order_col=cols["order"], outlet_col=cols["outlet"]
+    )
+
+
+dataset_version = st.session_state.get("dataset_version")
+filtered_df = track_derived("field_force_filtered", df[filter_mask(df, cols, selection)])
+
+try:
+    summary = productivity(dataset_version, selection)
+except ValueError as e:
+    st.error(str(e))
+    st.stop()
+
+k1, k2, k3, k4 = st.columns(4)
+k1.metric("Active Reps", f"{len(summary):,}")
+k2.metric("Avg Orders / Day", f"{summary['Orders_per_Day'].mean():.1f}")
+k3.metric("Avg Lines / Order", f"{summary['Lines_per_Order'].mean():.2f}")
+if "Productive_Call_Ratio_%" in summary:
+    k4.metric("Productive Calls", f"{summary['Productive_Calls'].sum() / summary['Calls'].sum() * 100:.1f}%")
+
+st.subheader("Rep Productivity")
+paged_table(summary, "rep_productivity", version=(dataset_version, selection), digits=2)
+
+st.subheader("Rolling Sales Trend")
+reps = st.multiselect(
+    "Compare Reps", summary[cols["rep"]].tolist(),
+    default=summary[cols["rep"]].head(3).tolist()
+)
+window = st.radio("Window", ["Sales_7D", "Sales_30D"], horizontal=True)
+if reps:
+    trends = rep_daily_trends(filtered_df, cols["rep"], cols["date"], cols["sales"], reps)
     st.plotly_chart(
-        bar_top(df, cols["rep"], cols["sales"], "Sales per Sales Rep"),
+        px.line(trends, x="Date", y=window, color=cols["rep"], title=f"Trailing {window[6:]} Sales"),
         use_container_width=True
     )
 
-if cols["rep"] and cols["quantity"]:
+st.plotly_chart(
+    bar_top(filtered_df, cols["rep"], cols["sales"], "Sales per Sales Rep"),
+    use_container_width=True
+)
+
+if cols["quantity"]:
     st.plotly_chart(
-        bar_top(df, cols["rep"], cols["quantity"], "Quantity Sold per Rep"),
+        bar_top(filtered_df, cols["rep"], cols["quantity"], "Quantity Sold per Rep"),
         use_container_width=True
     )
@@ -1,10 +1,12 @@
 # pages/7_Sales_Forecasting.py
 
 import streamlit as st
+import pandas as pd
 import plotly.express as px
 
 from utils.forecasting import prepare_time_series, forecast_sales
 from utils.column_detector import auto_detect_columns
+from utils.visualizations import add_interval_band
 
 st.set_page_config(page_title="Sales Forecasting", layout="wide")
 
@@ -49,6 +51,7 @@ fig2 = px.line(
     y=sales_col,
     markers=True
 )
+add_interval_band(fig2, forecast_df[date_col], forecast_df["Lower"], forecast_df["Upper"], name="95% Interval")
 st.plotly_chart(fig2, use_container_width=True)
 
 # Combined View
@@ -59,7 +62,7 @@ combined["Type"] = "Actual"
 
 forecast_df["Type"] = "Forecast"
 
-final_df = combined._append(forecast_df, ignore_index=True)
+final_df = pd.concat([combined, forecast_df.drop(columns=["Lower", "Upper"])], ignore_index=True)
 
 fig3 = px.line(
     final_df,
@@ -3,10 +3,14 @@
 import streamlit as st
 import plotly.express as px
 
+from utils.artifact_store import get_store
+from utils.column_detector import auto_detect_columns
+from utils.export import export_widget
 from utils.segmentation import (
     prepare_outlet_features,
     segment_outlets
 )
+from utils.table import paged_table
 
 st.set_page_config(page_title="Outlet Segmentation", layout="wide")
 st.title("Outlet Segmentation Dashboard")
@@ -18,9 +22,18 @@ if df is None:
     st.warning(" Please upload dataset from Upload page")
     st.stop()
 
-# Prepare features
+store = get_store()
+dataset_version = st.session_state.get("dataset_version")
+cols = auto_detect_columns(df)
+
+# Prepare features (persisted; re-uploads only rebuild them if these columns changed)
 try:
-    outlet_df = prepare_outlet_features(df)
+    outlet_df, features_key = store.get_or_compute(
+        prepare_outlet_features, df,
+        columns=[cols[key] for key in ("outlet", "sales", "quantity") if cols.get(key)],
+        args=(df,),
+        dataset_version=dataset_version,
+    )
 except Exception as e:
     st.error(str(e))
     st.stop()
@@ -28,10 +41,16 @@ except Exception as e:
 # Cluster selection
 clusters = st.slider("Select Number of Segments", 2, 6, 3)
 
-segmented_df = segment_outlets(outlet_df, clusters)
+segmented_df, segments_key = store.get_or_compute(
+    segment_outlets, df, columns=[],
+    args=(outlet_df.copy(),), params={"n_clusters": clusters},
+    depends_on=[features_key],
+    dataset_version=dataset_version,
+)
 
 st.subheader("Outlet Segments")
-st.dataframe(segmented_df, use_container_width=True)
+paged_table(segmented_df, "outlet_segments", version=segments_key)
+export_widget(segmented_df, "outlet_segments", key="segments_export")
 
 # Visualization
 num_cols = segmented_df.select_dtypes(include="number").columns.tolist()
@@ -1,5 +1,8 @@
 import streamlit as st
-import pandas as pd
+
+from utils.data_quality import valid_date_rows
+from utils.memory import track_derived
+from utils.table import paged_table
 
 st.set_page_config(page_title="Daily Sales Analysis", layout="wide")
 st.title("Daily Sales Analysis")
@@ -11,7 +14,7 @@ if "data" not in st.session_state or st.session_state["data"] is None:
     st.warning("Please upload data from 'Upload Dataset' page")
     st.stop()
 
-df = st.session_state["data"].copy()
+df = st.session_state["data"]
 
 # ---------------------------
 # Required columns check
@@ -26,8 +29,8 @@ if missing:
 # ---------------------------
 # Data preparation
 # ---------------------------
-df["ORDER_DATE"] = pd.to_datetime(df["ORDER_DATE"], errors="coerce")
-df = df.dropna(subset=["ORDER_DATE"])
+# Bad dates were flagged once at ingest (see Upload page report)
+df = track_derived("daily_valid_dates", valid_date_rows(df, "ORDER_DATE"), source=df)
 
 daily_sales = (
     df.groupby(df["ORDER_DATE"].dt.date)
@@ -60,4 +63,4 @@ st.bar_chart(daily_sales.set_index("ORDER_DATE")["Total_Orders"])
 # Data Table
 # ---------------------------
 st.subheader(" Daily Sales Table")
-st.dataframe(daily_sales, use_container_width=True)
+paged_table(daily_sales, "daily_sales", version=st.session_state.get("dataset_version"))
@@ -0,0 +1,66 @@
+# report_pack.py
+"""
+Headless report packs: Executive Overview, Sales Performance and
+Actionable Insights as static HTML, one file per region / brand.
+
+    python report_pack.py data.csv
+    python report_pack.py data.csv --by state --output reports/daily
+    python report_pack.py data.csv --by brand --values "Brand A,Brand B" --date-from 2024-04-01
+
+--by takes a detected role (state, city, brand, warehouse, ...) or a raw
+column name. Open index.html in the output folder to browse the pack.
+"""
+
+import argparse
+import sys
+import time
+
+from config import REPORT_DIR, REPORT_WORKERS
+from utils.column_detector import auto_detect_columns
+from utils.query_api import load_frame
+from utils.reports import generate_reports
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write static HTML report packs without the UI")
+    parser.add_argument("dataset", help="CSV, Excel or Parquet file")
+    parser.add_argument("--by", help="One report per value of this role or column")
+    parser.add_argument("--values", help="Comma-separated subset of --by values")
+    parser.add_argument("--date-from", help="Inclusive start date (YYYY-MM-DD)")
+    parser.add_argument("--date-to", help="Inclusive end date (YYYY-MM-DD)")
+    parser.add_argument("--output", default=REPORT_DIR, help="Output folder")
+    parser.add_argument("--workers", type=int, default=REPORT_WORKERS, help="Render processes")
+    parser.add_argument("--no-all", action="store_true", help="Skip the overall report")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    df, _ = load_frame(args.dataset)
+    cols = auto_detect_columns(df)
+
+    by_col = None
+    if args.by:
+        by_col = cols.get(args.by) or (args.by if args.by in df.columns else None)
+        if by_col is None:
+            parser.error(f"unknown column: {args.by}")
+
+    values = {v.strip() for v in args.values.split(",")} if args.values else None
+
+    try:
+        paths = generate_reports(
+            df, cols, by_col=by_col, values=values, out_dir=args.output,
+            date_from=args.date_from, date_to=args.date_to,
+            include_all=not args.no_all, workers=args.workers,
+        )
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 1
+
+    print(
+        f"Wrote {len(paths)} reports to {args.output} in {time.perf_counter() - started:.1f}s",
+        file=sys.stderr
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,141 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from utils.metrics import kpi_aov, kpi_orders, kpi_total_sales, top_n
+from utils.query_api import KPIQueryEngine, to_arrow, to_json
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({
+        "ORDER_DATE": pd.to_datetime([
+            "2024-01-05", "2024-01-20", "2024-02-03", "2024-02-14",
+            "2024-03-01", "2024-03-09", "2024-03-30", "2024-04-02",
+        ]),
+        "CITY": ["Pune", "Mumbai", "Pune", "Delhi", "Mumbai", "Pune", "Delhi", "Pune"],
+        "BRAND": ["A", "B", "A", "C", "B", "C", "A", "B"],
+        "SALES_AMOUNT": [100.0, 250.0, 75.0, 300.0, np.nan, 50.0, 125.0, 400.0],
+    })
+
+
+@pytest.fixture
+def engine(df):
+    return KPIQueryEngine(df, version="v1")
+
+
+def test_default_metrics_match_dashboard(engine, df):
+    response = engine.query({})
+
+    assert response["metrics"] == {
+        "total_sales": kpi_total_sales(df, "SALES_AMOUNT"),
+        "aov": kpi_aov(df, "SALES_AMOUNT"),
+        "orders": kpi_orders(df),
+    }
+    assert response["cached"] == []
+
+
+def test_filters_by_role_and_column_name(engine, df):
+    expected = df[df["CITY"].isin(["Pune", "Delhi"]) & (df["BRAND"] == "A")]
+
+    by_role = engine.query({"filters": {"city": ["Pune", "Delhi"], "brand": "A"}})
+    by_column = engine.query({"filters": {"CITY": ["Delhi", "Pune"], "BRAND": ["A"]}})
+
+    assert by_role["metrics"]["orders"] == len(expected)
+    assert by_role["metrics"]["total_sales"] == kpi_total_sales(expected, "SALES_AMOUNT")
+    # Same scope after canonicalisation: answered from the cache
+    assert by_column["metrics"] == by_role["metrics"]
+    assert by_column["cached"] == ["total_sales", "aov", "orders"]
+
+
+def test_date_range_is_inclusive(engine, df):
+    response = engine.query({"date_from": "2024-02-03", "date_to": "2024-03-09", "metrics": ["orders", "total_sales"]})
+    expected = df[(df["ORDER_DATE"] >= "2024-02-03") & (df["ORDER_DATE"] <= "2024-03-09")]
+
+    assert response["metrics"]["orders"] == len(expected) == 4
+    assert response["metrics"]["total_sales"] == kpi_total_sales(expected, "SALES_AMOUNT")
+
+
+def test_unknown_names_raise(engine):
+    with pytest.raises(ValueError):
+        engine.query({"filters": {"region": ["North"]}})
+    with pytest.raises(ValueError):
+        engine.query({"metrics": ["margin"]})
+    with pytest.raises(ValueError):
+        engine.query({"date_from": "not a date"})
+
+
+def test_batched_multi_metric_request(engine, df):
+    requests = [
+        {"filters": {"city": "Pune"}, "metrics": ["total_sales", "orders", {"metric": "top_n", "by": "brand", "n": 2}]},
+        {"filters": {"city": "Pune"}, "metrics": ["aov"]},
+        {"metrics": [{"metric": "top_n", "by": "city", "n": 5, "label": "cities"}]},
+    ]
+    pune = df[df["CITY"] == "Pune"]
+
+    first, second, third = engine.batch(requests)
+
+    assert first["metrics"]["total_sales"] == kpi_total_sales(pune, "SALES_AMOUNT")
+    assert first["metrics"]["orders"] == kpi_orders(pune)
+    pd.testing.assert_frame_equal(first["metrics"]["top_2_BRAND"], top_n(pune, "BRAND", "SALES_AMOUNT", 2))
+    assert second["metrics"]["aov"] == kpi_aov(pune, "SALES_AMOUNT")
+    pd.testing.assert_frame_equal(third["metrics"]["cities"], top_n(df, "CITY", "SALES_AMOUNT", 5))
+
+
+def test_repeated_query_is_a_cache_hit(engine):
+    request = {"filters": {"brand": ["B"]}, "metrics": ["total_sales", {"metric": "top_n", "by": "city", "n": 3}]}
+
+    first = engine.query(request)
+    second = engine.query(request)
+
+    assert first["cached"] == []
+    assert second["cached"] == ["total_sales", "top_3_CITY"]
+    assert second["metrics"]["total_sales"] == first["metrics"]["total_sales"]
+    assert engine.stats()["cache_hits"] == 2
+    assert engine.stats()["cache_misses"] == 2
+
+
+def test_cache_is_bounded(df):
+    engine = KPIQueryEngine(df, version="v1", cache_entries=2)
+    for city in ("Pune", "Mumbai", "Delhi"):
+        engine.query({"filters": {"city": city}, "metrics": ["orders"]})
+
+    assert engine.stats()["cache_entries"] == 2
+    assert engine.query({"filters": {"city": "Pune"}, "metrics": ["orders"]})["cached"] == []
+
+
+def test_json_encoding_matches_metrics(engine, df):
+    responses = engine.batch([
+        {"metrics": ["total_sales", "orders", {"metric": "top_n", "by": "brand", "n": 3}]},
+    ])
+
+    payload = json.loads(to_json(responses))
+    metrics = payload[0]["metrics"]
+    expected = top_n(df, "BRAND", "SALES_AMOUNT", 3)
+
+    assert metrics["total_sales"] == kpi_total_sales(df, "SALES_AMOUNT")
+    assert metrics["orders"] == kpi_orders(df)
+    assert metrics["top_3_BRAND"]["columns"] == list(expected.columns)
+    assert metrics["top_3_BRAND"]["data"] == expected.values.tolist()
+
+
+def test_arrow_encoding_matches_metrics(engine, df):
+    responses = engine.batch([
+        {"metrics": ["total_sales", "aov"]},
+        {"filters": {"city": "Delhi"}, "metrics": [{"metric": "top_n", "by": "brand", "n": 2}]},
+    ])
+
+    table = pa.ipc.open_stream(to_arrow(responses)).read_all().to_pandas()
+    delhi = top_n(df[df["CITY"] == "Delhi"], "BRAND", "SALES_AMOUNT", 2)
+
+    scalars = table[table["query"] == 0].set_index("metric")["value"]
+    assert scalars["total_sales"] == pytest.approx(kpi_total_sales(df, "SALES_AMOUNT"))
+    assert scalars["aov"] == pytest.approx(kpi_aov(df, "SALES_AMOUNT"))
+    assert table.loc[table["query"] == 0, "group"].isna().all()
+
+    grouped = table[table["query"] == 1]
+    assert grouped["group"].tolist() == delhi["BRAND"].astype(str).tolist()
+    assert grouped["value"].tolist() == pytest.approx(delhi["SALES_AMOUNT"].tolist())
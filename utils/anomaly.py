@@ -0,0 +1,186 @@
+# utils/anomaly.py
+
+import numpy as np
+import pandas as pd
+
+from utils.date_dimension import DATE_KEY_COL, MISSING_DATE_KEY, to_date_key
+
+# Scale factor that makes MAD comparable to a standard deviation
+MAD_SCALE = 0.6745
+
+# Upper bound on baseline cells materialised per scoring chunk
+RESCORE_CELLS = 4_000_000
+
+BASELINE_OFFSETS = {
+    # previous 28 days
+    "rolling": np.arange(1, 29),
+    # same weekday over the previous 8 weeks
+    "seasonal": 7 * np.arange(1, 9),
+}
+
+
+def _date_keys(df, date_col):
+    if DATE_KEY_COL in df.columns:
+        return df[DATE_KEY_COL].to_numpy()
+    return to_date_key(df[date_col])
+
+
+def robust_scores(matrix, days, offsets):
+    """
+    Robust z-scores of matrix[:, days] against a median/MAD baseline
+    taken at days - offsets, for every series at once.
+    Returns (scores, expected); days without enough history are NaN.
+    """
+    days = np.asarray(days)
+    scores = np.full((matrix.shape[0], len(days)), np.nan)
+    expected = np.full_like(scores, np.nan)
+
+    scorable = days >= offsets.max()
+    if not scorable.any():
+        return scores, expected
+
+    days = days[scorable]
+    context = matrix[:, days[:, None] - offsets[None, :]]  # series x days x offsets
+    median = np.median(context, axis=2)
+    mad = np.median(np.abs(context - median[:, :, None]), axis=2)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z = MAD_SCALE * (matrix[:, days] - median) / mad
+    # Flat baselines (MAD == 0) give no usable score
+    scores[:, scorable] = np.where(mad > 0, z, np.nan)
+    expected[:, scorable] = median
+    return scores, expected
+
+
+class AnomalyDetector:
+    """
+    Daily anomaly detection over every combination of `dims`.
+
+    Keeps a series x days matrix of daily totals. fit() scores the most
+    recent days; update() folds in new rows and only rescores the days
+    they touch.
+    """
+
+    def __init__(self, dims, value_col, date_col=None, method="seasonal", recent_days=60):
+        self.dims = list(dims)
+        self.value_col = value_col
+        self.date_col = date_col
+        self.offsets = BASELINE_OFFSETS[method]
+        self.recent_days = recent_days
+
+        self.series = pd.MultiIndex.from_arrays([[]] * len(self.dims), names=self.dims)
+        self.first_key = None
+        self.matrix = np.zeros((0, 0))
+        self.scores = np.zeros((0, 0), dtype=np.float32)
+        self.expected = np.zeros((0, 0), dtype=np.float32)
+        self.row_count = 0
+        self.value_total = 0.0
+
+    @property
+    def last_key(self):
+        return self.first_key + self.matrix.shape[1] - 1
+
+    def _usable_rows(self, df):
+        keys = _date_keys(df, self.date_col)
+        valid = (keys != MISSING_DATE_KEY) & df[self.dims].notna().all(axis=1).to_numpy()
+        df = df[valid]
+        values = df[self.value_col].to_numpy(dtype=np.float64, na_value=0.0)
+        return keys[valid].astype(np.int64), values, df
+
+    def _accumulate(self, df):
+        keys, values, df = self._usable_rows(df)
+
+        if len(keys) == 0:
+            return None
+
+        # Grow the day axis (either side) and the series axis as needed
+        first_key = int(keys.min()) if self.first_key is None else min(self.first_key, int(keys.min()))
+        last_key = int(keys.max()) if self.first_key is None else max(self.last_key, int(keys.max()))
+        pad_before = 0 if self.first_key is None else self.first_key - first_key
+
+        labels = pd.MultiIndex.from_frame(df[self.dims])
+        new_series = labels.unique().difference(self.series)
+        self.series = self.series.append(new_series)
+        rows = self.series.get_indexer(labels)
+
+        n_days = last_key - first_key + 1
+        matrix = np.zeros((len(self.series), n_days))
+        matrix[:self.matrix.shape[0], pad_before:pad_before + self.matrix.shape[1]] = self.matrix
+        # bincount over flat cell indices: one vectorised pass, unlike np.add.at
+        cells = rows * n_days + (keys - first_key)
+        matrix += np.bincount(cells, weights=values, minlength=matrix.size).reshape(matrix.shape)
+
+        for name in ("scores", "expected"):
+            grown = np.full(matrix.shape, np.nan, dtype=np.float32)
+            old = getattr(self, name)
+            grown[:old.shape[0], pad_before:pad_before + old.shape[1]] = old
+            setattr(self, name, grown)
+
+        self.matrix = matrix
+        self.first_key = first_key
+        self.row_count += len(df)
+        self.value_total += values.sum()
+        return int(keys.min()) - first_key
+
+    def _rescore(self, from_day):
+        # Chunk the day axis so the series x days x offsets context stays small
+        step = max(1, RESCORE_CELLS // max(1, self.matrix.shape[0] * len(self.offsets)))
+        for start in range(from_day, self.matrix.shape[1], step):
+            days = np.arange(start, min(start + step, self.matrix.shape[1]))
+            scores, expected = robust_scores(self.matrix, days, self.offsets)
+            self.scores[:, days] = scores
+            self.expected[:, days] = expected
+
+    def is_prefix_of(self, df):
+        """
+        True when df's rows up to last_key are exactly the rows already
+        folded in, i.e. df only appends days (checked by count and total).
+        """
+        if self.first_key is None:
+            return False
+        keys, values, _ = self._usable_rows(df)
+        seen = keys <= self.last_key
+        return seen.sum() == self.row_count and np.isclose(values[seen].sum(), self.value_total)
+
+    def fit(self, df):
+        """
+        Build the matrix from df and score the most recent days.
+        """
+        self._accumulate(df)
+        if self.first_key is not None:
+            self._rescore(max(0, self.matrix.shape[1] - self.recent_days))
+        return self
+
+    def update(self, new_df):
+        """
+        Fold in newly arrived rows and rescore from their earliest day on.
+        """
+        from_day = self._accumulate(new_df)
+        if from_day is not None:
+            self._rescore(max(from_day, self.matrix.shape[1] - self.recent_days))
+        return self
+
+    def top_anomalies(self, threshold=3.5, n=50):
+        """
+        Ranked anomalies in the recent window with |score| >= threshold,
+        largest first.
+        """
+        window_start = max(0, self.scores.shape[1] - self.recent_days)
+        with np.errstate(invalid="ignore"):
+            hits = np.argwhere(np.abs(self.scores[:, window_start:]) >= threshold)
+        hits[:, 1] += window_start
+        if len(hits) == 0:
+            return pd.DataFrame(columns=self.dims + ["Date", "Actual", "Expected", "Score", "Direction"])
+
+        series_idx, day_idx = hits[:, 0], hits[:, 1]
+        scores = self.scores[series_idx, day_idx]
+        order = np.argsort(-np.abs(scores))[:n]
+        series_idx, day_idx, scores = series_idx[order], day_idx[order], scores[order]
+
+        result = self.series[series_idx].to_frame(index=False)
+        result["Date"] = pd.to_datetime((self.first_key + day_idx).astype("datetime64[D]"))
+        result["Actual"] = self.matrix[series_idx, day_idx]
+        result["Expected"] = self.expected[series_idx, day_idx]
+        result["Score"] = scores
+        result["Direction"] = np.where(scores > 0, "Spike", "Drop")
+        return result
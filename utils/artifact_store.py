@@ -0,0 +1,373 @@
+# utils/artifact_store.py
+
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import tempfile
+import threading
+import time
+import types
+import weakref
+from collections import OrderedDict
+from pathlib import Path
+
+import pandas as pd
+
+from config import ARTIFACT_DIR, ARTIFACT_FINGERPRINT_MEMO, ARTIFACT_MAX_MB
+
+# Modules under this folder count as project code for code_version
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# (dataset_version, column, id(df), len(df)) -> (weakref to df, fingerprint),
+# least recently used first; shared by every session
+_fingerprints = OrderedDict()
+_fingerprints_lock = threading.Lock()
+
+
+def column_fingerprint(df, column, dataset_version=None):
+    """
+    Content hash of one column. Memoised per dataset version and frame,
+    so each column of an upload is hashed at most once; a different frame
+    under the same version (a filtered copy, a re-run of profiling) is
+    hashed again. The memo keeps the ARTIFACT_FINGERPRINT_MEMO most
+    recently used entries.
+    """
+    memo_key = (dataset_version, column, id(df), len(df))
+    if dataset_version is not None:
+        with _fingerprints_lock:
+            entry = _fingerprints.get(memo_key)
+            # id() is only unique while the frame lives: check it is the same one
+            if entry is not None and entry[0]() is df:
+                _fingerprints.move_to_end(memo_key)
+                return entry[1]
+
+    hashed = pd.util.hash_pandas_object(df[column], index=False).to_numpy()
+    fingerprint = hashlib.blake2b(hashed.tobytes(), digest_size=16).hexdigest()
+
+    if dataset_version is not None:
+        with _fingerprints_lock:
+            _fingerprints[memo_key] = (weakref.ref(df), fingerprint)
+            _fingerprints.move_to_end(memo_key)
+            while len(_fingerprints) > ARTIFACT_FINGERPRINT_MEMO:
+                _fingerprints.popitem(last=False)
+    return fingerprint
+
+
+def _is_project_code(obj):
+    try:
+        path = inspect.getsourcefile(obj)
+    except TypeError:
+        return False
+    return path is not None and Path(path).resolve().is_relative_to(PROJECT_ROOT)
+
+
+def _code_names(code):
+    # Global / attribute names used by a function, including nested
+    # functions, lambdas and comprehensions
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names |= _code_names(const)
+    return names
+
+
+def _dependencies(func, seen):
+    """
+    Source of func plus, recursively, of the project functions and
+    classes it references and the values of constants it reads.
+    """
+    func = inspect.unwrap(func)
+    if id(func) in seen:
+        return []
+    seen.add(id(func))
+
+    try:
+        parts = [inspect.getsource(func)]
+    except (OSError, TypeError):
+        return [f"{func.__module__}.{func.__qualname__}"]
+
+    code = getattr(func, "__code__", None)
+    if code is None:
+        # Classes: their methods are part of the source above
+        return parts
+
+    names = _code_names(code)
+    namespaces = [func.__globals__]
+    # module.helper(...) references: resolve names inside project modules too
+    for name in names:
+        value = func.__globals__.get(name)
+        if isinstance(value, types.ModuleType) and _is_project_code(value):
+            namespaces.append(vars(value))
+
+    for name in sorted(names):
+        for namespace in namespaces:
+            if name not in namespace:
+                continue
+            value = namespace[name]
+            if isinstance(value, (bool, int, float, str, bytes, tuple, frozenset)):
+                parts.append(f"{name}={value!r}")
+            elif isinstance(value, (types.FunctionType, type)) and _is_project_code(value):
+                parts.extend(_dependencies(value, seen))
+    return parts
+
+
+def code_version(func):
+    """
+    Hash of a function's source and of the project helpers and constants
+    it uses (transitively), so editing any of them invalidates its
+    artifacts. Library code is covered by the installed versions, not here.
+    """
+    source = "\n".join(_dependencies(func, set()))
+    return hashlib.blake2b(source.encode("utf-8"), digest_size=8).hexdigest()
+
+
+class ArtifactStore:
+    """
+    Local on-disk store for computed artifacts (aggregates, models, forecasts).
+
+    Each artifact is keyed by the function, its code version, its
+    parameters, the fingerprints of the dataset columns it reads and the
+    keys of the artifacts it was built from. A manifest next to each
+    artifact records those inputs, so changed columns invalidate exactly
+    the artifacts that read them plus everything downstream.
+    DataFrames are stored as Parquet, anything else is pickled. The folder
+    is capped at max_bytes: after each write the least recently used
+    artifacts (by manifest mtime, refreshed on every load) are deleted.
+
+    Trust boundary: loading a pickle runs arbitrary code, so the root
+    folder must only ever hold files this app wrote. It is created
+    owner-only; never point it at a shared or user-writable location
+    or copy artifacts in from elsewhere.
+    """
+
+    def __init__(self, root=ARTIFACT_DIR, max_bytes=ARTIFACT_MAX_MB * 1024 * 1024):
+        self.root = Path(root)
+        self.root.mkdir(mode=0o700, parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._prune_lock = threading.Lock()
+
+    # ---------------- Keys & paths ----------------
+    @staticmethod
+    def make_key(name, version, params, columns, depends_on):
+        payload = json.dumps(
+            {
+                "name": name,
+                "version": version,
+                "params": params,
+                "columns": columns,
+                "depends_on": sorted(depends_on),
+            },
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+    def _manifest_path(self, key):
+        return self.root / f"{key}.json"
+
+    def _data_path(self, key, fmt):
+        return self.root / f"{key}.{fmt}"
+
+    def _atomic_write(self, path, write):
+        fd, tmp = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                write(f)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+    # ---------------- Read / write ----------------
+    def manifest(self, key):
+        path = self._manifest_path(key)
+        if not path.exists():
+            return None
+        return json.loads(path.read_text())
+
+    def manifests(self):
+        return [json.loads(path.read_text()) for path in self.root.glob("*.json")]
+
+    def has(self, key):
+        meta = self.manifest(key)
+        return meta is not None and self._data_path(key, meta["format"]).exists()
+
+    def get(self, key):
+        meta = self.manifest(key)
+        path = self._data_path(key, meta["format"])
+        if meta["format"] == "parquet":
+            return pd.read_parquet(path)
+        # Only safe because the store holds nothing but our own writes
+        with open(path, "rb") as f:
+            return pickle.load(f)
+
+    def put(self, key, value, meta):
+        fmt = "parquet" if isinstance(value, pd.DataFrame) else "pkl"
+        if fmt == "parquet":
+            self._atomic_write(self._data_path(key, fmt), lambda f: value.to_parquet(f))
+        else:
+            self._atomic_write(self._data_path(key, fmt), lambda f: pickle.dump(value, f))
+
+        meta = dict(meta, key=key, format=fmt, created=time.time())
+        self._atomic_write(
+            self._manifest_path(key),
+            lambda f: f.write(json.dumps(meta, default=str).encode("utf-8"))
+        )
+
+    def _touch(self, key):
+        # Manifest mtime doubles as the artifact's last access time
+        try:
+            os.utime(self._manifest_path(key))
+        except FileNotFoundError:
+            pass
+
+    def prune(self, keep=None):
+        """
+        Delete least recently used artifacts until the store fits in
+        max_bytes. `keep` (the artifact just written) is never deleted.
+        Returns the deleted keys.
+        """
+        with self._prune_lock:
+            entries, total = [], 0
+            for manifest in self.root.glob("*.json"):
+                key = manifest.stem
+                try:
+                    size = manifest.stat().st_size
+                    accessed = manifest.stat().st_mtime
+                    for data in self.root.glob(f"{key}.*"):
+                        if data != manifest:
+                            size += data.stat().st_size
+                except FileNotFoundError:
+                    # Deleted by another session meanwhile
+                    continue
+                entries.append((accessed, key, size))
+                total += size
+
+            deleted = []
+            for _, key, size in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                if key == keep:
+                    continue
+                self.delete(key)
+                total -= size
+                deleted.append(key)
+            return deleted
+
+    def _adopt(self, key, dataset_version):
+        # A reused artifact now belongs to the current upload as well
+        meta = self.manifest(key)
+        if dataset_version is not None and meta.get("dataset_version") != dataset_version:
+            meta["dataset_version"] = dataset_version
+            self._atomic_write(
+                self._manifest_path(key),
+                lambda f: f.write(json.dumps(meta, default=str).encode("utf-8"))
+            )
+
+    def delete(self, key):
+        try:
+            meta = self.manifest(key)
+        except (FileNotFoundError, json.JSONDecodeError):
+            meta = None
+        if meta is None:
+            self._manifest_path(key).unlink(missing_ok=True)
+            return
+        self._data_path(key, meta["format"]).unlink(missing_ok=True)
+        self._manifest_path(key).unlink(missing_ok=True)
+
+    # ---------------- Compute-or-load ----------------
+    def get_or_compute(self, func, df, columns, params=None, args=(),
+                       depends_on=(), scope=None, dataset_version=None):
+        """
+        Return (value, key) for func(*args, **params), loading it from disk
+        when an artifact with identical inputs exists.
+
+        `columns` are the dataset columns func reads and `depends_on` the
+        keys of upstream artifacts it was built from; `args` (frames,
+        models) are not hashed, so they must be covered by those two plus
+        `scope` (e.g. the filters used to slice df before the call).
+        """
+        params = params or {}
+        fingerprints = {col: column_fingerprint(df, col, dataset_version) for col in columns}
+        name = f"{func.__module__}.{func.__qualname__}"
+        key_params = params if scope is None else dict(params, _scope=scope)
+        key = self.make_key(name, code_version(func), key_params, fingerprints, depends_on)
+
+        if self.has(key):
+            try:
+                value = self.get(key)
+            except Exception:
+                # Unreadable artifact (e.g. interrupted write): recompute
+                self.delete(key)
+            else:
+                self._adopt(key, dataset_version)
+                self._touch(key)
+                return value, key
+
+        value = func(*args, **params)
+        self.put(key, value, {
+            "function": name,
+            "params": key_params,
+            "columns": fingerprints,
+            "depends_on": list(depends_on),
+            "dataset_version": dataset_version,
+        })
+        self.prune(keep=key)
+        return value, key
+
+    # ---------------- Invalidation ----------------
+    def invalidate(self, keys):
+        """
+        Delete artifacts and, transitively, everything built from them.
+        Returns the deleted keys.
+        """
+        manifests = self.manifests()
+        children = {}
+        for meta in manifests:
+            for parent in meta.get("depends_on", []):
+                children.setdefault(parent, []).append(meta["key"])
+
+        deleted = set()
+        pending = list(keys)
+        while pending:
+            key = pending.pop()
+            if key in deleted:
+                continue
+            deleted.add(key)
+            pending.extend(children.get(key, []))
+
+        for key in deleted:
+            self.delete(key)
+        return deleted
+
+    def invalidate_changed(self, df, previous_version, dataset_version=None):
+        """
+        After a re-upload, drop artifacts of the previous dataset whose
+        input columns changed (or vanished), plus their dependants.
+        Artifacts that only read unchanged columns are kept.
+        """
+        stale = []
+        for meta in self.manifests():
+            if meta.get("dataset_version") != previous_version:
+                continue
+            for col, fingerprint in meta.get("columns", {}).items():
+                if col not in df.columns or column_fingerprint(df, col, dataset_version) != fingerprint:
+                    stale.append(meta["key"])
+                    break
+        return self.invalidate(stale)
+
+
+_store = None
+
+
+def get_store():
+    """
+    Process-wide ArtifactStore rooted at ARTIFACT_DIR.
+    """
+    global _store
+    if _store is None:
+        _store = ArtifactStore()
+    return _store
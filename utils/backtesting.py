@@ -0,0 +1,93 @@
+# utils/backtesting.py
+
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.forecasting import FORECASTERS
+from utils.sections import SectionExecutor, process_context
+
+
+def rolling_origin_folds(n_obs, horizon, n_folds, min_train):
+    """
+    Train-end positions for rolling-origin evaluation.
+    Each fold trains on [0, end) and tests on [end, end + horizon);
+    origins step back one horizon at a time from the end of the series.
+    """
+    ends = [n_obs - horizon * (k + 1) for k in range(n_folds)]
+    return sorted(end for end in ends if end >= min_train)
+
+
+def _run_fold(model_name, dates, values, freq, train_end, horizon):
+    fit, predict = FORECASTERS[model_name]
+
+    start = time.perf_counter()
+    model = fit(dates[:train_end], values[:train_end], freq)
+    fit_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    forecast = np.asarray(predict(model, horizon), dtype=np.float64)
+    predict_seconds = time.perf_counter() - start
+
+    actual = values[train_end:train_end + horizon]
+    return {
+        "Model": model_name,
+        "Train_End": dates[train_end - 1],
+        "Abs_Error": np.abs(actual - forecast).sum(),
+        "Abs_Actual": np.abs(actual).sum(),
+        "APE": np.abs(actual - forecast)[actual != 0] / np.abs(actual[actual != 0]),
+        "Fit_Seconds": fit_seconds,
+        "Predict_Seconds": predict_seconds,
+    }
+
+
+def backtest(ts_df, date_col, sales_col, freq="MS", horizon=3, n_folds=5,
+             min_train=6, models=None, max_workers=None):
+    """
+    Rolling-origin cross-validation of each forecaster on a series from
+    prepare_time_series. Folds run in parallel worker processes.
+
+    Returns (folds_df, summary_df); summary has MAPE/WAPE (%) and mean
+    fit / predict seconds per model.
+    """
+    models = models or list(FORECASTERS)
+    dates = ts_df[date_col].to_numpy()
+    values = ts_df[sales_col].to_numpy(dtype=np.float64)
+
+    ends = rolling_origin_folds(len(values), horizon, n_folds, min_train)
+    if not ends:
+        raise ValueError(
+            f"❌ Need at least {min_train + horizon} periods to backtest, got {len(values)}"
+        )
+
+    # Folds run in forkserver / spawn workers, not forks of the server
+    with SectionExecutor(
+        max_workers=max_workers or os.cpu_count(), use_processes=True, mp_context=process_context()
+    ) as pool:
+        for name in models:
+            for end in ends:
+                pool.submit((name, end), _run_fold, name, dates, values, freq, end, horizon)
+        folds = [result for _, result in pool.as_completed()]
+
+    folds_df = pd.DataFrame(folds).sort_values(["Model", "Train_End"])
+
+    summary = folds_df.groupby("Model").agg(
+        Folds=("Train_End", "count"),
+        Abs_Error=("Abs_Error", "sum"),
+        Abs_Actual=("Abs_Actual", "sum"),
+        Fit_Seconds=("Fit_Seconds", "mean"),
+        Predict_Seconds=("Predict_Seconds", "mean"),
+    )
+    summary["WAPE_%"] = summary["Abs_Error"] / summary["Abs_Actual"] * 100
+    summary["MAPE_%"] = folds_df.groupby("Model")["APE"].apply(
+        lambda ape: np.concatenate(ape.to_list()).mean() * 100
+    )
+
+    summary = (
+        summary[["Folds", "MAPE_%", "WAPE_%", "Fit_Seconds", "Predict_Seconds"]]
+        .sort_values("WAPE_%")
+        .reset_index()
+    )
+    return folds_df.drop(columns="APE"), summary
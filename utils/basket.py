@@ -0,0 +1,72 @@
+# utils/basket.py
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from config import BASKET_MIN_LIFT, BASKET_MIN_SUPPORT
+
+
+def order_sku_matrix(df, order_col, sku_col):
+    """
+    Binary sparse order x SKU incidence matrix from integer-coded IDs.
+    Returns (matrix, skus) where skus labels the matrix columns.
+    """
+    valid = df[order_col].notna().to_numpy() & df[sku_col].notna().to_numpy()
+    order_codes, _ = pd.factorize(df[order_col][valid])
+    sku_codes, skus = pd.factorize(df[sku_col][valid])
+
+    matrix = sparse.csr_matrix(
+        (np.ones(len(order_codes), dtype=np.float32), (order_codes, sku_codes)),
+        shape=(order_codes.max() + 1 if len(order_codes) else 0, len(skus))
+    )
+    # Repeated lines of the same SKU in an order count once
+    matrix.data[:] = 1
+    return matrix, skus
+
+
+def sku_pairs(df, order_col, sku_col, min_support=BASKET_MIN_SUPPORT,
+              min_lift=BASKET_MIN_LIFT, top_n=100):
+    """
+    SKU pairs that sell together, ranked by lift.
+
+    Co-occurrence counts come from one sparse product X.T @ X; SKUs below
+    min_support are dropped first since no pair containing them can pass.
+    """
+    matrix, skus = order_sku_matrix(df, order_col, sku_col)
+    n_orders = matrix.shape[0]
+    if n_orders == 0:
+        return pd.DataFrame()
+
+    min_count = max(1, int(np.ceil(min_support * n_orders)))
+    item_counts = np.asarray(matrix.sum(axis=0)).ravel()
+    frequent = np.flatnonzero(item_counts >= min_count)
+
+    matrix = matrix[:, frequent]
+    item_counts = item_counts[frequent]
+
+    co = sparse.triu(matrix.T @ matrix, k=1).tocoo()
+    keep = co.data >= min_count
+    a, b, count = co.row[keep], co.col[keep], co.data[keep]
+
+    support = count / n_orders
+    support_a = item_counts[a] / n_orders
+    support_b = item_counts[b] / n_orders
+    lift = support / (support_a * support_b)
+
+    pairs = pd.DataFrame({
+        "SKU_A": skus[frequent[a]],
+        "SKU_B": skus[frequent[b]],
+        "Orders_Together": count.astype(np.int64),
+        "Support_%": support * 100,
+        "Confidence_A_to_B_%": count / item_counts[a] * 100,
+        "Confidence_B_to_A_%": count / item_counts[b] * 100,
+        "Lift": lift,
+    })
+
+    return (
+        pairs[pairs["Lift"] >= min_lift]
+        .sort_values(["Lift", "Orders_Together"], ascending=False)
+        .head(top_n)
+        .reset_index(drop=True)
+    )
@@ -0,0 +1,92 @@
+# utils/cohort.py
+
+import numpy as np
+import pandas as pd
+
+from utils.date_dimension import DATE_KEY_COL, MISSING_DATE_KEY, to_date_key
+
+# Mark outlet-month activity in a dense bool array up to this many cells
+# (1 byte each); beyond that fall back to sorting
+DENSE_ACTIVITY_CELLS = 250_000_000
+
+
+def _month_index(date_keys):
+    # Days since epoch -> months since epoch (1970-01 = 0)
+    return date_keys.astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)
+
+
+def cohort_retention(df, outlet_col, date_col, mask=None):
+    """
+    Outlet cohort retention. An outlet's cohort is the month of its first
+    order; cell (cohort, k) is the share of the cohort ordering again in
+    its k-th month after that.
+
+    Works on integer outlet codes and month indexes: distinct
+    outlet-month activity cells, each outlet's first month, then one
+    bincount over (cohort, age). Cells past the last observed month are NaN.
+
+    Returns (retention_%, active_counts, cohort_sizes).
+    """
+    keys = df[DATE_KEY_COL].to_numpy() if DATE_KEY_COL in df.columns else to_date_key(df[date_col])
+    valid = (keys != MISSING_DATE_KEY) & df[outlet_col].notna().to_numpy()
+    if mask is not None:
+        valid &= mask
+
+    outlet_codes = pd.factorize(df[outlet_col].to_numpy()[valid])[0].astype(np.int64)
+    if len(outlet_codes) == 0:
+        raise ValueError("❌ No rows with both an outlet and a valid date")
+
+    months = _month_index(keys[valid])
+    first_month = months.min()
+    months -= first_month
+    n_months = int(months.max()) + 1
+
+    # Distinct outlet-month cells, sorted by outlet then month
+    cells = outlet_codes * n_months + months
+    n_cells = (int(outlet_codes.max()) + 1) * n_months
+    if n_cells <= DENSE_ACTIVITY_CELLS:
+        seen = np.zeros(n_cells, dtype=bool)
+        seen[cells] = True
+        cells = np.flatnonzero(seen)
+    else:
+        cells = np.unique(cells)
+    cell_outlets = cells // n_months
+    cell_months = cells % n_months
+
+    # First cell of each outlet is its first active month
+    first_idx = np.flatnonzero(np.r_[True, cell_outlets[1:] != cell_outlets[:-1]])
+    cohorts = cell_months[first_idx][cell_outlets]
+    ages = cell_months - cohorts
+
+    active = np.bincount(cohorts * n_months + ages, minlength=n_months * n_months)
+    active = active.reshape(n_months, n_months).astype(np.float64)
+    sizes = active[:, 0].copy()
+
+    # Ages a cohort has not lived to yet are unknown, not zero
+    observable = np.arange(n_months)[None, :] < (n_months - np.arange(n_months))[:, None]
+    active[~observable] = np.nan
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        retention = active / sizes[:, None] * 100
+
+    labels = pd.PeriodIndex.from_ordinals(first_month + np.arange(n_months), freq="M").astype(str)
+    has_outlets = sizes > 0
+    index = pd.Index(labels[has_outlets], name="Cohort")
+    columns = pd.Index(np.arange(n_months), name="Months_Since_First_Order")
+
+    return (
+        pd.DataFrame(retention[has_outlets], index=index, columns=columns),
+        pd.DataFrame(active[has_outlets], index=index, columns=columns),
+        pd.Series(sizes[has_outlets].astype(np.int64), index=index, name="Outlets"),
+    )
+
+
+def average_retention(counts, sizes):
+    """
+    Size-weighted retention curve over the cohorts observable at each age.
+    """
+    observed = counts.notna()
+    weights = observed.mul(sizes, axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        curve = counts.fillna(0).sum() / weights.sum() * 100
+    return curve.rename("Retention_%")
@@ -13,10 +13,15 @@ def auto_detect_columns(df):
         "date": detect_column(cols, ["date", "order_date"]),
         "sales": detect_column(cols, ["amount", "sales", "value"]),
         "quantity": detect_column(cols, ["qty", "quantity"]),
+        "price": detect_column(cols, ["unitprice", "unit_price", "price", "mrp"]),
+        "discount": detect_column(cols, ["discount"]),
         "sku": detect_column(cols, ["sku", "product"]),
         "brand": detect_column(cols, ["brand"]),
         "city": detect_column(cols, ["city"]),
         "state": detect_column(cols, ["state"]),
         "outlet": detect_column(cols, ["outlet"]),
-        "rep": detect_column(cols, ["user", "salesman", "rep"])
+        "warehouse": detect_column(cols, ["warehouse"]),
+        "asset": detect_column(cols, ["asset"]),
+        "rep": detect_column(cols, ["user", "salesman", "rep"]),
+        "order": detect_column(cols, ["order_id", "order_no", "order_number"])
     }
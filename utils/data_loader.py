@@ -1,17 +1,54 @@
+import hashlib
+
 import pandas as pd
 import streamlit as st
 
+from config import APPROX_MIN_ROWS
+from utils.artifact_store import get_store
+from utils.column_detector import auto_detect_columns
+from utils.data_quality import profile_dataset
+from utils.filters import region_column
+from utils.memory import get_memory_manager
+from utils.sampling import stratified_sample
+
 def load_dataset(file):
     """
-    Load CSV or Excel file into a Pandas DataFrame and store in session state.
+    Load CSV or Excel file into a Pandas DataFrame, profile it once and
+    store it with its data-quality report in session state.
     """
     try:
+        version = hashlib.sha1(file.getvalue()).hexdigest()
+        if st.session_state.get("dataset_version") == version and "df" in st.session_state:
+            return st.session_state["df"]
+
         if file.name.endswith(".csv"):
             df = pd.read_csv(file)
         else:
             df = pd.read_excel(file, engine="openpyxl")
 
+        df, report = profile_dataset(df)
+
+        # Re-upload: drop only the stored artifacts whose input columns changed
+        previous_version = st.session_state.get("dataset_version")
+        if previous_version is not None:
+            get_store().invalidate_changed(df, previous_version, version)
+
         st.session_state["df"] = df
+        st.session_state["data_quality"] = report
+        st.session_state["dataset_version"] = version
+
+        # Large uploads keep a stratified sample for approximate mode
+        st.session_state.pop("sample", None)
+        if len(df) >= APPROX_MIN_ROWS:
+            st.session_state["sample"] = stratified_sample(
+                df, region_column(auto_detect_columns(df))
+            )
+
+        # Count the session's frames against the process memory budget
+        memory = get_memory_manager()
+        memory.track_dataset("df", df)
+        if "sample" in st.session_state:
+            memory.track_dataset("sample", st.session_state["sample"].frame, kind="derived")
         return df
 
     except Exception as e:
@@ -1,9 +1,29 @@
+import numpy as np
 import pandas as pd
 
+from utils.date_dimension import (
+    DATE_KEY_COL,
+    MISSING_DATE_KEY,
+    build_calendar,
+    calendar_lookup,
+    to_date_key,
+)
+
 def preprocess(df, date_col):
     df = df.copy()
     df[date_col] = pd.to_datetime(df[date_col], errors="coerce")
-    df["Year"] = df[date_col].dt.year
-    df["Month"] = df[date_col].dt.month
-    df["MonthName"] = df[date_col].dt.strftime("%b")
+    df[DATE_KEY_COL] = to_date_key(df[date_col])
+
+    keys = df[DATE_KEY_COL].to_numpy()
+    if not (keys != MISSING_DATE_KEY).any():
+        # Empty selection or no parseable dates: no calendar to look up
+        df["Year"] = np.nan
+        df["Month"] = np.nan
+        df["MonthName"] = np.nan
+        return df
+
+    calendar = build_calendar(keys)
+    df["Year"] = calendar_lookup(keys, calendar, "YEAR")
+    df["Month"] = calendar_lookup(keys, calendar, "MONTH")
+    df["MonthName"] = calendar_lookup(keys, calendar, "MONTH_NAME")
     return df
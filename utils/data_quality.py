@@ -0,0 +1,133 @@
+# utils/data_quality.py
+
+import numpy as np
+import pandas as pd
+
+from utils.column_detector import auto_detect_columns
+from utils.date_dimension import DATE_KEY_COL, MISSING_DATE_KEY, to_date_key
+
+# Row flags, kept in report["flags"] (one row per dataset row, same order)
+VALID_DATE_COL = "DQ_VALID_DATE"
+NEGATIVE_SALES_COL = "DQ_NEGATIVE"
+DUPLICATE_ROW_COL = "DQ_DUPLICATE_ROW"
+
+# Columns the profiler adds to the user's frame for internal use
+INTERNAL_COLUMNS = (DATE_KEY_COL,)
+
+# Name of the date column DATE_KEY was computed for, kept in df.attrs
+PROFILED_DATE_ATTR = "dq_date_column"
+
+
+def profile_dataset(df: pd.DataFrame):
+    """
+    Profile a freshly loaded dataset in one vectorized pass.
+
+    Returns (df, report). The detected date column is parsed to datetime
+    once and DATE_KEY is attached. DQ_* boolean flags marking unusable
+    dates, negative sales and exact duplicate rows go to report["flags"],
+    so they never mix with the user's columns.
+    """
+    cols = auto_detect_columns(df)
+    date_col = cols.get("date")
+    sales_col = cols.get("sales")
+    order_col = "ORDER_ID" if "ORDER_ID" in df.columns else None
+
+    n_rows = len(df)
+    null_counts = df.isna().sum()
+
+    columns = pd.DataFrame({
+        "Column": df.columns,
+        "Dtype": df.dtypes.astype(str).to_numpy(),
+        "Null_Count": null_counts.to_numpy(),
+        "Null_Rate_%": (null_counts / max(n_rows, 1) * 100).round(2).to_numpy(),
+        "Cardinality": df.nunique().to_numpy(),
+    })
+
+    df = df.copy()
+    report = {
+        "rows": n_rows,
+        "columns": columns,
+        "date_column": date_col,
+        "sales_column": sales_col,
+        "order_column": order_col,
+        "date_parse_failures": 0,
+        "missing_dates": 0,
+        "negative_sales": 0,
+        "duplicate_order_ids": 0,
+        "duplicate_rows": 0,
+    }
+
+    flags = pd.DataFrame(index=pd.RangeIndex(n_rows))
+    duplicate_rows = df.duplicated().to_numpy()
+    report["duplicate_rows"] = int(duplicate_rows.sum())
+    flags[DUPLICATE_ROW_COL] = duplicate_rows
+
+    if date_col:
+        raw_missing = df[date_col].isna().to_numpy()
+        df[date_col] = pd.to_datetime(df[date_col], errors="coerce")
+        df[DATE_KEY_COL] = to_date_key(df[date_col])
+
+        valid_date = df[date_col].notna().to_numpy()
+        report["missing_dates"] = int(raw_missing.sum())
+        report["date_parse_failures"] = int((~valid_date & ~raw_missing).sum())
+        flags[VALID_DATE_COL] = valid_date
+        df.attrs[PROFILED_DATE_ATTR] = date_col
+
+    if sales_col:
+        sales = pd.to_numeric(df[sales_col], errors="coerce").to_numpy()
+        negative = np.nan_to_num(sales, nan=0.0) < 0
+        report["negative_sales"] = int(negative.sum())
+        flags[NEGATIVE_SALES_COL] = negative
+
+    if order_col:
+        repeated = df[order_col].duplicated(keep=False).to_numpy()
+        report["duplicate_order_ids"] = int(df.loc[repeated, order_col].nunique())
+
+    report["flags"] = flags
+    return df, report
+
+
+def user_columns(df):
+    """
+    df without the columns added at ingest, as the user uploaded it;
+    used for previews and exports.
+    """
+    return df.drop(columns=[c for c in INTERNAL_COLUMNS if c in df.columns])
+
+
+def valid_date_rows(df, date_col):
+    """
+    Rows with a usable date_col, with date_col as datetime and DATE_KEY set.
+    Reads the ingest DATE_KEY when the profiler covered date_col, otherwise
+    parses and drops bad dates here.
+    """
+    if df.attrs.get(PROFILED_DATE_ATTR) == date_col and DATE_KEY_COL in df.columns:
+        return df.take(np.flatnonzero(df[DATE_KEY_COL].to_numpy() != MISSING_DATE_KEY))
+
+    df = df.copy()
+    df[date_col] = pd.to_datetime(df[date_col], errors="coerce")
+    df = df.dropna(subset=[date_col])
+    df[DATE_KEY_COL] = to_date_key(df[date_col])
+    return df
+
+
+def quality_issues(report):
+    """
+    Summary table of row-level issues found at ingest.
+    """
+    return pd.DataFrame({
+        "Check": [
+            "Missing dates",
+            "Unparseable dates",
+            "Negative sales",
+            "Order IDs on several rows",
+            "Exact duplicate rows",
+        ],
+        "Count": [
+            report["missing_dates"],
+            report["date_parse_failures"],
+            report["negative_sales"],
+            report["duplicate_order_ids"],
+            report["duplicate_rows"],
+        ],
+    })
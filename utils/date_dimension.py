@@ -0,0 +1,90 @@
+# utils/date_dimension.py
+
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from config import FISCAL_YEAR_START_MONTH
+
+DATE_KEY_COL = "DATE_KEY"
+MISSING_DATE_KEY = np.iinfo(np.int32).min
+
+
+def to_date_key(dates):
+    """
+    Convert dates to compact int32 keys (days since 1970-01-01).
+    Unparseable dates get MISSING_DATE_KEY.
+    """
+    parsed = pd.to_datetime(dates, errors="coerce")
+    days = np.asarray(parsed, dtype="datetime64[D]")
+    keys = days.view("int64")
+    return np.where(np.isnat(days), MISSING_DATE_KEY, keys).astype(np.int32)
+
+
+@lru_cache(maxsize=16)
+def _build_calendar(start_key, end_key, fiscal_start_month):
+    dates = pd.date_range(
+        pd.Timestamp(start_key, unit="D"),
+        pd.Timestamp(end_key, unit="D"),
+        freq="D"
+    )
+    iso = dates.isocalendar()
+
+    year = dates.year.to_numpy(dtype=np.int16)
+    month = dates.month.to_numpy(dtype=np.int8)
+    iso_year = iso["year"].to_numpy(dtype=np.int16)
+    iso_week = iso["week"].to_numpy(dtype=np.int8)
+
+    fiscal_period = ((month - fiscal_start_month) % 12 + 1).astype(np.int8)
+    fiscal_year = year + (fiscal_start_month > 1) * (month >= fiscal_start_month)
+
+    return pd.DataFrame({
+        DATE_KEY_COL: np.arange(start_key, end_key + 1, dtype=np.int32),
+        "DATE": dates,
+        "DAY": dates.day.to_numpy(dtype=np.int8),
+        "DAY_OF_WEEK": dates.dayofweek.to_numpy(dtype=np.int8),
+        "DAY_NAME": dates.day_name(),
+        "ISO_YEAR": iso_year,
+        "ISO_WEEK": iso_week,
+        "WEEK_KEY": iso_year.astype(np.int32) * 100 + iso_week,
+        "MONTH": month,
+        "MONTH_NAME": dates.strftime("%b"),
+        "MONTH_KEY": year.astype(np.int32) * 12 + month - 1,
+        "QUARTER": dates.quarter.to_numpy(dtype=np.int8),
+        "YEAR": year,
+        "FISCAL_YEAR": fiscal_year.astype(np.int16),
+        "FISCAL_PERIOD": fiscal_period,
+        "FISCAL_QUARTER": ((fiscal_period - 1) // 3 + 1).astype(np.int8),
+    })
+
+
+def build_calendar(date_keys, fiscal_start_month=FISCAL_YEAR_START_MONTH):
+    """
+    Calendar dimension covering the range of date_keys, one row per day.
+    Built once per date range and shared, so treat it as read-only.
+    """
+    keys = np.asarray(date_keys)
+    keys = keys[keys != MISSING_DATE_KEY]
+
+    if len(keys) == 0:
+        raise ValueError("❌ No valid dates available to build calendar")
+
+    return _build_calendar(int(keys.min()), int(keys.max()), fiscal_start_month)
+
+
+def calendar_lookup(date_keys, calendar, attribute):
+    """
+    Map date keys to a calendar attribute with a positional take.
+    Missing keys map to NaN.
+    """
+    keys = np.asarray(date_keys)
+    positions = keys.astype(np.int64) - calendar[DATE_KEY_COL].iat[0]
+    values = calendar[attribute].to_numpy()
+
+    missing = keys == MISSING_DATE_KEY
+    if missing.any():
+        return pd.api.extensions.take(
+            values, np.where(missing, -1, positions), allow_fill=True
+        )
+    return values[positions]
@@ -0,0 +1,221 @@
+# utils/export.py
+
+import gzip
+import html
+import io
+import os
+import secrets
+import shutil
+import time
+from contextlib import contextmanager
+
+import numpy as np
+import streamlit as st
+
+from config import EXPORT_CHUNK_ROWS, EXPORT_TTL_SECONDS
+from utils.data_quality import user_columns
+
+EXPORT_FORMATS = ["csv", "parquet"]
+
+_EXTENSIONS = {"csv": ".csv", "parquet": ".parquet"}
+_COMPRESSED_EXTENSIONS = {"gzip": ".gz", "zstd": ".zst"}
+
+# Exports are written under the app's static folder and downloaded through
+# Streamlit's static file route (server.enableStaticServing in
+# .streamlit/config.toml), which streams them from disk. Each export sits
+# in its own random folder; anyone holding the link can fetch it until it
+# is pruned.
+STATIC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "static")
+EXPORT_DIR = os.path.join(STATIC_DIR, "exports")
+EXPORT_URL = "app/static/exports"
+
+# Streamlit refuses to serve static files larger than this
+STATIC_SERVING_MAX_BYTES = 200 * 1024 * 1024
+
+
+def _has_zstandard():
+    try:
+        import zstandard  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def available_compressions(fmt):
+    """
+    Compression codecs usable for a format in this environment.
+    Parquet compresses internally, so it never needs the zstandard package.
+    """
+    if fmt == "parquet" or _has_zstandard():
+        return [None, "gzip", "zstd"]
+    return [None, "gzip"]
+
+
+def iter_row_chunks(df, mask=None, chunk_rows=EXPORT_CHUNK_ROWS):
+    """
+    Yield row chunks of df (optionally restricted to a boolean mask)
+    without materialising the whole filtered frame.
+    """
+    if mask is None:
+        for start in range(0, len(df), chunk_rows):
+            yield df.iloc[start:start + chunk_rows]
+        return
+
+    positions = np.flatnonzero(np.asarray(mask))
+    for start in range(0, len(positions), chunk_rows):
+        yield df.iloc[positions[start:start + chunk_rows]]
+
+
+@contextmanager
+def _text_sink(sink, compression):
+    if compression == "gzip":
+        raw = gzip.GzipFile(fileobj=sink, mode="wb")
+    elif compression == "zstd":
+        if not _has_zstandard():
+            raise ValueError("❌ zstd compressed CSV needs the 'zstandard' package")
+        import zstandard
+        raw = zstandard.ZstdCompressor().stream_writer(sink, closefd=False)
+    elif compression is None:
+        raw = sink
+    else:
+        raise ValueError(f"❌ Unsupported compression: {compression}")
+
+    text = io.TextIOWrapper(raw, encoding="utf-8", newline="")
+    try:
+        yield text
+    finally:
+        text.flush()
+        text.detach()
+        if raw is not sink:
+            raw.close()
+
+
+def write_csv(df, sink, mask=None, compression=None, chunk_rows=EXPORT_CHUNK_ROWS):
+    """
+    Stream df to a binary file object as CSV, one chunk at a time.
+    """
+    with _text_sink(sink, compression) as text:
+        header = True
+        for chunk in iter_row_chunks(df, mask, chunk_rows):
+            chunk.to_csv(text, index=False, header=header)
+            header = False
+        if header:
+            df.iloc[:0].to_csv(text, index=False)
+
+
+def write_parquet(df, sink, mask=None, compression=None, chunk_rows=EXPORT_CHUNK_ROWS):
+    """
+    Stream df to a binary file object as Parquet, one row group per chunk.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.Schema.from_pandas(df.iloc[:0], preserve_index=False)
+    with pq.ParquetWriter(sink, schema, compression=compression or "none") as writer:
+        for chunk in iter_row_chunks(df, mask, chunk_rows):
+            writer.write_table(
+                pa.Table.from_pandas(chunk, schema=schema, preserve_index=False)
+            )
+
+
+def write_export(df, sink, fmt="csv", mask=None, compression=None, chunk_rows=EXPORT_CHUNK_ROWS):
+    """
+    Write df (or its masked view) to sink in the requested format.
+    """
+    if fmt == "csv":
+        write_csv(df, sink, mask, compression, chunk_rows)
+    elif fmt == "parquet":
+        write_parquet(df, sink, mask, compression, chunk_rows)
+    else:
+        raise ValueError(f"❌ Unsupported export format: {fmt}")
+
+
+def export_to_file(df, path, fmt="csv", mask=None, compression=None):
+    """
+    Write the export straight to a file on disk and close it.
+    """
+    with open(path, "wb") as f:
+        write_export(df, f, fmt, mask, compression)
+    return path
+
+
+def prune_exports(max_age=EXPORT_TTL_SECONDS, export_dir=EXPORT_DIR):
+    """
+    Delete export folders older than max_age seconds.
+    """
+    if not os.path.isdir(export_dir):
+        return
+    cutoff = time.time() - max_age
+    for entry in os.scandir(export_dir):
+        if entry.is_dir() and entry.stat().st_mtime < cutoff:
+            shutil.rmtree(entry.path, ignore_errors=True)
+
+
+def _discard_export(path):
+    if path:
+        shutil.rmtree(os.path.dirname(path), ignore_errors=True)
+
+
+def export_file_name(stem, fmt, compression=None):
+    """
+    File name for an export, e.g. orders.csv.gz
+    """
+    name = stem + _EXTENSIONS[fmt]
+    if fmt == "csv" and compression:
+        name += _COMPRESSED_EXTENSIONS[compression]
+    return name
+
+
+def export_widget(df, file_stem, key, mask=None, label="⬇ Download"):
+    """
+    Render format / compression pickers and a prepare button. The export
+    is streamed to a file under static/exports and linked from there, so
+    neither writing nor downloading holds it in memory. The previous file
+    for this widget is deleted when a new one is prepared; stale ones are
+    pruned after EXPORT_TTL_SECONDS.
+    """
+    c1, c2, c3 = st.columns([1, 1, 2])
+    fmt = c1.selectbox("Format", EXPORT_FORMATS, key=f"{key}_format")
+    compression = c2.selectbox(
+        "Compression",
+        available_compressions(fmt),
+        format_func=lambda c: c or "none",
+        key=f"{key}_compression"
+    )
+
+    name = export_file_name(file_stem, fmt, compression)
+    # A prepared file is only offered while it still matches the inputs
+    signature = (name, id(df), len(df), None if mask is None else int(np.count_nonzero(mask)))
+    state_key = f"{key}_file"
+
+    if c3.button("Prepare export", key=f"{key}_prepare"):
+        previous = st.session_state.pop(state_key, None)
+        _discard_export(previous and previous["path"])
+        prune_exports()
+
+        folder = os.path.join(EXPORT_DIR, secrets.token_urlsafe(16))
+        os.makedirs(folder)
+        with st.spinner("Writing export…"):
+            # Internal ingest columns (DATE_KEY) are not part of the user's data
+            path = export_to_file(user_columns(df), os.path.join(folder, name), fmt, mask, compression)
+        st.session_state[state_key] = {"path": path, "signature": signature}
+
+    prepared = st.session_state.get(state_key)
+    if not prepared or prepared["signature"] != signature or not os.path.exists(prepared["path"]):
+        return
+
+    path = prepared["path"]
+    size = os.path.getsize(path)
+    if size > STATIC_SERVING_MAX_BYTES:
+        c3.warning(
+            f"Export is {size / 2**20:,.0f} MB, above the browser download limit; "
+            f"pick a compressed format or narrow the filters. Written to {path}"
+        )
+        return
+
+    url = f"{EXPORT_URL}/{os.path.basename(os.path.dirname(path))}/{name}"
+    c3.markdown(
+        f'<a href="{html.escape(url)}" download="{html.escape(name)}">{html.escape(label)}</a> '
+        f"({size / 2**20:,.1f} MB)",
+        unsafe_allow_html=True
+    )
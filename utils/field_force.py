@@ -0,0 +1,130 @@
+# utils/field_force.py
+
+import numpy as np
+import pandas as pd
+
+from utils.date_dimension import DATE_KEY_COL, MISSING_DATE_KEY, to_date_key
+
+ROLLING_WINDOWS = (7, 30)
+
+
+def _encode(df, rep_col, date_col):
+    """
+    Integer-code reps and days so every metric is a bincount.
+    """
+    keys = df[DATE_KEY_COL].to_numpy() if DATE_KEY_COL in df.columns else to_date_key(df[date_col])
+    valid = (keys != MISSING_DATE_KEY) & df[rep_col].notna().to_numpy()
+
+    df = df[valid]
+    keys = keys[valid].astype(np.int64)
+    rep_codes, reps = pd.factorize(df[rep_col], sort=True)
+    return df, rep_codes, reps, keys
+
+
+def rep_daily_matrix(rep_codes, day_index, values, n_reps, n_days):
+    """
+    Dense reps x days matrix of summed values.
+    """
+    cells = rep_codes * n_days + day_index
+    return np.bincount(cells, weights=values, minlength=n_reps * n_days).reshape(n_reps, n_days)
+
+
+def rolling_sums(matrix, window):
+    """
+    Trailing `window`-day sums along the day axis, for every rep at once.
+    """
+    csum = np.cumsum(matrix, axis=1)
+    shifted = np.zeros_like(csum)
+    shifted[:, window:] = csum[:, :-window]
+    return csum - shifted
+
+
+def rep_productivity(df, rep_col, date_col, sales_col, order_col=None, outlet_col=None):
+    """
+    Per-rep productivity metrics plus trailing 7/30-day sales trends.
+
+    Calls are distinct rep x outlet x day visits; a call is productive
+    when it produced positive sales.
+    """
+    df, rep_codes, reps, keys = _encode(df, rep_col, date_col)
+    n_reps = len(reps)
+
+    if n_reps == 0:
+        raise ValueError("❌ No rows with both a sales rep and a valid date")
+
+    first_day = keys.min()
+    n_days = int(keys.max() - first_day + 1)
+    day_index = keys - first_day
+    sales = df[sales_col].to_numpy(dtype=np.float64, na_value=0.0)
+
+    summary = pd.DataFrame({rep_col: reps})
+    summary["Total_Sales"] = np.bincount(rep_codes, weights=sales, minlength=n_reps)
+    summary["Order_Lines"] = np.bincount(rep_codes, minlength=n_reps)
+
+    rep_days = np.unique(rep_codes * n_days + day_index)
+    summary["Active_Days"] = np.bincount(rep_days // n_days, minlength=n_reps)
+
+    if order_col:
+        order_codes = pd.factorize(df[order_col], use_na_sentinel=False)[0].astype(np.int64)
+        rep_orders = np.unique(rep_codes * (order_codes.max() + 1) + order_codes)
+        summary["Orders"] = np.bincount(rep_orders // (order_codes.max() + 1), minlength=n_reps)
+    else:
+        summary["Orders"] = summary["Order_Lines"]
+
+    summary["Orders_per_Day"] = summary["Orders"] / summary["Active_Days"]
+    summary["Lines_per_Order"] = summary["Order_Lines"] / summary["Orders"]
+
+    if outlet_col:
+        outlet_codes = pd.factorize(df[outlet_col], use_na_sentinel=False)[0].astype(np.int64)
+        n_outlets = outlet_codes.max() + 1
+        rep_outlets = np.unique(rep_codes * n_outlets + outlet_codes)
+        summary["Outlets_Covered"] = np.bincount(rep_outlets // n_outlets, minlength=n_reps)
+
+        visit_keys = (rep_codes * n_outlets + outlet_codes) * n_days + day_index
+        visits, visit_index = np.unique(visit_keys, return_inverse=True)
+        visit_sales = np.bincount(visit_index, weights=sales, minlength=len(visits))
+        visit_reps = visits // (n_outlets * n_days)
+
+        summary["Calls"] = np.bincount(visit_reps, minlength=n_reps)
+        summary["Productive_Calls"] = np.bincount(visit_reps, weights=visit_sales > 0, minlength=n_reps)
+        summary["Productive_Call_Ratio_%"] = summary["Productive_Calls"] / summary["Calls"] * 100
+
+    # Rolling windows on the dense reps x days matrix (already date-ordered)
+    daily = rep_daily_matrix(rep_codes, day_index, sales, n_reps, n_days)
+    for window in ROLLING_WINDOWS:
+        rolled = rolling_sums(daily, window)
+        previous = np.zeros_like(rolled)
+        previous[:, window:] = rolled[:, :-window]
+
+        summary[f"Sales_{window}D"] = rolled[:, -1]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            summary[f"Trend_{window}D_%"] = np.where(
+                previous[:, -1] > 0, (rolled[:, -1] / previous[:, -1] - 1) * 100, np.nan
+            )
+
+    return summary.sort_values("Total_Sales", ascending=False).reset_index(drop=True)
+
+
+def rep_daily_trends(df, rep_col, date_col, sales_col, reps):
+    """
+    Daily sales with trailing 7/30-day sums for the given reps (long format).
+    """
+    df = df[df[rep_col].isin(reps)]
+    df, rep_codes, rep_values, keys = _encode(df, rep_col, date_col)
+    if len(rep_values) == 0:
+        return pd.DataFrame(columns=[rep_col, "Date", "Sales"])
+
+    first_day = keys.min()
+    n_days = int(keys.max() - first_day + 1)
+    sales = df[sales_col].to_numpy(dtype=np.float64, na_value=0.0)
+    daily = rep_daily_matrix(rep_codes, keys - first_day, sales, len(rep_values), n_days)
+
+    dates = pd.to_datetime((first_day + np.arange(n_days)).astype("datetime64[D]"))
+    trends = pd.DataFrame({
+        rep_col: np.repeat(rep_values, n_days),
+        "Date": np.tile(dates, len(rep_values)),
+        "Sales": daily.ravel(),
+    })
+    for window in ROLLING_WINDOWS:
+        trends[f"Sales_{window}D"] = rolling_sums(daily, window).ravel()
+    return trends
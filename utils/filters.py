@@ -0,0 +1,97 @@
+# utils/filters.py
+
+import time
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from config import APPROX_DEBOUNCE_SECONDS
+from utils.date_dimension import DATE_KEY_COL, MISSING_DATE_KEY, to_date_key
+
+
+def region_column(cols):
+    """
+    Coarsest detected geography column, used for region filters.
+    """
+    return cols.get("state") or cols.get("city")
+
+
+def _date_keys(frame, cols):
+    if DATE_KEY_COL in frame.columns:
+        return frame[DATE_KEY_COL].to_numpy()
+    return to_date_key(frame[cols["date"]])
+
+
+def sidebar_filters(df, cols):
+    """
+    Render the shared date range / region filters in the sidebar.
+    Returns the selection as plain values so it can be applied to both
+    the full dataset and its sample.
+    """
+    st.sidebar.header(" Filters")
+    selection = {"date_keys": None, "region_col": region_column(cols), "regions": []}
+
+    if cols.get("date"):
+        keys = _date_keys(df, cols)
+        keys = keys[keys != MISSING_DATE_KEY]
+        if len(keys):
+            min_date = pd.Timestamp(int(keys.min()), unit="D").date()
+            max_date = pd.Timestamp(int(keys.max()), unit="D").date()
+            date_range = st.sidebar.date_input(
+                "Select Date Range", value=(min_date, max_date),
+                min_value=min_date, max_value=max_date
+            )
+            if len(date_range) == 2:
+                selection["date_keys"] = tuple(int(k) for k in to_date_key(pd.Series(date_range)))
+
+    if selection["region_col"]:
+        selection["regions"] = st.sidebar.multiselect(
+            f"Select {selection['region_col']}",
+            sorted(df[selection["region_col"]].dropna().unique())
+        )
+
+    return selection
+
+
+def selection_settled(key, selection, window=APPROX_DEBOUNCE_SECONDS):
+    """
+    True once the selection has stayed unchanged for `window` seconds
+    (and on a page's first visit). Until then a timer reruns the page
+    when the window closes, so a burst of filter changes only pays for
+    the sample pass and the exact pass runs once, for the final filters.
+    """
+    state_key = f"{key}_selection_changed"
+    previous = st.session_state.get(state_key)
+    if previous is None:
+        previous = st.session_state[state_key] = (selection, 0.0)
+    elif previous[0] != selection:
+        previous = st.session_state[state_key] = (selection, time.monotonic())
+
+    if time.monotonic() - previous[1] >= window:
+        return True
+
+    @st.fragment(run_every=window)
+    def rerun_when_idle():
+        # The first call renders in place; timed reruns check the clock
+        if time.monotonic() - st.session_state[state_key][1] >= window:
+            st.rerun()
+
+    rerun_when_idle()
+    return False
+
+
+def filter_mask(frame, cols, selection):
+    """
+    Boolean row mask for a sidebar selection.
+    """
+    mask = np.ones(len(frame), dtype=bool)
+
+    if selection["date_keys"] is not None:
+        keys = _date_keys(frame, cols)
+        mask &= (keys >= selection["date_keys"][0]) & (keys <= selection["date_keys"][1])
+
+    if selection["regions"]:
+        mask &= frame[selection["region_col"]].isin(selection["regions"]).to_numpy()
+
+    return mask
@@ -2,10 +2,13 @@
 
 import pandas as pd
 import numpy as np
-from sklearn.linear_model import LinearRegression
 
+from config import INTERVAL_LEVEL
+from utils.intervals import prediction_intervals, residuals
+from utils.lazy_imports import lazy_import
 
-def prepare_time_series(df, date_col, sales_col, freq="M"):
+
+def prepare_time_series(df, date_col, sales_col, freq="MS"):
     """
     Prepare aggregated time series data
     """
@@ -24,29 +27,131 @@ def prepare_time_series(df, date_col, sales_col, freq="M"):
     return temp
 
 
-def forecast_sales(ts_df, periods=6):
-    """
-    Forecast future sales using Linear Regression
-    """
-    X = ts_df[["t"]]
-    y = ts_df.iloc[:, 1]  # sales column
+# ---------------- Forecasters ----------------
+# Every forecaster is a (fit, predict) pair:
+#   fit(dates, values, freq) -> model
+#   predict(model, periods) -> np.ndarray of the next `periods` values
+# so pages and the backtesting harness can swap them freely.
+# FITTED_VALUES[name](model) returns the in-sample predictions that
+# utils.intervals turns into prediction intervals.
+# ML libraries are imported on first fit, not when this module loads.
+
+def fit_linear(dates, values, freq="MS"):
+    model = lazy_import("sklearn.linear_model").LinearRegression()
+    model.fit(np.arange(len(values)).reshape(-1, 1), np.asarray(values))
+    return model, len(values)
+
+
+def predict_linear(model, periods):
+    model, n = model
+    return model.predict(np.arange(n, n + periods).reshape(-1, 1))
+
+
+def fitted_linear(model):
+    model, n = model
+    return model.predict(np.arange(n).reshape(-1, 1))
+
+
+def fit_random_forest(dates, values, freq="MS"):
+    model = lazy_import("sklearn.ensemble").RandomForestRegressor(
+        n_estimators=300,
+        random_state=42,
+        # Out-of-bag predictions give honest residuals for intervals
+        oob_score=True
+    )
+    model.fit(pd.DataFrame({"time_idx": np.arange(len(values))}), np.asarray(values))
+    return model, len(values)
+
+
+def predict_random_forest(model, periods):
+    model, n = model
+    return model.predict(pd.DataFrame({"time_idx": np.arange(n, n + periods)}))
+
+
+def fitted_random_forest(model):
+    model, _ = model
+    return model.oob_prediction_
+
+
+def fit_prophet(dates, values, freq="D"):
+    daily = freq == "D"
+    model = lazy_import("prophet").Prophet(
+        daily_seasonality=daily,
+        weekly_seasonality=daily,
+        yearly_seasonality=True,
+        # Intervals come from utils.intervals, not Prophet's simulations
+        uncertainty_samples=0
+    )
+    model.fit(pd.DataFrame({"ds": pd.to_datetime(dates), "y": np.asarray(values)}))
+    return model, freq
+
+
+def predict_prophet(model, periods):
+    model, freq = model
+    future = model.make_future_dataframe(periods=periods, freq=freq, include_history=False)
+    return model.predict(future)["yhat"].to_numpy()
+
+
+def fitted_prophet(model):
+    model, _ = model
+    return model.predict(model.history[["ds"]])["yhat"].to_numpy()
 
-    model = LinearRegression()
-    model.fit(X, y)
 
-    future_t = np.arange(len(ts_df), len(ts_df) + periods)
+FORECASTERS = {
+    "Linear Regression": (fit_linear, predict_linear),
+    "Random Forest": (fit_random_forest, predict_random_forest),
+    "Prophet": (fit_prophet, predict_prophet),
+}
 
-    future_sales = model.predict(future_t.reshape(-1, 1))
+FITTED_VALUES = {
+    "Linear Regression": fitted_linear,
+    "Random Forest": fitted_random_forest,
+    "Prophet": fitted_prophet,
+}
+
+
+def forecast_with_intervals(name, dates, values, periods, freq="MS",
+                            level=INTERVAL_LEVEL, method="bootstrap"):
+    """
+    Fit forecaster `name` and forecast `periods` steps ahead with
+    prediction intervals from its in-sample residuals.
+    Returns a frame with ds, yhat, yhat_lower and yhat_upper.
+    """
+    fit, predict = FORECASTERS[name]
+    model = fit(dates, values, freq)
+    point = np.asarray(predict(model, periods), dtype=np.float64)
+
+    errors = residuals(values, FITTED_VALUES[name](model))
+    lower, upper = prediction_intervals(point, errors, level, method)
 
     future_dates = pd.date_range(
-        start=ts_df.iloc[-1, 0],
+        start=pd.DatetimeIndex(dates)[-1],
         periods=periods + 1,
-        freq="M"
+        freq=freq
     )[1:]
 
+    return pd.DataFrame({
+        "ds": future_dates,
+        "yhat": point,
+        "yhat_lower": lower,
+        "yhat_upper": upper,
+    })
+
+
+def forecast_sales(ts_df, periods=6, level=INTERVAL_LEVEL):
+    """
+    Forecast future sales using Linear Regression, with Lower / Upper
+    prediction-interval columns
+    """
+    forecast = forecast_with_intervals(
+        "Linear Regression", ts_df.iloc[:, 0], ts_df.iloc[:, 1], periods, "MS", level
+    )
+
     forecast_df = pd.DataFrame({
-        ts_df.columns[0]: future_dates,
-        ts_df.columns[1]: future_sales
+        ts_df.columns[0]: forecast["ds"],
+        ts_df.columns[1]: forecast["yhat"],
+        "Lower": forecast["yhat_lower"],
+        "Upper": forecast["yhat_upper"],
     })
 
     return forecast_df
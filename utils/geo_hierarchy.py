@@ -0,0 +1,138 @@
+# utils/geo_hierarchy.py
+
+import plotly.express as px
+import streamlit as st
+
+from utils.parallel_agg import grouped_aggregate
+from utils.table import paged_table
+
+MISSING_LABEL = "Unknown"
+ALL_LABEL = "All"
+
+
+def geo_columns(cols):
+    """
+    Detected state -> city -> outlet columns, coarsest first.
+    """
+    return [cols[key] for key in ("state", "city", "outlet") if cols.get(key)]
+
+
+def geo_rollups(df, keys, sales_col, qty_col=None, mask=None):
+    """
+    One grouped pass at the finest geography (e.g. state x city x outlet);
+    every coarser level is summed from the level below it.
+
+    Each level is sorted by sales, and for every ancestor depth an index
+    maps a parent (tuple of keys) to its rows' positions in that order,
+    so a drill-down is a positional take that is already sorted.
+    """
+    if not keys:
+        raise ValueError("❌ No state, city or outlet column detected")
+
+    aggs = {"Sales": (sales_col, "sum"), "Order_Lines": (sales_col, "size")}
+    if qty_col:
+        aggs["Quantity"] = (qty_col, "sum")
+
+    frame = df if mask is None else df.loc[mask, [*keys, sales_col] + ([qty_col] if qty_col else [])]
+    finest = grouped_aggregate(frame, keys, aggs, dropna=False, sort=False).reset_index()
+
+    # Missing geography becomes its own member so it can be drilled into
+    for key in keys:
+        if finest[key].isna().any():
+            finest[key] = finest[key].astype(object).where(finest[key].notna(), MISSING_LABEL)
+
+    levels = {keys[-1]: finest}
+    for depth in range(len(keys) - 1, 0, -1):
+        child = levels[keys[depth]]
+        parent = child.groupby(keys[:depth], as_index=False, sort=False)[list(aggs)].sum()
+        parent[f"{keys[depth]}_Count"] = child.groupby(keys[:depth], sort=False).size().to_numpy()
+        levels[keys[depth - 1]] = parent
+
+    index = {}
+    for depth, key in enumerate(keys):
+        levels[key] = levels[key].sort_values("Sales", ascending=False, ignore_index=True)
+        for ancestors in range(1, depth + 1):
+            parents = keys[:ancestors]
+            groups = levels[key].groupby(parents, sort=False).indices
+            # Single-key groupby yields scalar keys; normalise to tuples
+            index[(key, ancestors)] = {
+                (k if isinstance(k, tuple) else (k,)): v for k, v in groups.items()
+            }
+
+    return {"keys": keys, "levels": levels, "index": index}
+
+
+def geo_drilldown(rollups, level, path=()):
+    """
+    Rows of one level under a node, e.g. geo_drilldown(r, CITY, ("MH",)).
+    path holds the selected keys from the top; the result keeps sales order.
+    """
+    table = rollups["levels"][level]
+    if not path:
+        return table
+
+    positions = rollups["index"][(level, len(path))].get(tuple(path))
+    if positions is None:
+        return table.iloc[:0]
+    return table.iloc[positions]
+
+
+def geo_top(rollups, level, n=10):
+    """
+    Top n members of a level by sales, merged across parents (a city name
+    shared by two states is one bar, as in a flat group-by). Rows with a
+    missing member are left out, as a flat group-by would drop them.
+    """
+    table = rollups["levels"][level]
+    table = table[table[level] != MISSING_LABEL]
+    return table.groupby(level, as_index=False, sort=False)["Sales"].sum().nlargest(n, "Sales")
+
+
+def geo_drilldown_widget(rollups, key, version=None, top=10):
+    """
+    State -> city -> outlet pickers with the selected node's children
+    charted and tabled; every view is sliced from the precomputed rollups.
+    version identifies the rollups (dataset version + filters) for the table.
+    """
+    keys = rollups["keys"]
+    path = []
+    pickers = st.columns(max(len(keys) - 1, 1))
+    for depth, level in enumerate(keys[:-1]):
+        options = geo_drilldown(rollups, level, path)[level].tolist()
+        choice = pickers[depth].selectbox(level, [ALL_LABEL, *options], key=f"{key}_{level}")
+        if choice == ALL_LABEL:
+            break
+        path.append(choice)
+
+    child_level = keys[len(path)]
+    children = geo_drilldown(rollups, child_level, path)
+    leaves = geo_drilldown(rollups, keys[-1], path)
+    node = " / ".join(str(p) for p in path) or ALL_LABEL
+
+    k1, k2, k3 = st.columns(3)
+    k1.metric(f"Sales – {node}", f"₹ {children['Sales'].sum():,.0f}")
+    k2.metric(f"{child_level} Count", f"{len(children):,}")
+    if child_level != keys[-1]:
+        k3.metric(f"{keys[-1]} Count", f"{len(leaves):,}")
+
+    c1, c2 = st.columns(2)
+    c1.plotly_chart(
+        px.bar(
+            children.head(top).astype({child_level: str}), x=child_level, y="Sales",
+            text="Sales", title=f"Top {child_level} – {node}"
+        ),
+        use_container_width=True
+    )
+    if child_level != keys[-1]:
+        c2.plotly_chart(
+            px.bar(
+                leaves.head(top).astype({keys[-1]: str}), x=keys[-1], y="Sales",
+                text="Sales", title=f"Top {keys[-1]} – {node}"
+            ),
+            use_container_width=True
+        )
+
+    paged_table(
+        children.drop(columns=keys[:len(path)]), f"{key}_table",
+        version=(version, tuple(path)), digits=2
+    )
@@ -0,0 +1,71 @@
+# utils/intervals.py
+
+from statistics import NormalDist
+
+import numpy as np
+
+from config import INTERVAL_BOOTSTRAP_SAMPLES, INTERVAL_LEVEL
+
+INTERVAL_METHODS = ("bootstrap", "analytic")
+
+
+def residuals(values, fitted):
+    """
+    In-sample forecast errors (actual - fitted), non-finite values dropped.
+    """
+    errors = np.asarray(values, dtype=np.float64) - np.asarray(fitted, dtype=np.float64)
+    return errors[np.isfinite(errors)]
+
+
+def _horizon_steps(point, horizon):
+    # Steps ahead of each point: 1, 2, ... unless given
+    if horizon is None:
+        return np.arange(1, len(point) + 1)
+    return np.maximum(np.asarray(horizon, dtype=np.int64), 1)
+
+
+def analytic_intervals(point, errors, level=INTERVAL_LEVEL, horizon=None):
+    """
+    Normal intervals: point ± z * residual standard deviation * sqrt(h),
+    h being the steps ahead, as for independent one-step errors that
+    accumulate over the horizon.
+    """
+    z = NormalDist().inv_cdf(0.5 + level / 2)
+    half_width = z * errors.std(ddof=1) * np.sqrt(_horizon_steps(point, horizon))
+    return point - half_width, point + half_width
+
+
+def bootstrap_intervals(point, errors, level=INTERVAL_LEVEL, horizon=None,
+                        n_boot=INTERVAL_BOOTSTRAP_SAMPLES, seed=42):
+    """
+    Empirical intervals: resample centred residuals into (n_boot x H)
+    paths and accumulate them, so the error at step h is the sum of h
+    draws; quantiles are taken at each point's step. The band widens
+    with the horizon and keeps the skew of the residuals, unlike the
+    analytic method.
+    """
+    steps = _horizon_steps(point, horizon)
+    rng = np.random.default_rng(seed)
+    draws = rng.choice(errors - errors.mean(), size=(n_boot, int(steps.max())))
+    paths = draws.cumsum(axis=1)
+    lower, upper = np.quantile(paths, [(1 - level) / 2, (1 + level) / 2], axis=0)
+    return point + lower[steps - 1], point + upper[steps - 1]
+
+
+def prediction_intervals(point, errors, level=INTERVAL_LEVEL, method="bootstrap", horizon=None):
+    """
+    (lower, upper) arrays around `point` from one-step residuals `errors`.
+    horizon gives each point's steps ahead (default 1, 2, ..., len(point));
+    bands widen with it. Bounds are NaN when there are fewer than two
+    residuals.
+    """
+    point = np.asarray(point, dtype=np.float64)
+    if method not in INTERVAL_METHODS:
+        raise ValueError(f"❌ Unknown interval method: {method}")
+    if len(errors) < 2:
+        missing = np.full_like(point, np.nan)
+        return missing, missing.copy()
+
+    if method == "analytic":
+        return analytic_intervals(point, errors, level, horizon)
+    return bootstrap_intervals(point, errors, level, horizon)
@@ -0,0 +1,64 @@
+# utils/lazy_imports.py
+
+import importlib
+import sys
+import threading
+import time
+
+# Modules that cost seconds to import; load them only on first real use
+HEAVY_MODULES = [
+    "sklearn.linear_model",
+    "sklearn.ensemble",
+    "sklearn.cluster",
+    "sklearn.preprocessing",
+    "prophet",
+]
+
+_import_seconds = {}
+_warmup_thread = None
+_warmup_lock = threading.Lock()
+
+
+def lazy_import(name):
+    """
+    Import a module on first use and record how long it took.
+    Always goes through importlib, whose per-module import lock makes a
+    caller wait for an import another thread (e.g. the warm-up) has
+    started, instead of getting the partially initialised module from
+    sys.modules.
+    """
+    already_loaded = name in sys.modules
+    start = time.perf_counter()
+    module = importlib.import_module(name)
+    if not already_loaded:
+        _import_seconds.setdefault(name, time.perf_counter() - start)
+    return module
+
+
+def _warm_up(modules):
+    for name in modules:
+        try:
+            lazy_import(name)
+        except ImportError:
+            _import_seconds[name] = None
+
+
+def start_warm_up(modules=HEAVY_MODULES):
+    """
+    Preload heavy modules in a background thread, once per process.
+    """
+    global _warmup_thread
+    with _warmup_lock:
+        if _warmup_thread is None:
+            _warmup_thread = threading.Thread(
+                target=_warm_up, args=(list(modules),), name="heavy-import-warmup", daemon=True
+            )
+            _warmup_thread.start()
+    return _warmup_thread
+
+
+def import_timings():
+    """
+    Seconds spent importing each heavy module so far (None = not installed).
+    """
+    return dict(_import_seconds)
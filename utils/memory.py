@@ -0,0 +1,326 @@
+# utils/memory.py
+
+import functools
+import hashlib
+import os
+import pickle
+import shutil
+import sys
+import threading
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from config import ARTIFACT_DIR, MEMORY_BUDGET_MB, MEMORY_RESULT_FLOOR
+
+SPILL_DIR = os.path.join(ARTIFACT_DIR, "spill")
+MB = 1024 * 1024
+
+
+def current_session_id():
+    """
+    Streamlit session of the running script, or None outside a script
+    thread (worker pools, CLI).
+    """
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    ctx = get_script_run_ctx(suppress_warning=True)
+    return ctx.session_id if ctx else None
+
+
+def estimate_size(value):
+    """
+    Approximate in-memory bytes of frames, arrays and containers of them.
+    """
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum()) if isinstance(value, pd.DataFrame) else int(usage)
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, dict):
+        return sum(estimate_size(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(estimate_size(v) for v in value)
+    if hasattr(value, "__dict__"):
+        return sys.getsizeof(value) + estimate_size(vars(value))
+    return sys.getsizeof(value)
+
+
+class _Entry:
+    __slots__ = ("value", "size", "kind", "session", "spilled", "pinned")
+
+    def __init__(self, value, size, kind, session, pinned):
+        self.value = value
+        self.size = size
+        self.kind = kind
+        self.session = session
+        self.spilled = None
+        self.pinned = pinned
+
+
+class MemoryManager:
+    """
+    Process-wide accounting of datasets, derived frames and cached results.
+
+    Datasets and the frames pages derive from them are pinned and held by
+    weak reference (they live in session state or a page run and
+    disappear with it). Cached results are kept in LRU order; when they
+    exceed their share of the budget, the least recently used are spilled
+    to disk whole (frames, nested dicts/tuples, arbitrary objects) and
+    only dropped if they cannot be serialised.
+
+    Results may use the budget left over by pinned data, but never less
+    than MEMORY_RESULT_FLOOR of it, so pinned data over budget does not
+    make every cache access spill and reload.
+    """
+
+    def __init__(self, budget_bytes, spill_dir=SPILL_DIR):
+        self.budget_bytes = budget_bytes
+        self.spill_dir = os.path.join(spill_dir, str(os.getpid()))
+        self.entries = OrderedDict()
+        self.lock = threading.RLock()
+        self.evictions = 0
+        self.spills = 0
+        _remove_stale_spills(spill_dir)
+
+    # ---------------- Tracking ----------------
+    def track_dataset(self, name, df, kind="dataset", session=None):
+        """
+        Account for a session-held object (dataset, sample) without ever
+        evicting it.
+        """
+        session = session if session is not None else current_session_id()
+        with self.lock:
+            self.entries[(session, name)] = _Entry(
+                weakref.ref(df), estimate_size(df), kind, session, pinned=True
+            )
+            self._enforce()
+
+    def track_derived(self, name, frame, source=None, session=None):
+        """
+        Account for a frame a page derived from a dataset (filtered or
+        cleaned copy) for as long as it is alive. Views that are the
+        source object itself are not counted twice.
+        """
+        if frame is not source:
+            self.track_dataset(name, frame, kind="derived", session=session)
+        return frame
+
+    def put(self, key, value, kind="result", session=None):
+        session = session if session is not None else current_session_id()
+        with self.lock:
+            self._discard(key)
+            self.entries[key] = _Entry(value, estimate_size(value), kind, session, pinned=False)
+            self._enforce()
+        return value
+
+    def get(self, key):
+        """
+        Value for key (reloaded from disk if spilled), or None if unknown
+        or evicted.
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            self.entries.move_to_end(key)
+
+            if entry.spilled is not None:
+                with open(entry.spilled, "rb") as f:
+                    entry.value = pickle.load(f)
+                self._remove_spill(entry)
+                self._enforce(keep=key)
+            return entry.value
+
+    # ---------------- Eviction ----------------
+    def _live(self):
+        # Drop datasets whose session state (or page run) has gone away
+        dead = [key for key, entry in self.entries.items() if entry.pinned and entry.value() is None]
+        for key in dead:
+            del self.entries[key]
+        return self.entries.items()
+
+    def in_memory_bytes(self):
+        with self.lock:
+            return sum(entry.size for _, entry in self._live() if entry.spilled is None)
+
+    def result_budget(self):
+        """
+        Bytes cached results may hold: what pinned data leaves of the
+        budget, but at least MEMORY_RESULT_FLOOR of it.
+        """
+        with self.lock:
+            pinned = sum(entry.size for _, entry in self._live() if entry.pinned)
+        return max(self.budget_bytes - pinned, int(self.budget_bytes * MEMORY_RESULT_FLOOR))
+
+    def _enforce(self, keep=None):
+        budget = self.result_budget()
+        total = sum(
+            entry.size for _, entry in self._live() if not entry.pinned and entry.spilled is None
+        )
+        for key, entry in list(self.entries.items()):
+            if total <= budget:
+                break
+            if entry.pinned or entry.spilled is not None or key == keep:
+                continue
+
+            if self._spill(key, entry):
+                self.spills += 1
+            else:
+                del self.entries[key]
+                self.evictions += 1
+            total -= entry.size
+
+    def _spill(self, key, entry):
+        """
+        Pickle the value to the spill folder and release it. False when
+        the value can't be serialised (it is then evicted instead).
+        Spill files are only ever read back by this process.
+        """
+        os.makedirs(self.spill_dir, exist_ok=True)
+        path = os.path.join(self.spill_dir, hashlib.sha1(repr(key).encode("utf-8")).hexdigest() + ".pkl")
+        try:
+            with open(path, "wb") as f:
+                pickle.dump(entry.value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError, OSError):
+            if os.path.exists(path):
+                os.remove(path)
+            return False
+        entry.spilled = path
+        entry.value = None
+        return True
+
+    def _remove_spill(self, entry):
+        if os.path.exists(entry.spilled):
+            os.remove(entry.spilled)
+        entry.spilled = None
+
+    def _discard(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is not None and entry.spilled is not None:
+            self._remove_spill(entry)
+
+    # ---------------- Reporting ----------------
+    def usage(self):
+        """
+        One row per tracked object: session, name, kind, MB, state.
+        """
+        with self.lock:
+            rows = [
+                {
+                    "Session": entry.session or "shared",
+                    "Name": key[1] if entry.pinned else key[0],
+                    "Kind": entry.kind,
+                    "MB": entry.size / MB,
+                    "State": "spilled" if entry.spilled is not None else "in memory",
+                }
+                for key, entry in self._live()
+            ]
+        return pd.DataFrame(rows, columns=["Session", "Name", "Kind", "MB", "State"])
+
+
+def _pid_running(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _remove_stale_spills(spill_dir):
+    """
+    Delete spill folders of processes that are no longer running (and a
+    leftover one under this process's reused pid).
+    """
+    if not os.path.isdir(spill_dir):
+        return
+    for entry in os.scandir(spill_dir):
+        if entry.is_file():
+            # Flat files predate per-process folders
+            os.remove(entry.path)
+            continue
+        if not entry.name.isdigit():
+            continue
+        pid = int(entry.name)
+        if pid == os.getpid() or not _pid_running(pid):
+            shutil.rmtree(entry.path, ignore_errors=True)
+
+
+def process_rss_bytes():
+    """
+    Resident memory of this process (Linux), or None where unavailable.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_memory_manager():
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = MemoryManager(MEMORY_BUDGET_MB * MB)
+    return _manager
+
+
+def track_derived(name, frame, source=None):
+    """
+    Count a frame a page derived (filtered / cleaned copy) against the
+    memory budget for as long as the page holds it; returns the frame.
+    """
+    return get_memory_manager().track_derived(name, frame, source)
+
+
+def budgeted_cache(func):
+    """
+    Memoise func(*args) in the memory manager instead of an unbounded
+    cache. Arguments must have a stable repr (versions, names, tuples).
+    """
+    # Page scripts all run as __main__, so the file disambiguates them
+    source = func.__code__.co_filename
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        manager = get_memory_manager()
+        call = repr((source, args, sorted(kwargs.items())))
+        key = (func.__qualname__, hashlib.sha1(call.encode("utf-8")).hexdigest())
+        value = manager.get(key)
+        if value is None:
+            value = manager.put(key, func(*args, **kwargs))
+        return value
+
+    return wrapper
+
+
+def memory_sidebar():
+    """
+    Compact memory readout (process, this session, budget) in the sidebar.
+    """
+    manager = get_memory_manager()
+    usage = manager.usage()
+    in_memory = usage[usage["State"] == "in memory"]
+    session = current_session_id()
+    tracked_mb = in_memory["MB"].sum()
+    budget_mb = manager.budget_bytes / MB
+
+    with st.sidebar.expander("Memory", expanded=False):
+        st.progress(min(tracked_mb / budget_mb, 1.0), text=f"{tracked_mb:,.0f} / {budget_mb:,.0f} MB tracked")
+        st.caption(f"This session: {in_memory.loc[in_memory['Session'] == session, 'MB'].sum():,.0f} MB")
+        rss = process_rss_bytes()
+        if rss is not None:
+            st.caption(f"Process RSS: {rss / MB:,.0f} MB")
+        st.caption(
+            f"Spilled: {(usage['State'] == 'spilled').sum()} · "
+            f"Evicted: {manager.evictions}"
+        )
@@ -1,3 +1,6 @@
+from utils.parallel_agg import grouped_aggregate
+from utils.sampling import estimate_mean, estimate_total
+
 def kpi_total_sales(df, sales_col):
     return df[sales_col].sum()
 
@@ -8,3 +11,24 @@ def kpi_aov(df, sales_col):
 
 def kpi_orders(df):
     return len(df)
+
+
+def top_n(df, group_col, value_col, n=10):
+    """
+    Top n categories by summed value (the numbers behind bar_top).
+    """
+    totals = grouped_aggregate(df, group_col, {value_col: (value_col, "sum")})
+    return totals.sort_values(value_col, ascending=False).head(n).reset_index()
+
+
+# ---------------- Approximate (sample based) ----------------
+def kpi_total_sales_approx(sample, sales_col, mask=None):
+    return estimate_total(sample, sales_col, mask)
+
+
+def kpi_aov_approx(sample, sales_col, mask=None):
+    return estimate_mean(sample, sales_col, mask)
+
+
+def kpi_orders_approx(sample, mask=None):
+    return estimate_total(sample, None, mask)
@@ -0,0 +1,269 @@
+# utils/parallel_agg.py
+
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from config import PARALLEL_AGG_MIN_ROWS, PARALLEL_AGG_WORKERS
+from utils.sections import hidden_main, process_context
+
+AGGREGATIONS = ("sum", "count", "size", "min", "max", "mean", "nunique_approx")
+
+# HyperLogLog precision for nunique_approx: 2**p one-byte registers per
+# group (~6.5% standard error at p=8)
+HLL_PRECISION = 8
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+# ---------------- Group encoding ----------------
+def encode_groups(df, by, dropna=True, sort=True):
+    """
+    Integer group codes for the `by` columns plus the matching index.
+    Rows with a missing key get -1 when dropna is True.
+    """
+    by = [by] if isinstance(by, str) else list(by)
+    codes = np.zeros(len(df), dtype=np.int64)
+    uniques = []
+    for col in by:
+        col_codes, col_uniques = pd.factorize(df[col], sort=sort, use_na_sentinel=dropna)
+        if dropna:
+            codes = np.where(col_codes < 0, -1, codes * len(col_uniques) + col_codes)
+        else:
+            codes = codes * len(col_uniques) + col_codes
+        uniques.append(col_uniques)
+
+    if len(by) == 1:
+        return codes, pd.Index(uniques[0], name=by[0])
+
+    # Compact the combined codes to the groups that actually occur
+    present = codes >= 0
+    combined, groups = pd.factorize(codes[present], sort=sort)
+    compact = np.full(len(codes), -1, dtype=np.int64)
+    compact[present] = combined
+
+    sizes = [len(u) for u in uniques]
+    levels = np.unravel_index(groups, sizes)
+    index = pd.MultiIndex.from_arrays(
+        [u.take(level) for u, level in zip(uniques, levels)], names=by
+    )
+    return compact, index
+
+
+# ---------------- Shared memory ----------------
+@contextmanager
+def _shared_arrays(arrays):
+    """
+    Copy arrays into shared-memory blocks; yields picklable
+    {name: (block, dtype, shape)} specs and frees the blocks on exit.
+    """
+    blocks, specs = [], {}
+    try:
+        for name, array in arrays.items():
+            block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            blocks.append(block)
+            np.ndarray(array.shape, array.dtype, buffer=block.buf)[:] = array
+            specs[name] = (block.name, array.dtype.str, array.shape)
+        yield specs
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+
+def _attach(specs):
+    blocks, arrays = [], {}
+    for name, (block_name, dtype, shape) in specs.items():
+        block = shared_memory.SharedMemory(name=block_name)
+        blocks.append(block)
+        arrays[name] = np.ndarray(shape, np.dtype(dtype), buffer=block.buf)
+    return blocks, arrays
+
+
+# ---------------- HyperLogLog sketch ----------------
+def _mix64(x):
+    # splitmix64 finaliser: spreads integer codes over all 64 bits
+    x = x.astype(np.uint64)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def _hll_registers(group_codes, item_codes, n_groups, p=HLL_PRECISION):
+    m = 1 << p
+    hashed = _mix64(item_codes)
+    bucket = (hashed >> np.uint64(64 - p)).astype(np.int64)
+    rest = hashed & np.uint64((1 << (64 - p)) - 1)
+    # Position of the leftmost 1 bit in the remaining 64 - p bits
+    rank = (64 - p + 1 - np.frexp(rest.astype(np.float64))[1]).astype(np.uint8)
+
+    registers = np.zeros(n_groups * m, dtype=np.uint8)
+    np.maximum.at(registers, group_codes * m + bucket, rank)
+    return registers.reshape(n_groups, m)
+
+
+def _hll_estimate(registers):
+    m = registers.shape[1]
+    alpha = 0.7213 / (1 + 1.079 / m)
+    estimate = alpha * m * m / np.sum(np.exp2(-registers.astype(np.float64)), axis=1)
+
+    # Linear counting for small cardinalities
+    zeros = (registers == 0).sum(axis=1)
+    with np.errstate(divide="ignore"):
+        small = m * np.log(m / zeros)
+    return np.where((estimate <= 2.5 * m) & (zeros > 0), small, estimate)
+
+
+# ---------------- Partial aggregation ----------------
+def _aggregate_rows(arrays, start, stop, n_groups, plan):
+    """
+    Partial aggregates of rows [start, stop), indexed by group code.
+    """
+    codes = arrays["__codes__"][start:stop]
+    keep = codes >= 0
+    codes = codes[keep]
+
+    partial = {"size": np.bincount(codes, minlength=n_groups)}
+    for col, funcs in plan.items():
+        values = arrays[col][start:stop][keep]
+        if "nunique_approx" in funcs:
+            partial[(col, "hll")] = _hll_registers(codes, values, n_groups)
+            continue
+
+        valid = ~np.isnan(values)
+        col_codes, values = codes[valid], values[valid]
+        partial[(col, "count")] = np.bincount(col_codes, minlength=n_groups)
+        partial[(col, "sum")] = np.bincount(col_codes, weights=values, minlength=n_groups)
+        if "min" in funcs:
+            mins = np.full(n_groups, np.inf)
+            np.minimum.at(mins, col_codes, values)
+            partial[(col, "min")] = mins
+        if "max" in funcs:
+            maxs = np.full(n_groups, -np.inf)
+            np.maximum.at(maxs, col_codes, values)
+            partial[(col, "max")] = maxs
+    return partial
+
+
+def _partial_aggregate(specs, start, stop, n_groups, plan):
+    # Worker entry point: attach to the parent's shared blocks, no copies
+    blocks, arrays = _attach(specs)
+    try:
+        return _aggregate_rows(arrays, start, stop, n_groups, plan)
+    finally:
+        del arrays
+        for block in blocks:
+            block.close()
+
+
+def _get_pool():
+    """
+    Process pool shared by every aggregation, started on first use so
+    reruns don't pay worker start-up. Data reaches workers only through
+    shared memory.
+    Workers start via process_context(), never by forking the server.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=PARALLEL_AGG_WORKERS or os.cpu_count(), mp_context=process_context()
+            )
+    return _pool
+
+
+def _merge(partials):
+    merged = dict(partials[0])
+    for partial in partials[1:]:
+        for key, value in partial.items():
+            kind = key if isinstance(key, str) else key[1]
+            if kind == "min":
+                merged[key] = np.minimum(merged[key], value)
+            elif kind in ("max", "hll"):
+                merged[key] = np.maximum(merged[key], value)
+            else:
+                merged[key] = merged[key] + value
+    return merged
+
+
+# ---------------- Public API ----------------
+def grouped_aggregate(df, by, aggs, dropna=True, sort=True,
+                      max_workers=PARALLEL_AGG_WORKERS, min_rows=PARALLEL_AGG_MIN_ROWS):
+    """
+    Named aggregation like df.groupby(by).agg(**aggs), computed on row
+    partitions in a process pool over shared memory and merged.
+
+    aggs maps output name -> (column, func), func in AGGREGATIONS.
+    sum / count / min / max / mean skip NaN like pandas; size counts rows;
+    nunique_approx is a HyperLogLog estimate. Inputs below min_rows are
+    aggregated in-process with the same code.
+    """
+    for name, (col, func) in aggs.items():
+        if func not in AGGREGATIONS:
+            raise ValueError(f"❌ Unsupported aggregation for {name}: {func}")
+
+    codes, index = encode_groups(df, by, dropna=dropna, sort=sort)
+    n_groups = len(index)
+
+    plan, arrays, integer = {}, {"__codes__": codes}, set()
+    for col, func in aggs.values():
+        if func != "size":
+            plan.setdefault(col, set()).add(func)
+    for col, funcs in plan.items():
+        if "nunique_approx" in funcs:
+            if len(funcs) > 1:
+                raise ValueError(f"❌ nunique_approx cannot be combined with other aggregations of {col}")
+            arrays[col] = pd.factorize(df[col])[0].astype(np.int64)
+        else:
+            arrays[col] = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+            if pd.api.types.is_integer_dtype(df[col]) or pd.api.types.is_bool_dtype(df[col]):
+                integer.add(col)
+
+    n_parts = 1 if len(df) < min_rows else (max_workers or os.cpu_count())
+
+    if n_parts == 1:
+        partials = [_aggregate_rows(arrays, 0, len(df), n_groups, plan)]
+    else:
+        bounds = np.linspace(0, len(df), n_parts + 1).astype(int)
+        with _shared_arrays(arrays) as specs:
+            pool = _get_pool()
+            # Workers are started on submit; keep them off the page script
+            with hidden_main():
+                futures = [
+                    pool.submit(_partial_aggregate, specs, bounds[part], bounds[part + 1], n_groups, plan)
+                    for part in range(n_parts)
+                ]
+            partials = [future.result() for future in futures]
+
+    merged = _merge(partials)
+
+    result = pd.DataFrame(index=index)
+    for name, (col, func) in aggs.items():
+        if func == "size":
+            result[name] = merged["size"]
+        elif func == "nunique_approx":
+            result[name] = np.round(_hll_estimate(merged[(col, "hll")])).astype(np.int64)
+        elif func == "count":
+            result[name] = merged[(col, "count")]
+        elif func == "sum":
+            # Partials sum in float64; integer columns get their dtype back
+            total = merged[(col, "sum")]
+            result[name] = np.round(total).astype(np.int64) if col in integer else total
+        elif func == "mean":
+            with np.errstate(divide="ignore", invalid="ignore"):
+                result[name] = merged[(col, "sum")] / merged[(col, "count")]
+        else:
+            extreme = merged[(col, func)]
+            present = merged[(col, "count")] > 0
+            if col in integer and present.all():
+                result[name] = extreme.astype(np.int64)
+            else:
+                result[name] = np.where(present, extreme, np.nan)
+
+    return result
@@ -0,0 +1,85 @@
+# utils/pareto.py
+
+import numpy as np
+import pandas as pd
+
+from config import ABC_CLASS_A_SHARE, ABC_CLASS_B_SHARE
+
+
+def pareto_ranking(df, dim_col, value_col, mask=None,
+                   a_share=ABC_CLASS_A_SHARE, b_share=ABC_CLASS_B_SHARE):
+    """
+    Cumulative-share ranking of dim_col by summed value_col, with ABC
+    classes.
+
+    Items are integer-coded once and summed with bincount, then ranked
+    with a single sort + cumsum. An item is class A while the share
+    before it is under a_share (so the item that crosses the line is
+    still A), B under b_share, else C. Negative totals rank last.
+    """
+    codes, labels = pd.factorize(df[dim_col])
+    values = df[value_col].to_numpy(dtype=np.float64, na_value=0.0)
+
+    keep = codes >= 0
+    if mask is not None:
+        keep &= mask
+    codes, values = codes[keep], values[keep]
+
+    # Only items with at least one row in scope
+    totals = np.bincount(codes, weights=values, minlength=len(labels))
+    present = np.flatnonzero(np.bincount(codes, minlength=len(labels)))
+    totals = totals[present]
+
+    order = np.argsort(-totals, kind="stable")
+    ranked = totals[order]
+    grand_total = ranked.sum()
+
+    if len(ranked) == 0 or grand_total <= 0:
+        raise ValueError(f"❌ No positive {value_col} to rank by {dim_col}")
+
+    share = ranked / grand_total * 100
+    cumulative = np.cumsum(ranked) / grand_total * 100
+    before = cumulative - share
+
+    ranking = pd.DataFrame({
+        dim_col: labels[present[order]],
+        "Sales": ranked,
+        "Share_%": share,
+        "Cumulative_%": cumulative,
+        "Rank": np.arange(1, len(ranked) + 1),
+    })
+    ranking["Item_%"] = ranking["Rank"] / len(ranking) * 100
+    ranking["Class"] = np.select(
+        [before < a_share * 100, before < b_share * 100], ["A", "B"], "C"
+    )
+    return ranking
+
+
+def abc_summary(ranking):
+    """
+    Items and sales per ABC class, as counts and shares.
+    """
+    summary = ranking.groupby("Class").agg(Items=("Rank", "size"), Sales=("Sales", "sum"))
+    summary["Item_%"] = summary["Items"] / summary["Items"].sum() * 100
+    summary["Sales_%"] = summary["Sales"] / summary["Sales"].sum() * 100
+    return summary.reindex(["A", "B", "C"], fill_value=0).reset_index()
+
+
+def items_for_share(ranking, share=80):
+    """
+    (items, item %) needed to reach `share` % of sales.
+    """
+    items = int(np.searchsorted(ranking["Cumulative_%"].to_numpy(), share) + 1)
+    items = min(items, len(ranking))
+    return items, items / len(ranking) * 100
+
+
+def pareto_curve(ranking, points=1000):
+    """
+    At most `points` evenly spaced rows of the ranking for plotting the
+    cumulative curve (full rankings can have hundreds of thousands of rows).
+    """
+    if len(ranking) <= points:
+        return ranking
+    idx = np.unique(np.linspace(0, len(ranking) - 1, points).astype(int))
+    return ranking.iloc[idx]
@@ -0,0 +1,102 @@
+# utils/period_comparison.py
+
+import numpy as np
+import pandas as pd
+
+from utils.date_dimension import DATE_KEY_COL, MISSING_DATE_KEY, to_date_key
+
+
+class PrefixSums:
+    """
+    Cumulative daily totals for every member of one dimension.
+
+    cumulative[m, d] is member m's total over the first d days, so any
+    date range total is cumulative[:, end + 1] - cumulative[:, start].
+    """
+
+    def __init__(self, dimension, members, first_key, cumulative):
+        self.dimension = dimension
+        self.members = members
+        self.first_key = first_key
+        self.cumulative = cumulative
+
+    @property
+    def last_key(self):
+        return self.first_key + self.cumulative.shape[1] - 2
+
+    def range_totals(self, start_key, end_key):
+        """
+        Total per member over [start_key, end_key], two lookups per member.
+        Ranges outside the data are clipped; an empty range gives zeros.
+        """
+        n_days = self.cumulative.shape[1] - 1
+        lo = int(np.clip(start_key - self.first_key, 0, n_days))
+        hi = int(np.clip(end_key - self.first_key + 1, 0, n_days))
+        if hi <= lo:
+            return np.zeros(len(self.members))
+        return self.cumulative[:, hi] - self.cumulative[:, lo]
+
+
+def build_prefix_sums(df, dim_col, value_col, date_col=None):
+    """
+    Build PrefixSums for dim_col from one bincount over member x day.
+    """
+    keys = df[DATE_KEY_COL].to_numpy() if DATE_KEY_COL in df.columns else to_date_key(df[date_col])
+    valid = keys != MISSING_DATE_KEY
+    if not valid.any():
+        raise ValueError("❌ No valid dates available for period comparison")
+
+    keys = keys[valid].astype(np.int64)
+    codes, members = pd.factorize(df[dim_col][valid], use_na_sentinel=False)
+    values = df[value_col].to_numpy(dtype=np.float64, na_value=0.0)[valid]
+
+    first_key = int(keys.min())
+    n_days = int(keys.max()) - first_key + 1
+    daily = np.bincount(
+        codes * n_days + (keys - first_key), weights=values,
+        minlength=len(members) * n_days
+    ).reshape(len(members), n_days)
+
+    cumulative = np.zeros((len(members), n_days + 1))
+    np.cumsum(daily, axis=1, out=cumulative[:, 1:])
+    return PrefixSums(dim_col, members, first_key, cumulative)
+
+
+def shift_years(date_key, years=-1):
+    """
+    Same calendar day `years` away (29 Feb maps to 28 Feb).
+    """
+    date = pd.Timestamp(int(date_key), unit="D") + pd.DateOffset(years=years)
+    return int(to_date_key(pd.Series([date]))[0])
+
+
+def previous_period(start_key, end_key):
+    """
+    The equally long period immediately before [start_key, end_key].
+    """
+    length = end_key - start_key + 1
+    return start_key - length, end_key - length
+
+
+def compare_periods(prefix_sums, current, previous):
+    """
+    Current vs previous totals, delta and growth % for every member.
+    current / previous are (start_key, end_key) pairs.
+    """
+    current_totals = prefix_sums.range_totals(*current)
+    previous_totals = prefix_sums.range_totals(*previous)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        growth = np.where(
+            previous_totals != 0,
+            (current_totals - previous_totals) / np.abs(previous_totals) * 100,
+            np.nan
+        )
+
+    return pd.DataFrame({
+        prefix_sums.dimension: prefix_sums.members,
+        "Current": current_totals,
+        "Previous": previous_totals,
+        "Delta": current_totals - previous_totals,
+        "Growth_%": growth,
+    }).sort_values("Delta", ascending=False).reset_index(drop=True)
@@ -0,0 +1,263 @@
+# utils/query_api.py
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from config import QUERY_CACHE_ENTRIES
+from utils.column_detector import auto_detect_columns
+from utils.data_quality import profile_dataset
+from utils.date_dimension import DATE_KEY_COL, MISSING_DATE_KEY, to_date_key
+from utils.metrics import kpi_aov, kpi_orders, kpi_total_sales, top_n
+
+METRICS = ("total_sales", "aov", "orders", "top_n")
+DEFAULT_METRICS = ["total_sales", "aov", "orders"]
+
+
+def load_frame(path):
+    """
+    Read a CSV / Excel / Parquet file and profile it like the Upload page.
+    Returns (df, version) where version is the sha1 of the file bytes.
+    """
+    path = Path(path)
+    version = hashlib.sha1(path.read_bytes()).hexdigest()
+
+    if path.suffix == ".csv":
+        df = pd.read_csv(path)
+    elif path.suffix == ".parquet":
+        df = pd.read_parquet(path)
+    else:
+        df = pd.read_excel(path, engine="openpyxl")
+
+    df, _ = profile_dataset(df)
+    return df, version
+
+
+def _date_bound(value):
+    key = to_date_key(pd.Series([value]))[0]
+    if key == MISSING_DATE_KEY:
+        raise ValueError(f"❌ Invalid date: {value}")
+    return key
+
+
+def _canonical(value):
+    return json.dumps(value, sort_keys=True, default=str)
+
+
+class KPIQueryEngine:
+    """
+    Answers KPI queries on a loaded dataset with the same functions the
+    dashboard uses (utils.metrics).
+
+    A query is a dict:
+        {"filters": {"city": ["Pune"], "BRAND": ["X"]},
+         "date_from": "2024-01-01", "date_to": "2024-03-31",
+         "metrics": ["total_sales", "aov", {"metric": "top_n", "by": "brand", "n": 5}]}
+    Filter and `by` names are detected roles (city, brand, ...) or raw
+    column names. Every metric of a query shares one filter pass, and each
+    metric result is cached by dataset version + filters + metric.
+    """
+
+    def __init__(self, df, version=None, cache_entries=QUERY_CACHE_ENTRIES):
+        self.df = df
+        self.version = version
+        self.cols = auto_detect_columns(df)
+        self.cache_entries = cache_entries
+        self.cache = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_file(cls, path, **kwargs):
+        df, version = load_frame(path)
+        return cls(df, version, **kwargs)
+
+    # ---------------- Query parsing ----------------
+    def _column(self, name):
+        column = self.cols.get(name) or (name if name in self.df.columns else None)
+        if column is None:
+            raise ValueError(f"❌ Unknown column: {name}")
+        return column
+
+    def _metric_spec(self, metric):
+        spec = {"metric": metric} if isinstance(metric, str) else dict(metric)
+        if spec.get("metric") not in METRICS:
+            raise ValueError(f"❌ Unknown metric: {spec.get('metric')}")
+
+        if spec["metric"] == "top_n":
+            spec["by"] = self._column(spec.get("by", "brand"))
+            spec["value"] = self._column(spec.get("value", "sales"))
+            spec["n"] = int(spec.get("n", 10))
+            spec["label"] = spec.get("label", f"top_{spec['n']}_{spec['by']}")
+        else:
+            spec["label"] = spec.get("label", spec["metric"])
+        return spec
+
+    def _scope(self, request):
+        filters = {
+            self._column(name): sorted(values if isinstance(values, list) else [values], key=str)
+            for name, values in (request.get("filters") or {}).items()
+        }
+        return {
+            "version": self.version,
+            "filters": filters,
+            "date_from": request.get("date_from"),
+            "date_to": request.get("date_to"),
+        }
+
+    # ---------------- Evaluation ----------------
+    def mask(self, scope):
+        """
+        Boolean row mask for a scope's filters and inclusive date range.
+        """
+        mask = np.ones(len(self.df), dtype=bool)
+
+        if scope["date_from"] or scope["date_to"]:
+            if DATE_KEY_COL in self.df.columns:
+                keys = self.df[DATE_KEY_COL].to_numpy()
+            else:
+                keys = to_date_key(self.df[self._column("date")])
+            if scope["date_from"]:
+                mask &= keys >= _date_bound(scope["date_from"])
+            if scope["date_to"]:
+                mask &= keys <= _date_bound(scope["date_to"])
+
+        for column, values in scope["filters"].items():
+            mask &= self.df[column].isin(values).to_numpy()
+
+        return mask
+
+    def _compute(self, frame, spec):
+        sales_col = self._column("sales")
+        if spec["metric"] == "total_sales":
+            return float(kpi_total_sales(frame, sales_col))
+        if spec["metric"] == "aov":
+            value = kpi_aov(frame, sales_col)
+            return None if pd.isna(value) else float(value)
+        if spec["metric"] == "orders":
+            return int(kpi_orders(frame))
+        return top_n(frame, spec["by"], spec["value"], spec["n"])
+
+    def _cache_get(self, key):
+        with self.lock:
+            if key in self.cache:
+                self.cache.move_to_end(key)
+                self.hits += 1
+                return True, self.cache[key]
+            self.misses += 1
+            return False, None
+
+    def _cache_put(self, key, value):
+        with self.lock:
+            self.cache[key] = value
+            while len(self.cache) > self.cache_entries:
+                self.cache.popitem(last=False)
+
+    def query(self, request, _frames=None):
+        """
+        Evaluate one query. Returns {"metrics": {label: value}, "cached": [labels]};
+        top_n values are DataFrames (see to_json / to_arrow).
+        """
+        scope = self._scope(request)
+        scope_key = _canonical(scope)
+        specs = [self._metric_spec(m) for m in request.get("metrics") or DEFAULT_METRICS]
+
+        results, cached, missing = {}, [], []
+        for spec in specs:
+            hit, value = self._cache_get((scope_key, _canonical(spec)))
+            if hit:
+                results[spec["label"]] = value
+                cached.append(spec["label"])
+            else:
+                missing.append(spec)
+
+        if missing:
+            frames = _frames if _frames is not None else {}
+            if scope_key not in frames:
+                frames[scope_key] = self.df[self.mask(scope)]
+            for spec in missing:
+                value = self._compute(frames[scope_key], spec)
+                self._cache_put((scope_key, _canonical(spec)), value)
+                results[spec["label"]] = value
+
+        return {
+            "metrics": {spec["label"]: results[spec["label"]] for spec in specs},
+            "cached": cached,
+        }
+
+    def batch(self, requests):
+        """
+        Evaluate several queries; queries with identical filters share one
+        filter pass.
+        """
+        frames = {}
+        return [self.query(request, _frames=frames) for request in requests]
+
+    def stats(self):
+        return {
+            "rows": len(self.df),
+            "version": self.version,
+            "columns": {role: col for role, col in self.cols.items() if col},
+            "cache_entries": len(self.cache),
+            "cache_hits": self.hits,
+            "cache_misses": self.misses,
+        }
+
+
+# ---------------- Serialisation ----------------
+def _jsonable(value):
+    if isinstance(value, pd.DataFrame):
+        return json.loads(value.to_json(orient="split", index=False, date_format="iso"))
+    return value
+
+
+def to_json(responses):
+    """
+    Compact JSON for one response or a list of them; tables use
+    {"columns": [...], "data": [[...]]}.
+    """
+    def convert(response):
+        return dict(response, metrics={k: _jsonable(v) for k, v in response["metrics"].items()})
+
+    payload = [convert(r) for r in responses] if isinstance(responses, list) else convert(responses)
+    return json.dumps(payload, separators=(",", ":"), default=str)
+
+
+def to_arrow(responses):
+    """
+    Arrow IPC stream of one long table: query, metric, group, value.
+    Scalar metrics have a null group.
+    """
+    import pyarrow as pa
+
+    responses = responses if isinstance(responses, list) else [responses]
+    query_idx, metric, group, value = [], [], [], []
+    for i, response in enumerate(responses):
+        for label, result in response["metrics"].items():
+            if isinstance(result, pd.DataFrame):
+                query_idx += [i] * len(result)
+                metric += [label] * len(result)
+                group += result.iloc[:, 0].astype(str).tolist()
+                value += result.iloc[:, 1].astype(float).tolist()
+            else:
+                query_idx.append(i)
+                metric.append(label)
+                group.append(None)
+                value.append(None if result is None else float(result))
+
+    table = pa.table({
+        "query": pa.array(query_idx, pa.int32()),
+        "metric": pa.array(metric, pa.string()).dictionary_encode(),
+        "group": pa.array(group, pa.string()),
+        "value": pa.array(value, pa.float64()),
+    })
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
@@ -0,0 +1,261 @@
+# utils/reports.py
+
+import html
+import os
+import re
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from config import REPORT_DIR, REPORT_WORKERS
+from utils.date_dimension import DATE_KEY_COL, MISSING_DATE_KEY, build_calendar, calendar_lookup, to_date_key
+from utils.geo_hierarchy import MISSING_LABEL
+from utils.parallel_agg import grouped_aggregate
+from utils.sections import SectionExecutor
+from utils.visualizations import bar_top, heatmap, kpi_card, line_period_trend, line_sales_trend
+
+# Dimensions charted in the pack (Executive Overview, Sales Performance,
+# Actionable Insights), as detected column roles
+REPORT_DIMENSIONS = ("brand", "state", "city", "warehouse")
+# Key of the overall report (groupby never yields None as a variant)
+ALL_VARIANT = None
+VARIANT_COL = "__variant__"
+PLOTLY_JS = "plotly.min.js"
+
+_PAGE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<script src="{plotly_js}"></script>
+<style>
+body {{ font-family: sans-serif; margin: 2rem; color: #262730; }}
+.kpis {{ display: flex; gap: 1rem; }}
+.kpi {{ border: 1px solid #ddd; border-radius: 0.5rem; padding: 1rem 1.5rem; }}
+.kpi .value {{ font-size: 1.6rem; font-weight: 600; }}
+.green {{ color: #2ca02c; }} .orange {{ color: #ff7f0e; }} .red {{ color: #d62728; }}
+.grid {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(420px, 1fr)); gap: 1rem; }}
+</style>
+</head>
+<body>
+<h1>{title}</h1>
+<p>{subtitle}</p>
+{body}
+</body>
+</html>
+"""
+
+
+def _slug(value):
+    return re.sub(r"[^A-Za-z0-9_-]+", "_", str(value)).strip("_") or "blank"
+
+
+def _date_keys(df, cols):
+    if DATE_KEY_COL in df.columns:
+        return df[DATE_KEY_COL].to_numpy()
+    return to_date_key(df[cols["date"]])
+
+
+# ---------------- Shared aggregates ----------------
+def _label_missing(frame, columns):
+    # Missing members become their own labelled member (as in the geo
+    # drill-down), so variant slices and overall totals both keep them
+    for col in columns:
+        if frame[col].isna().any():
+            frame[col] = frame[col].astype(object).where(frame[col].notna(), MISSING_LABEL)
+    return frame
+
+
+def shared_aggregates(df, cols, by_col=None, mask=None):
+    """
+    Everything the pack charts, for every variant of by_col at once:
+    one grouped pass for (variant, day) and one per (variant, dimension).
+    Variant reports slice these; the overall report sums them.
+    """
+    sales_col = cols["sales"]
+    keys = _date_keys(df, cols)
+    valid = keys != MISSING_DATE_KEY
+    if mask is not None:
+        valid &= mask
+
+    frame = df.loc[valid, list({c: None for c in [sales_col, *(cols.get(d) for d in REPORT_DIMENSIONS)] if c})]
+    frame[DATE_KEY_COL] = keys[valid]
+    if frame.empty:
+        raise ValueError("❌ No rows with a valid date in the report range")
+
+    # A separate variant key, so reports by state can still chart states
+    variant = []
+    if by_col:
+        frame[VARIANT_COL] = df[by_col].to_numpy()[valid]
+        variant = [VARIANT_COL]
+
+    aggregates = {
+        "daily": _label_missing(grouped_aggregate(frame, variant + [DATE_KEY_COL], {
+            sales_col: (sales_col, "sum"),
+            "Sales_Count": (sales_col, "count"),
+            "Orders": (sales_col, "size"),
+        }, dropna=False).reset_index(), variant)
+    }
+    for dim in REPORT_DIMENSIONS:
+        if cols.get(dim):
+            aggregates[dim] = _label_missing(grouped_aggregate(
+                frame, variant + [cols[dim]], {sales_col: (sales_col, "sum")}, dropna=False
+            ).reset_index(), variant + [cols[dim]])
+    return aggregates
+
+
+def variant_aggregates(aggregates, cols):
+    """
+    {variant: {name: frame}} sliced from shared aggregates with one
+    groupby per frame, plus the overall totals (summed over variants)
+    under ALL_VARIANT. Missing members arrive as MISSING_LABEL; dropna=False
+    keeps any other NaN key rather than silently dropping its rows.
+    """
+    variants, overall = {}, {}
+    for name, frame in aggregates.items():
+        if VARIANT_COL in frame.columns:
+            for value, part in frame.groupby(VARIANT_COL, sort=True, dropna=False):
+                variants.setdefault(value, {})[name] = part.drop(columns=VARIANT_COL)
+            frame = frame.drop(columns=VARIANT_COL)
+        key = DATE_KEY_COL if name == "daily" else cols[name]
+        overall[name] = frame.groupby(key, as_index=False, dropna=False).sum()
+
+    variants[ALL_VARIANT] = overall
+    return variants
+
+
+# ---------------- Rendering ----------------
+def _figure_html(fig):
+    return fig.to_html(full_html=False, include_plotlyjs=False)
+
+
+def _section(title, figures, intro=""):
+    charts = "".join(f"<div>{_figure_html(fig)}</div>" for fig in figures)
+    return f"<h2>{html.escape(title)}</h2>{intro}<div class='grid'>{charts}</div>"
+
+
+def render_report(path, title, subtitle, frames, cols):
+    """
+    Build the pack's figures from pre-aggregated frames and write one
+    static HTML file. Runs in a worker process.
+    """
+    sales_col = cols["sales"]
+    daily = frames["daily"]
+    daily = daily.assign(Date=pd.to_datetime(daily[DATE_KEY_COL].to_numpy().astype("datetime64[D]")))
+
+    total = daily[sales_col].sum()
+    orders = int(daily["Orders"].sum())
+    aov = total / daily["Sales_Count"].sum() if daily["Sales_Count"].sum() else 0
+    cards = [
+        kpi_card(f"{total:,.0f}", "Total Sales"),
+        kpi_card(f"{orders:,}", "Orders"),
+        kpi_card(f"{aov:,.0f}", "Avg Order Value"),
+    ]
+    kpis = "".join(
+        f"<div class='kpi'><div>{html.escape(c['name'])}</div>"
+        f"<div class='value {c['color']}'>{html.escape(c['value'])}</div></div>"
+        for c in cards
+    )
+
+    trend = line_sales_trend(daily, "Date", sales_col)
+
+    def dim_chart(dim, title, n=10):
+        if dim not in frames:
+            return []
+        return [bar_top(frames[dim], cols[dim], sales_col, title, n=n)]
+
+    calendar = build_calendar(daily[DATE_KEY_COL])
+    keys = daily[DATE_KEY_COL].to_numpy()
+    for attribute in ("DAY", "MONTH", "ISO_WEEK", "ISO_YEAR", "YEAR"):
+        daily[attribute] = calendar_lookup(keys, calendar, attribute)
+
+    body = "".join([
+        _section("Executive Overview", [trend] + dim_chart("brand", "Top Brands"), f"<div class='kpis'>{kpis}</div>"),
+        _section("Sales Performance", dim_chart("state", "Sales by State") + dim_chart("city", "Sales by City")),
+        _section("Actionable Insights – Top Business Drivers",
+                 dim_chart("city", "Top 5 Cities", 5)
+                 + dim_chart("warehouse", "Top 5 Warehouses", 5)
+                 + dim_chart("brand", "Top 5 Brands", 5)),
+        _section("Actionable Insights – Growth Trends", [
+            heatmap(daily, "MONTH", "DAY", sales_col, "Sales Intensity Heatmap"),
+            line_period_trend(daily, "ISO_WEEK", "ISO_YEAR", sales_col, "Week-on-Week Sales Trend"),
+            line_period_trend(daily, "MONTH", "YEAR", sales_col, "Month-on-Month Sales Trend"),
+        ]),
+    ])
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(_PAGE.format(
+            title=html.escape(title), subtitle=html.escape(subtitle), plotly_js=PLOTLY_JS, body=body
+        ))
+    return path
+
+
+def _write_index(out_dir, title, entries):
+    links = "".join(
+        f"<li><a href='{html.escape(os.path.basename(path))}'>{html.escape('All' if name is ALL_VARIANT else str(name))}</a></li>"
+        for name, path in entries
+    )
+    path = os.path.join(out_dir, "index.html")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(_PAGE.format(title=html.escape(title), subtitle=f"{len(entries)} reports",
+                             plotly_js=PLOTLY_JS, body=f"<ul>{links}</ul>"))
+    return path
+
+
+# ---------------- Public API ----------------
+def generate_reports(df, cols, by_col=None, values=None, out_dir=REPORT_DIR,
+                     date_from=None, date_to=None, include_all=True, workers=REPORT_WORKERS):
+    """
+    Write one static HTML report per value of by_col (or just the overall
+    report) into out_dir, plus an index.html and a shared plotly.min.js.
+
+    Aggregates are computed once for all variants; workers only build
+    figures from their variant's small slices. Returns {variant: path}.
+    """
+    from plotly.offline import get_plotlyjs
+
+    if not cols.get("sales") or not (cols.get("date") or DATE_KEY_COL in df.columns):
+        raise ValueError("❌ Reports need a sales and a date column")
+
+    mask = None
+    if date_from or date_to:
+        keys = _date_keys(df, cols)
+        mask = np.ones(len(df), dtype=bool)
+        if date_from:
+            mask &= keys >= to_date_key(pd.Series([date_from]))[0]
+        if date_to:
+            mask &= keys <= to_date_key(pd.Series([date_to]))[0]
+
+    variants = variant_aggregates(shared_aggregates(df, cols, by_col, mask), cols)
+    wanted = [v for v in variants if v is not ALL_VARIANT and (values is None or str(v) in values)]
+    if include_all or not by_col:
+        wanted.insert(0, ALL_VARIANT)
+    if not wanted:
+        raise ValueError(f"❌ None of {sorted(values)} found in {by_col}")
+
+    os.makedirs(out_dir, exist_ok=True)
+    with open(os.path.join(out_dir, PLOTLY_JS), "w", encoding="utf-8") as f:
+        f.write(get_plotlyjs())
+
+    period = " – ".join(str(d) for d in (date_from, date_to) if d) or "full history"
+    subtitle = f"{period} · generated {datetime.now():%d %b %Y %H:%M}"
+
+    paths, used = {}, set()
+    with SectionExecutor(max_workers=workers or os.cpu_count(), use_processes=True) as sections:
+        for value in wanted:
+            name = "all" if value is ALL_VARIANT else _slug(f"{by_col}_{value}")
+            while name in used:
+                name += "_"
+            used.add(name)
+            title = "Sales Report – All" if value is ALL_VARIANT else f"Sales Report – {by_col}: {value}"
+            sections.submit(
+                value, render_report, os.path.join(out_dir, f"{name}.html"),
+                title, subtitle, variants[value], cols
+            )
+        for value, path in sections.as_completed():
+            paths[value] = path
+
+    ordered = [(value, paths[value]) for value in wanted]
+    _write_index(out_dir, f"Sales Reports{f' by {by_col}' if by_col else ''}", ordered)
+    return dict(ordered)
@@ -0,0 +1,159 @@
+# utils/sampling.py
+
+from collections import namedtuple
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+from config import APPROX_MIN_PER_STRATUM, APPROX_SAMPLE_FRACTION
+from utils.date_dimension import DATE_KEY_COL, MISSING_DATE_KEY
+
+Estimate = namedtuple("Estimate", ["value", "lower", "upper"])
+
+STRATUM_COL = "_STRATUM"
+
+
+class StratifiedSample:
+    """
+    Stratified random sample of a dataset, strata = month x region.
+
+    Keeps the population and sample size of each stratum so totals,
+    means and group totals can be estimated with confidence intervals
+    for any row filter (domain estimation).
+    """
+
+    def __init__(self, frame, population_sizes, sample_sizes):
+        self.frame = frame
+        self.population_sizes = population_sizes
+        self.sample_sizes = sample_sizes
+
+    @property
+    def weights(self):
+        return (self.population_sizes / np.maximum(self.sample_sizes, 1))[
+            self.frame[STRATUM_COL].to_numpy()
+        ]
+
+
+def _month_index(date_keys):
+    keys = np.asarray(date_keys)
+    months = np.asarray(keys.astype("datetime64[D]"), dtype="datetime64[M]").astype(np.int64)
+    return np.where(keys == MISSING_DATE_KEY, -1, months)
+
+
+def stratified_sample(df, region_col=None, fraction=APPROX_SAMPLE_FRACTION,
+                      min_per_stratum=APPROX_MIN_PER_STRATUM, seed=42):
+    """
+    Draw a stratified Bernoulli sample by month (from DATE_KEY) and region.
+    Small strata are sampled at a higher rate so each keeps at least
+    min_per_stratum rows where possible.
+    """
+    parts = []
+    if DATE_KEY_COL in df.columns:
+        parts.append(_month_index(df[DATE_KEY_COL]))
+    if region_col:
+        parts.append(pd.factorize(df[region_col])[0])
+
+    if parts:
+        strata, _ = pd.factorize(pd.MultiIndex.from_arrays(parts))
+    else:
+        strata = np.zeros(len(df), dtype=np.int64)
+
+    population_sizes = np.bincount(strata).astype(np.float64)
+    rates = np.clip(
+        np.maximum(fraction, min_per_stratum / np.maximum(population_sizes, 1)),
+        0, 1
+    )
+
+    rng = np.random.default_rng(seed)
+    picked = rng.random(len(df)) < rates[strata]
+
+    frame = df.take(np.flatnonzero(picked))
+    frame[STRATUM_COL] = strata[picked]
+    sample_sizes = np.bincount(strata[picked], minlength=len(population_sizes)).astype(np.float64)
+
+    return StratifiedSample(frame, population_sizes, sample_sizes)
+
+
+def _z(level):
+    return NormalDist().inv_cdf(0.5 + level / 2)
+
+
+def _stratum_variance(sample, z_values, n_groups=1, groups=None):
+    # Var(total) = sum_h N_h^2 (1 - n_h/N_h) s_h^2 / n_h, per group
+    strata = sample.frame[STRATUM_COL].to_numpy()
+    n_strata = len(sample.population_sizes)
+    cells = strata if groups is None else strata * n_groups + groups
+    size = n_strata * n_groups
+
+    sums = np.bincount(cells, weights=z_values, minlength=size).reshape(n_strata, n_groups)
+    squares = np.bincount(cells, weights=z_values ** 2, minlength=size).reshape(n_strata, n_groups)
+
+    n_h = sample.sample_sizes[:, None]
+    N_h = sample.population_sizes[:, None]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        s2 = (squares - sums ** 2 / n_h) / (n_h - 1)
+        var = N_h ** 2 * (1 - n_h / N_h) * s2 / n_h
+    return np.nansum(np.where(n_h > 1, var, 0), axis=0)
+
+
+def estimate_total(sample, value_col=None, mask=None, level=0.95):
+    """
+    Estimated population total of value_col (row count when None) over
+    the rows selected by mask, with a normal confidence interval.
+    """
+    if value_col is None:
+        values = np.ones(len(sample.frame))
+    else:
+        values = sample.frame[value_col].to_numpy(dtype=np.float64, na_value=0.0)
+    if mask is not None:
+        values = np.where(np.asarray(mask), values, 0.0)
+
+    total = float((values * sample.weights).sum())
+    half = _z(level) * float(np.sqrt(_stratum_variance(sample, values)[0]))
+    return Estimate(total, total - half, total + half)
+
+
+def estimate_mean(sample, value_col, mask=None, level=0.95):
+    """
+    Estimated population mean of value_col over the masked rows
+    (ratio estimator, linearised variance).
+    """
+    values = sample.frame[value_col].to_numpy(dtype=np.float64, na_value=0.0)
+    selected = np.ones(len(values), dtype=bool) if mask is None else np.asarray(mask)
+
+    weights = sample.weights
+    count = float((weights * selected).sum())
+    if count == 0:
+        return Estimate(np.nan, np.nan, np.nan)
+
+    mean = float((weights * values * selected).sum()) / count
+    residuals = np.where(selected, values - mean, 0.0) / count
+    half = _z(level) * float(np.sqrt(_stratum_variance(sample, residuals)[0]))
+    return Estimate(mean, mean - half, mean + half)
+
+
+def estimate_group_totals(sample, group_col, value_col, mask=None, level=0.95):
+    """
+    Estimated total of value_col per group_col member with intervals.
+    Returns a frame with group_col, value_col, Lower and Upper.
+    """
+    frame = sample.frame
+    values = frame[value_col].to_numpy(dtype=np.float64, na_value=0.0)
+    if mask is not None:
+        values = np.where(np.asarray(mask), values, 0.0)
+
+    codes, members = pd.factorize(frame[group_col])
+    valid = codes >= 0
+    values = np.where(valid, values, 0.0)
+    codes = np.where(valid, codes, 0)
+
+    totals = np.bincount(codes, weights=values * sample.weights, minlength=len(members))
+    half = _z(level) * np.sqrt(_stratum_variance(sample, values, len(members), codes))
+
+    return pd.DataFrame({
+        group_col: members,
+        value_col: totals,
+        "Lower": totals - half,
+        "Upper": totals + half,
+    })
@@ -0,0 +1,182 @@
+# utils/scenario.py
+
+import numpy as np
+import pandas as pd
+
+from config import ELASTICITY_PRIOR_PERIODS, ELASTICITY_RANGE
+from utils.date_dimension import DATE_KEY_COL, MISSING_DATE_KEY, to_date_key
+
+# Unit-elastic prior when no SKU shows any price variation
+FALLBACK_ELASTICITY = -1.0
+
+# Discount rates are capped so the net price never reaches zero
+MAX_DISCOUNT_RATE = 0.9
+
+# SKUs x scenarios cells evaluated per block in scenario_totals
+SCENARIO_BLOCK_CELLS = 2_000_000
+
+
+def _month_index(df, date_col):
+    keys = df[DATE_KEY_COL].to_numpy() if DATE_KEY_COL in df.columns else to_date_key(df[date_col])
+    months = keys.astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)
+    return months, keys != MISSING_DATE_KEY
+
+
+def _elasticities(sku_codes, months, quantity, net, n_skus):
+    """
+    Per-SKU slope of log(quantity) on log(net unit price) over monthly
+    cells, shrunk towards the pooled within-SKU slope.
+    """
+    months = months - months.min()
+    n_months = int(months.max()) + 1
+    cells = sku_codes * n_months + months
+
+    cell_qty = np.bincount(cells, weights=quantity, minlength=n_skus * n_months)
+    cell_net = np.bincount(cells, weights=net, minlength=n_skus * n_months)
+    priced = np.flatnonzero((cell_qty > 0) & (cell_net > 0))
+
+    sku = priced // n_months
+    x = np.log(cell_net[priced] / cell_qty[priced])
+    y = np.log(cell_qty[priced])
+
+    n, sx, sy, sxx, sxy = (
+        np.bincount(sku, weights=w, minlength=n_skus)
+        for w in (np.ones_like(x), x, y, x * x, x * y)
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        var = sxx - sx * sx / n
+        cov = sxy - sx * sy / n
+    varies = (n >= 3) & (var > 1e-9)
+
+    low, high = ELASTICITY_RANGE
+    pooled = cov[varies].sum() / var[varies].sum() if varies.any() else FALLBACK_ELASTICITY
+    pooled = float(np.clip(pooled, low, high))
+
+    own = np.where(varies, cov / np.where(varies, var, 1), pooled)
+    weight = np.where(varies, n / (n + ELASTICITY_PRIOR_PERIODS), 0)
+    return np.clip(weight * own + (1 - weight) * pooled, low, high), n.astype(np.int64)
+
+
+def price_baseline(df, sku_col, qty_col, sales_col=None, price_col=None, discount_col=None,
+                   date_col=None, brand_col=None, mask=None):
+    """
+    Per-SKU baseline (quantity, gross unit price, discount rate) with a
+    log-log own-price elasticity estimated from monthly net unit prices.
+
+    Gross sales are price x quantity when a price column exists, else the
+    sales column. SKUs with few priced months lean on the pooled elasticity.
+    """
+    if price_col is None and sales_col is None:
+        raise ValueError("❌ Need a price or sales column to build a pricing baseline")
+
+    quantity = df[qty_col].to_numpy(dtype=np.float64, na_value=np.nan)
+    if price_col is not None:
+        gross = df[price_col].to_numpy(dtype=np.float64, na_value=np.nan) * quantity
+    else:
+        gross = df[sales_col].to_numpy(dtype=np.float64, na_value=np.nan)
+    discount = (
+        np.nan_to_num(df[discount_col].to_numpy(dtype=np.float64, na_value=np.nan))
+        if discount_col else np.zeros(len(df))
+    )
+
+    valid = (quantity > 0) & (gross > 0) & df[sku_col].notna().to_numpy()
+    if mask is not None:
+        valid &= mask
+    if date_col is not None:
+        months, dated = _month_index(df, date_col)
+        valid &= dated
+
+    rows = np.flatnonzero(valid)
+    if len(rows) == 0:
+        raise ValueError("❌ No rows with a SKU, positive quantity and positive sales")
+
+    sku_codes, skus = pd.factorize(df[sku_col].to_numpy()[rows])
+    n_skus = len(skus)
+    quantity, gross, discount = quantity[rows], gross[rows], discount[rows]
+
+    sku_qty = np.bincount(sku_codes, weights=quantity, minlength=n_skus)
+    sku_gross = np.bincount(sku_codes, weights=gross, minlength=n_skus)
+    sku_discount = np.bincount(sku_codes, weights=discount, minlength=n_skus)
+
+    baseline = pd.DataFrame({sku_col: skus})
+    if brand_col is not None:
+        # factorize numbers SKUs in order of first appearance
+        first = np.flatnonzero(~pd.Series(sku_codes).duplicated().to_numpy())
+        baseline[brand_col] = df[brand_col].to_numpy()[rows[first]]
+
+    baseline["Quantity"] = sku_qty
+    baseline["Gross_Price"] = sku_gross / sku_qty
+    baseline["Discount_Rate"] = np.clip(sku_discount / sku_gross, 0, MAX_DISCOUNT_RATE)
+    baseline["Net_Price"] = baseline["Gross_Price"] * (1 - baseline["Discount_Rate"])
+    baseline["Net_Sales"] = baseline["Net_Price"] * sku_qty
+
+    if date_col is not None:
+        elasticity, priced_months = _elasticities(
+            sku_codes, months[rows], quantity, gross - discount, n_skus
+        )
+    else:
+        elasticity, priced_months = np.full(n_skus, FALLBACK_ELASTICITY), np.zeros(n_skus, dtype=np.int64)
+    baseline["Elasticity"] = elasticity
+    baseline["Priced_Months"] = priced_months
+
+    return baseline.sort_values("Net_Sales", ascending=False, ignore_index=True)
+
+
+def simulate(baseline, price_change, discount_change, applies=None):
+    """
+    Project every SKU under every scenario in one broadcast.
+
+    price_change holds fractional list-price changes and discount_change
+    discount-rate changes in points of gross (both length m); applies is a
+    bool mask over SKUs, (n,) or (n, m). Returns {metric: (n, m) array}.
+    """
+    price_change = np.atleast_1d(np.asarray(price_change, dtype=np.float64))[None, :]
+    discount_change = np.atleast_1d(np.asarray(discount_change, dtype=np.float64))[None, :]
+    if applies is None:
+        applies = np.ones((len(baseline), 1), dtype=bool)
+    elif np.ndim(applies) == 1:
+        applies = np.asarray(applies, dtype=bool)[:, None]
+
+    price = baseline["Gross_Price"].to_numpy()[:, None]
+    rate = baseline["Discount_Rate"].to_numpy()[:, None]
+    net_price = baseline["Net_Price"].to_numpy()[:, None]
+
+    new_price = price * (1 + np.where(applies, price_change, 0))
+    new_rate = np.clip(rate + np.where(applies, discount_change, 0), 0, MAX_DISCOUNT_RATE)
+    new_net_price = new_price * (1 - new_rate)
+
+    quantity = baseline["Quantity"].to_numpy()[:, None] * (new_net_price / net_price) ** \
+        baseline["Elasticity"].to_numpy()[:, None]
+    gross = quantity * new_price
+    discount = gross * new_rate
+
+    return {"Quantity": quantity, "Gross_Sales": gross, "Discount": discount, "Net_Sales": gross - discount}
+
+
+def scenario_totals(baseline, price_change, discount_change, applies=None):
+    """
+    Portfolio totals for each of m scenarios, evaluated in SKU blocks so
+    large SKU x scenario grids stay within SCENARIO_BLOCK_CELLS cells.
+    """
+    price_change = np.atleast_1d(np.asarray(price_change, dtype=np.float64))
+    discount_change = np.atleast_1d(np.asarray(discount_change, dtype=np.float64))
+    if applies is not None:
+        applies = np.asarray(applies, dtype=bool)
+
+    totals = dict.fromkeys(("Quantity", "Gross_Sales", "Discount", "Net_Sales"), 0.0)
+    block = max(1, SCENARIO_BLOCK_CELLS // len(price_change))
+    for start in range(0, len(baseline), block):
+        part = simulate(
+            baseline.iloc[start:start + block], price_change, discount_change,
+            None if applies is None else applies[start:start + block]
+        )
+        for metric, values in part.items():
+            totals[metric] = totals[metric] + values.sum(axis=0)
+
+    result = pd.DataFrame({
+        "Price_Change_%": price_change * 100,
+        "Discount_Change_pts": discount_change * 100,
+        **totals,
+    })
+    result["Net_Sales_Change_%"] = (result["Net_Sales"] / baseline["Net_Sales"].sum() - 1) * 100
+    return result
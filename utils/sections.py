@@ -0,0 +1,98 @@
+# utils/sections.py
+
+import multiprocessing as mp
+import sys
+import threading
+import types
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+
+from config import SECTION_WORKERS
+
+
+def process_context():
+    """
+    Start method for worker processes: forkserver, or spawn where the
+    platform lacks it. Never fork: forking the threaded Streamlit server
+    can copy locks held by other threads and deadlock the child.
+    """
+    method = "forkserver" if "forkserver" in mp.get_all_start_methods() else "spawn"
+    return mp.get_context(method)
+
+
+_main_lock = threading.Lock()
+
+
+@contextmanager
+def hidden_main():
+    """
+    Hide __main__ while worker processes start. Streamlit executes each
+    page as __main__, and spawn / forkserver workers re-run __main__ on
+    start, so without this every worker would run the page script.
+    Workers only need the module-level functions they are sent.
+    """
+    with _main_lock:
+        original = sys.modules.get("__main__")
+        placeholder = types.ModuleType("__main__")
+        sys.modules["__main__"] = placeholder
+        try:
+            yield
+        finally:
+            # Another session's rerun may have installed its own page meanwhile
+            if sys.modules.get("__main__") is placeholder:
+                sys.modules["__main__"] = original
+
+
+class SectionExecutor:
+    """
+    Run independent page sections concurrently.
+
+    Sections must not call Streamlit themselves: they compute data or
+    figures in a worker, and the page renders the results on the script
+    thread. pandas/NumPy release the GIL for most of their heavy kernels,
+    so a thread pool is the default. With use_processes=True the section
+    functions and their arguments must be picklable (module-level), and
+    workers start with mp_context (process_context() by default).
+    """
+
+    def __init__(self, max_workers=SECTION_WORKERS, use_processes=False, mp_context=None):
+        self._use_processes = use_processes
+        if use_processes:
+            self._pool = ProcessPoolExecutor(max_workers=max_workers, mp_context=mp_context or process_context())
+        else:
+            self._pool = ThreadPoolExecutor(max_workers=max_workers)
+        self._futures = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # Don't hold a Streamlit rerun hostage to a slow section
+        self._pool.shutdown(wait=exc_type is None, cancel_futures=exc_type is not None)
+        return False
+
+    def submit(self, name, func, *args, **kwargs):
+        """
+        Schedule a named section.
+        """
+        if self._use_processes:
+            # Worker processes are started on submit
+            with hidden_main():
+                self._futures[name] = self._pool.submit(func, *args, **kwargs)
+        else:
+            self._futures[name] = self._pool.submit(func, *args, **kwargs)
+        return self._futures[name]
+
+    def result(self, name):
+        """
+        Block until a single section is done and return its result.
+        """
+        return self._futures[name].result()
+
+    def as_completed(self):
+        """
+        Yield (name, result) pairs as sections finish.
+        """
+        names = {future: name for name, future in self._futures.items()}
+        for future in as_completed(names):
+            yield names[future], future.result()
@@ -1,10 +1,10 @@
 # utils/segmentation.py
 
 import pandas as pd
-from sklearn.cluster import KMeans
-from sklearn.preprocessing import StandardScaler
 
 from utils.column_detector import auto_detect_columns
+from utils.lazy_imports import lazy_import
+from utils.parallel_agg import grouped_aggregate
 
 
 def prepare_outlet_features(df: pd.DataFrame) -> pd.DataFrame:
@@ -25,16 +25,11 @@ def prepare_outlet_features(df: pd.DataFrame) -> pd.DataFrame:
     agg = {}
 
     if sales_col:
-        agg[sales_col] = "sum"
+        agg[sales_col] = (sales_col, "sum")
     if qty_col:
-        agg[qty_col] = "sum"
+        agg[qty_col] = (qty_col, "sum")
 
-    outlet_df = (
-        df
-        .groupby(outlet_col)
-        .agg(agg)
-        .reset_index()
-    )
+    outlet_df = grouped_aggregate(df, outlet_col, agg).reset_index()
 
     # Rename for consistency
     rename_map = {}
@@ -62,10 +57,10 @@ def segment_outlets(outlet_df: pd.DataFrame, n_clusters: int = 3) -> pd.DataFram
     if len(feature_cols) == 0:
         raise ValueError("❌ No numeric features available for clustering")
 
-    scaler = StandardScaler()
+    scaler = lazy_import("sklearn.preprocessing").StandardScaler()
     X = scaler.fit_transform(outlet_df[feature_cols])
 
-    kmeans = KMeans(
+    kmeans = lazy_import("sklearn.cluster").KMeans(
         n_clusters=n_clusters,
         random_state=42,
         n_init=10
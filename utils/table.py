@@ -0,0 +1,110 @@
+# utils/table.py
+
+import math
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from config import TABLE_PAGE_SIZES
+from utils.memory import get_memory_manager
+
+
+def _frame_token(df, key, version):
+    # Pages pass a version (dataset version + params) for frames rebuilt
+    # on every rerun; otherwise the frame object itself identifies it
+    if version is None:
+        return ("table", key, "frame", id(df), len(df), tuple(df.columns))
+    return ("table", key, repr(version))
+
+
+def sort_order(df, column, ascending=True, token=None):
+    """
+    Row positions of df sorted by column (stable, missing values last).
+    Cached in the memory manager under token so paging and re-sorting
+    never sort again.
+    """
+    manager = get_memory_manager()
+    cache_key = (token, "sort", column, ascending) if token is not None else None
+    order = manager.get(cache_key) if cache_key else None
+    if order is None:
+        order = (
+            df[column].reset_index(drop=True)
+            .sort_values(ascending=ascending, kind="stable", na_position="last")
+            .index.to_numpy()
+        )
+        if cache_key:
+            manager.put(cache_key, order, kind="table index")
+    return order
+
+
+def search_mask(df, query, token=None):
+    """
+    Rows where any text column contains query (case-insensitive).
+    Each column is matched on its distinct values, then mapped back to rows.
+    """
+    manager = get_memory_manager()
+    cache_key = (token, "search", query) if token is not None else None
+    mask = manager.get(cache_key) if cache_key else None
+    if mask is not None:
+        return mask
+
+    mask = np.zeros(len(df), dtype=bool)
+    for col in df.columns:
+        series = df[col]
+        if pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series):
+            continue
+        codes, uniques = pd.factorize(series)
+        hits = pd.Index(uniques).astype(str).str.contains(query, case=False, regex=False)
+        hits = np.append(np.asarray(hits, dtype=bool), False)  # code -1 (missing) -> no match
+        mask |= hits[codes]
+
+    if cache_key:
+        manager.put(cache_key, mask, kind="table index")
+    return mask
+
+
+def paged_table(df, key, version=None, digits=None, page_size=None):
+    """
+    Searchable, sortable table that sends only the visible page to the
+    browser. Sorting uses cached per-column orders; search and paging
+    select row positions, so only one page of rows is ever copied.
+    """
+    if df.empty:
+        st.dataframe(df, use_container_width=True, hide_index=True)
+        return
+
+    token = _frame_token(df, key, version)
+
+    c1, c2, c3, c4, c5 = st.columns([3, 2, 1, 1, 1])
+    query = c1.text_input("Search", key=f"{key}_search", placeholder="Filter rows…").strip()
+    sort_col = c2.selectbox("Sort by", [None, *df.columns], format_func=lambda c: "—" if c is None else str(c),
+                            key=f"{key}_sort")
+    descending = c3.toggle("Descending", key=f"{key}_desc", disabled=sort_col is None)
+    sizes = TABLE_PAGE_SIZES if page_size is None else sorted({page_size, *TABLE_PAGE_SIZES})
+    rows = c4.selectbox("Rows", sizes, index=sizes.index(page_size or TABLE_PAGE_SIZES[1]), key=f"{key}_rows")
+
+    if sort_col is None:
+        positions = np.arange(len(df))
+    else:
+        positions = sort_order(df, sort_col, ascending=not descending, token=token)
+    if query:
+        positions = positions[search_mask(df, query, token=token)[positions]]
+
+    n_pages = max(1, math.ceil(len(positions) / rows))
+    # The page count shrinks when a search narrows the rows
+    if st.session_state.get(f"{key}_page", 1) > n_pages:
+        st.session_state[f"{key}_page"] = n_pages
+    page = c5.number_input("Page", min_value=1, max_value=n_pages, step=1, key=f"{key}_page")
+
+    start = (page - 1) * rows
+    page_view = df.iloc[positions[start:start + rows]]
+    if digits is not None:
+        page_view = page_view.round(digits)
+
+    st.dataframe(page_view, use_container_width=True, hide_index=True)
+
+    shown = f"{min(start + 1, len(positions)):,}–{min(start + rows, len(positions)):,} of {len(positions):,} rows"
+    if query:
+        shown += f" matching “{query}” ({len(df):,} total)"
+    st.caption(f"Page {page} of {n_pages} · {shown}")
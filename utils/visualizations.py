@@ -1,6 +1,11 @@
 import plotly.express as px
+import plotly.graph_objects as go
 import pandas as pd
 
+from utils.date_dimension import DATE_KEY_COL, MISSING_DATE_KEY
+from utils.metrics import top_n
+from utils.sampling import estimate_group_totals
+
 # ---------------- Line Chart ----------------
 def line_sales_trend(df, date_col, sales_col):
     """
@@ -12,15 +17,25 @@ def line_sales_trend(df, date_col, sales_col):
     return fig
 
 # ---------------- Bar Chart ----------------
-def bar_top(df, group_col, value_col, title="Top 10"):
+def bar_top(df, group_col, value_col, title="Top 10", n=10):
     """
     Create a bar chart for top N categories by value.
     """
-    agg = df.groupby(group_col)[value_col].sum().sort_values(ascending=False).head(10).reset_index()
+    agg = top_n(df, group_col, value_col, n)
     fig = px.bar(agg, x=group_col, y=value_col, title=title, text=value_col)
     fig.update_layout(xaxis_title=group_col, yaxis_title=value_col)
     return fig
 
+# ---------------- Period Trend ----------------
+def line_period_trend(df, period_col, series_col, value_col, title="Trend"):
+    """
+    One line per series (e.g. year) over a repeating period (week, month).
+    """
+    trend = df.groupby([series_col, period_col], as_index=False)[value_col].sum()
+    fig = px.line(trend, x=period_col, y=value_col, color=series_col, title=title)
+    fig.update_layout(xaxis_title=period_col, yaxis_title=value_col)
+    return fig
+
 # ---------------- Heatmap ----------------
 def heatmap(df, x_col, y_col, value_col, title="Heatmap"):
     """
@@ -66,3 +81,50 @@ def pie_chart(df, names_col, values_col, title="Pie Chart"):
     """
     fig = px.pie(df, names=names_col, values=values_col, title=title)
     return fig
+
+# ---------------- Approximate (sample based) ----------------
+def line_sales_trend_approx(sample, sales_col, mask=None):
+    """
+    Sales trend estimated from a stratified sample, with 95% error bars.
+    """
+    trend = estimate_group_totals(sample, DATE_KEY_COL, sales_col, mask)
+    trend = trend[trend[DATE_KEY_COL] != MISSING_DATE_KEY].sort_values(DATE_KEY_COL)
+    trend["Date"] = pd.to_datetime(trend[DATE_KEY_COL].to_numpy().astype("datetime64[D]"))
+
+    fig = px.line(
+        trend, x="Date", y=sales_col, title="Sales Trend (approximate)",
+        error_y=trend["Upper"] - trend[sales_col],
+        error_y_minus=trend[sales_col] - trend["Lower"]
+    )
+    fig.update_layout(xaxis_title="Date", yaxis_title=sales_col)
+    return fig
+
+
+def bar_top_approx(sample, group_col, value_col, title="Top 10", mask=None):
+    """
+    Top 10 categories estimated from a stratified sample, with 95% error bars.
+    """
+    agg = (
+        estimate_group_totals(sample, group_col, value_col, mask)
+        .sort_values(value_col, ascending=False)
+        .head(10)
+    )
+    fig = px.bar(
+        agg, x=group_col, y=value_col, title=f"{title} (approximate)",
+        error_y=agg["Upper"] - agg[value_col],
+        error_y_minus=agg[value_col] - agg["Lower"]
+    )
+    fig.update_layout(xaxis_title=group_col, yaxis_title=value_col)
+    return fig
+
+
+def add_interval_band(fig, x, lower, upper, name="Prediction Interval"):
+    """
+    Shade a lower/upper prediction-interval band on an existing figure.
+    """
+    fig.add_trace(go.Scatter(x=x, y=upper, mode="lines", line=dict(width=0), showlegend=False, hoverinfo="skip"))
+    fig.add_trace(go.Scatter(
+        x=x, y=lower, mode="lines", line=dict(width=0), fill="tonexty",
+        fillcolor="rgba(99, 110, 250, 0.2)", name=name
+    ))
+    return fig
@@ -1,5 +1,7 @@
 import pandas as pd
 
+from utils.parallel_agg import grouped_aggregate
+
 def warehouse_kpis(df, warehouse_col, sales_col, qty_col):
     return (
         df.groupby(warehouse_col)
@@ -21,3 +23,50 @@ def warehouse_asset_analysis(df, warehouse_col, asset_col, sales_col):
         )
         .reset_index()
     )
+
+
+def warehouse_rollups(df, warehouse_col, sku_col, sales_col, qty_col, asset_col=None):
+    """
+    Warehouse, warehouse x asset and warehouse x SKU aggregates from one
+    grouped pass at the finest level; coarser levels are re-aggregated
+    from that result instead of rescanning rows.
+    Every level is indexed by warehouse first and sorted, so drilling
+    into one warehouse is an index slice.
+    """
+    keys = [warehouse_col] + ([asset_col] if asset_col else []) + [sku_col]
+
+    # Row partitions are aggregated across cores, then merged
+    finest = grouped_aggregate(
+        df, keys,
+        {
+            "Total_Sales": (sales_col, "sum"),
+            "Total_Quantity": (qty_col, "sum"),
+            "Order_Lines": (sales_col, "size"),
+        },
+        dropna=False, sort=False,
+    )
+
+    by_sku = finest.groupby(level=[warehouse_col, sku_col], dropna=False).sum()
+    by_sku = by_sku.sort_values("Total_Sales", ascending=False).sort_index(level=0, sort_remaining=False)
+
+    rollups = {"sku": by_sku}
+
+    if asset_col:
+        by_asset = finest.groupby(level=[warehouse_col, asset_col], dropna=False).sum()
+        rollups["asset"] = by_asset.sort_values("Total_Sales", ascending=False).sort_index(level=0, sort_remaining=False)
+
+    warehouses = by_sku.groupby(level=warehouse_col, dropna=False).sum()
+    warehouses["SKU_Count"] = by_sku.groupby(level=warehouse_col, dropna=False).size()
+    rollups["warehouse"] = warehouses.sort_values("Total_Sales", ascending=False)
+
+    return rollups
+
+
+def warehouse_drilldown(rollups, level, warehouse):
+    """
+    Rows of one rollup level for a single warehouse.
+    """
+    table = rollups[level]
+    if warehouse not in table.index.get_level_values(0):
+        return table.iloc[:0].reset_index(level=0, drop=True).reset_index()
+    return table.xs(warehouse, level=0).reset_index()